@@ -7,11 +7,22 @@ Documents are moved to archive/ and their metadata is updated.
 import os
 import sys
 import re
+import json
+import argparse
 import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
 import yaml
 
+from docs_io import (content_hash, atomic_write_text, create_exclusive, replace_if_unchanged, docs_lock,
+                     ConcurrentModification)
+from index_docs import load_cache, save_cache, scan_documents
+from link_docs import update_graph, load_graph, save_graph, rewrite_links, move_node
+from dedupe_docs import cached_clusters, archive_candidates
+
+
+# Format of the move set written by --plan
+PLAN_VERSION = 1
 
 # Archiving rules by category (days since last_updated)
 ARCHIVING_RULES = {
@@ -39,11 +50,9 @@ ARCHIVING_RULES = {
 }
 
 
-def extract_frontmatter(file_path: Path) -> tuple[dict, str]:
-    """Extract YAML frontmatter and remaining content from a markdown file."""
+def parse_frontmatter(content: str, file_path: Path) -> tuple[dict, str]:
+    """Split already-read markdown content into YAML frontmatter and body."""
     try:
-        content = file_path.read_text()
-        
         # Match YAML frontmatter between --- delimiters
         match = re.match(r'^---\s*\n(.*?)\n---\s*\n(.*)', content, re.DOTALL)
         if not match:
@@ -60,6 +69,16 @@ def extract_frontmatter(file_path: Path) -> tuple[dict, str]:
         return {}, ""
 
 
+def extract_frontmatter(file_path: Path) -> tuple[dict, str]:
+    """Extract YAML frontmatter and remaining content from a markdown file."""
+    try:
+        content = file_path.read_text()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not parse {file_path}: {e}")
+        return {}, ""
+    return parse_frontmatter(content, file_path)
+
+
 def update_frontmatter(file_path: Path, metadata: dict) -> None:
     """Update the YAML frontmatter in a markdown file."""
     _, body = extract_frontmatter(file_path)
@@ -67,7 +86,7 @@ def update_frontmatter(file_path: Path, metadata: dict) -> None:
     frontmatter = yaml.dump(metadata, default_flow_style=False, sort_keys=False)
     new_content = f"---\n{frontmatter}---\n{body}"
     
-    file_path.write_text(new_content)
+    atomic_write_text(file_path, new_content)
 
 
 def should_archive(metadata: dict, category: str, file_modified: datetime) -> tuple[bool, str]:
@@ -115,55 +134,79 @@ def should_archive(metadata: dict, category: str, file_modified: datetime) -> tu
     return False, "no archiving criteria met"
 
 
-def archive_document(file_path: Path, docs_path: Path, reason: str, dry_run: bool = False) -> bool:
+def archive_document(file_path: Path, docs_path: Path, reason: str, dry_run: bool = False,
+                     expected_hash: str = None, graph: dict = None) -> bool:
     """
     Archive a document by moving it to archive/ and updating its metadata.
-    Returns True if successful.
+    If expected_hash is given, the move is abandoned when the document has
+    changed since it was evaluated (another session edited it).
+    If graph (see link_docs.py) is given, links to the document from other
+    documents, and its own relative links, are rewritten to match the new
+    location in the same locked batch as the move; the graph is updated.
+    Returns True if successful, None if another session already moved it.
     """
     try:
-        # Read metadata
-        metadata, body = extract_frontmatter(file_path)
-        
         # Determine archive path (preserve subdirectory structure)
         relative_path = file_path.relative_to(docs_path)
         category = relative_path.parts[0]
-        
-        # Create archive subdirectory for the category
         archive_path = docs_path / 'archive' / category
-        archive_path.mkdir(parents=True, exist_ok=True)
-        
-        # Build destination path
-        archive_file = archive_path / file_path.name
-        
-        # Handle name conflicts
-        if archive_file.exists():
-            base = archive_file.stem
-            suffix = archive_file.suffix
-            counter = 1
-            while archive_file.exists():
-                archive_file = archive_path / f"{base}_{counter}{suffix}"
-                counter += 1
+        old_rel = str(relative_path)
+        inbound = [s for s in (graph or {}).get('inbound', {}).get(old_rel, []) if s != old_rel]
         
         if dry_run:
+            archive_file = unique_archive_name(archive_path, file_path.name)
             print(f"  [DRY RUN] Would archive: {relative_path} → archive/{category}/{archive_file.name}")
             print(f"            Reason: {reason}")
+            if inbound:
+                print(f"            Would rewrite links in {len(inbound)} document{'s' if len(inbound) != 1 else ''}")
             return True
         
-        # Update metadata
-        metadata['status'] = 'archived'
-        metadata['archived_date'] = datetime.now().strftime('%Y-%m-%d')
-        metadata['archive_reason'] = reason
-        
-        # Write updated file to archive
-        frontmatter = yaml.dump(metadata, default_flow_style=False, sort_keys=False)
-        new_content = f"---\n{frontmatter}---\n{body}"
-        archive_file.write_text(new_content)
-        
-        # Remove original
-        file_path.unlink()
+        # Serialize with other sessions: name choice, writes and removal
+        # happen as one batch under the docs lock
+        with docs_lock(docs_path):
+            if not file_path.exists():
+                print(f"  ⏭️  Skipped: {relative_path} (already moved by another session)")
+                return None
+            data = file_path.read_bytes()
+            if expected_hash and content_hash(data) != expected_hash:
+                raise ConcurrentModification(f"{relative_path} changed since it was evaluated; skipped")
+            metadata, body = parse_frontmatter(data.decode('utf-8', errors='replace'), file_path)
+            
+            # Update metadata
+            metadata['status'] = 'archived'
+            metadata['archived_date'] = datetime.now().strftime('%Y-%m-%d')
+            metadata['archive_reason'] = reason
+            
+            frontmatter = yaml.dump(metadata, default_flow_style=False, sort_keys=False)
+            
+            # Write updated file to archive; exclusive create guards the
+            # _N suffix against writers that don't take the lock
+            archive_path.mkdir(parents=True, exist_ok=True)
+            while True:
+                archive_file = unique_archive_name(archive_path, file_path.name)
+                new_rel = str(archive_file.relative_to(docs_path))
+                moved_body = rewrite_links(body, old_rel, new_rel, {old_rel: new_rel}) if graph else body
+                try:
+                    create_exclusive(archive_file, f"---\n{frontmatter}---\n{moved_body}")
+                    break
+                except FileExistsError:
+                    continue
+            
+            try:
+                rewritten = rewrite_inbound_links(docs_path, inbound, old_rel, new_rel)
+            except BaseException:
+                archive_file.unlink()
+                raise
+            
+            # Remove original
+            file_path.unlink()
+            if graph:
+                move_node(graph, old_rel, new_rel)
         
         print(f"  ✅ Archived: {relative_path} → archive/{category}/{archive_file.name}")
         print(f"     Reason: {reason}")
+        if rewritten:
+            print(f"     Rewrote links in {rewritten} document{'s' if rewritten != 1 else ''}")
         
         return True
     
@@ -172,64 +215,222 @@ def archive_document(file_path: Path, docs_path: Path, reason: str, dry_run: boo
         return False
 
 
-def scan_and_archive(docs_path: Path, dry_run: bool = False) -> dict:
+def rewrite_inbound_links(docs_path: Path, sources: list[str], old_rel: str, new_rel: str) -> int:
+    """
+    Point every link to old_rel in the given documents at new_rel. All
+    documents are read and rewritten in memory first; if any write fails,
+    the ones already written are restored. Returns the number rewritten.
+    """
+    planned = []
+    for source in sources:
+        source_path = docs_path / source
+        try:
+            data = source_path.read_bytes()
+        except FileNotFoundError:
+            continue  # moved since the graph was built; the next index run reports it
+        content = data.decode('utf-8')
+        new_content = rewrite_links(content, source, source, {old_rel: new_rel})
+        if new_content != content:
+            planned.append((source_path, content, content_hash(data), new_content))
+    
+    written = []
+    try:
+        for source_path, content, expected_hash, new_content in planned:
+            replace_if_unchanged(source_path, expected_hash, new_content)
+            written.append((source_path, content))
+    except BaseException:
+        for source_path, content in written:
+            atomic_write_text(source_path, content)
+        raise
+    return len(written)
+
+
+def unique_archive_name(archive_path: Path, name: str) -> Path:
+    """First free archive/<category>/ path for name, adding _N on conflicts."""
+    archive_file = archive_path / name
+    
+    # Handle name conflicts
+    if archive_file.exists():
+        base = archive_file.stem
+        suffix = archive_file.suffix
+        counter = 1
+        while archive_file.exists():
+            archive_file = archive_path / f"{base}_{counter}{suffix}"
+            counter += 1
+    
+    return archive_file
+
+
+def refresh_link_graph(docs_path: Path, cache: dict = None) -> dict:
+    """
+    Bring the scan cache and link graph up to date (only changed docs are
+    re-read) so inbound links can be rewritten as documents move. A given
+    cache is updated in place for the caller to evaluate documents from.
+    """
+    with docs_lock(docs_path):
+        if cache is None:
+            cache = load_cache(docs_path)
+        scan_documents(docs_path, cache=cache)
+        graph, _ = update_graph(docs_path, cache)
+        save_cache(docs_path, cache)
+    return graph
+
+
+def evaluate_documents(cache: dict, stats: dict) -> list[dict]:
+    """
+    Return the moves that meet the archiving criteria, each with the content
+    hash, mtime and size it was evaluated on. Documents are evaluated from
+    the scan cache just brought up to date, so no file is read again here.
+    """
+    moves = []
+    
+    for path, record in sorted(cache['files'].items()):
+        entry = record['entry']
+        if entry['category'] == 'archive':
+            continue
+        
+        stats['scanned'] += 1
+        
+        metadata = {'status': entry['status']}
+        if record.get('dated'):
+            metadata['last_updated'] = entry['last_updated']
+        file_modified = datetime.fromtimestamp(record['mtime_ns'] / 1e9)
+        
+        # Check if should archive
+        should_arch, reason = should_archive(metadata, entry['category'], file_modified)
+        
+        if should_arch:
+            moves.append({
+                'path': path,
+                'reason': reason,
+                'hash': record['hash'],
+                'mtime_ns': record['mtime_ns'],
+                'size': record['size'],
+            })
+        else:
+            stats['skipped'] += 1
+    
+    return moves
+
+
+def execute_moves(docs_path: Path, moves: list[dict], graph: dict, stats: dict, dry_run: bool = False) -> None:
+    """Archive each planned move, counting the outcomes in stats."""
+    for move in moves:
+        success = archive_document(docs_path / move['path'], docs_path, move['reason'], dry_run, move['hash'], graph)
+        if success:
+            stats['archived'] += 1
+        elif success is None:
+            stats['skipped'] += 1
+        else:
+            stats['errors'] += 1
+    
+    if not dry_run and stats['archived']:
+        with docs_lock(docs_path):
+            save_graph(docs_path, graph)
+
+
+def scan_and_archive(docs_path: Path, dry_run: bool = False, plan_file: Path = None) -> dict:
     """
     Scan all documents and archive those that meet criteria.
-    Returns statistics about the archiving operation.
+    With plan_file, nothing is moved: the move set is written there for a
+    later apply_plan instead.
+    Returns statistics about the archiving operation, plus the near-duplicate
+    archive candidates left in place (from the same scan) under 'duplicates'.
     """
     stats = {
         'scanned': 0,
         'archived': 0,
         'skipped': 0,
+        'stale': 0,
         'errors': 0
     }
     
-    skip_files = {'README.md', 'INDEX.md', '.gitkeep'}
-    skip_dirs = {'archive'}
+    # One scan: it refreshes the link graph and the cache records the
+    # archiving rules are evaluated on
+    cache = load_cache(docs_path)
+    graph = refresh_link_graph(docs_path, cache)
+    moves = evaluate_documents(cache, stats)
     
-    for category_dir in docs_path.iterdir():
-        if not category_dir.is_dir() or category_dir.name in skip_dirs or category_dir.name.startswith('.'):
-            continue
-        
-        category_name = category_dir.name
-        
-        # Find all markdown files
-        for md_file in category_dir.rglob('*.md'):
-            if md_file.name in skip_files:
-                continue
-            
-            stats['scanned'] += 1
-            
-            # Extract metadata
-            metadata, _ = extract_frontmatter(md_file)
-            file_stats = md_file.stat()
-            file_modified = datetime.fromtimestamp(file_stats.st_mtime)
-            
-            # Check if should archive
-            should_arch, reason = should_archive(metadata, category_name, file_modified)
-            
-            if should_arch:
-                success = archive_document(md_file, docs_path, reason, dry_run)
-                if success:
-                    stats['archived'] += 1
-                else:
-                    stats['errors'] += 1
-            else:
-                stats['skipped'] += 1
+    if plan_file:
+        plan = {
+            'version': PLAN_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'docs_path': str(docs_path),
+            'moves': moves,
+        }
+        atomic_write_text(plan_file, json.dumps(plan, indent=2) + '\n')
+        dry_run = True
     
+    execute_moves(docs_path, moves, graph, stats, dry_run)
+    
+    # Near-duplicate candidates from the same scan, minus documents just moved
+    moved = {move['path'] for move in moves if not dry_run and not (docs_path / move['path']).exists()}
+    clusters = [[doc for doc in cluster if doc['path'] not in moved] for cluster in cached_clusters(cache)]
+    stats['duplicates'] = archive_candidates([cluster for cluster in clusters if len(cluster) > 1])
+    return stats
+
+
+def is_fresh(docs_path: Path, move: dict) -> bool | None:
+    """
+    Whether a planned document is unchanged since the plan was made: a stat
+    when mtime and size still match, a hash otherwise. None if it's gone.
+    """
+    file_path = docs_path / move['path']
+    try:
+        file_stats = file_path.stat()
+        if file_stats.st_mtime_ns == move['mtime_ns'] and file_stats.st_size == move['size']:
+            return True
+        return content_hash(file_path.read_bytes()) == move['hash']
+    except FileNotFoundError:
+        return None
+
+
+def apply_plan(docs_path: Path, plan_file: Path) -> dict:
+    """
+    Execute a plan written by scan_and_archive without rescanning docs/.
+    Documents that changed since the plan was made are skipped as stale.
+    """
+    plan = json.loads(Path(plan_file).read_text())
+    if plan.get('version') != PLAN_VERSION:
+        raise ValueError(f"{plan_file} is not an archive plan (version {plan.get('version')})")
+    if plan['docs_path'] != str(docs_path):
+        raise ValueError(f"{plan_file} was made for {plan['docs_path']}, not {docs_path}")
+    
+    stats = {'scanned': 0, 'archived': 0, 'skipped': 0, 'stale': 0, 'errors': 0}
+    
+    moves = []
+    for move in plan['moves']:
+        fresh = is_fresh(docs_path, move)
+        if fresh:
+            moves.append(move)
+        elif fresh is None:
+            stats['skipped'] += 1
+            print(f"  ⏭️  Skipped: {move['path']} (no longer exists)")
+        else:
+            stats['stale'] += 1
+            print(f"  ⚠️  Stale: {move['path']} changed since the plan was made; re-plan to include it")
+    
+    # The graph saved when the plan was made; linking documents are re-read
+    # when rewritten, so only links added since then can be missed (and are
+    # reported as broken by the next index run)
+    execute_moves(docs_path, moves, load_graph(docs_path), stats)
     return stats
 
 
 def main():
     """Main entry point."""
-    dry_run = '--dry-run' in sys.argv
+    parser = argparse.ArgumentParser(description="Archive documents based on status, age and category rules.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', action='store_true', help="show what would be archived")
+    mode.add_argument('--plan', type=Path, metavar='FILE',
+                      help="write the move set (with content hashes) to FILE for review; modifies nothing")
+    mode.add_argument('--apply', type=Path, metavar='FILE',
+                      help="execute a plan written by --plan without rescanning; skips documents changed since")
+    args = parser.parse_args()
+    dry_run = args.dry_run
     
-    # Get base path
-    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
-    if args:
-        base_path = Path(args[0]).resolve()
-    else:
-        base_path = Path.cwd()
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
     
     docs_path = base_path / 'docs'
     
@@ -237,24 +438,51 @@ def main():
         print(f"❌ Error: docs/ directory not found at {docs_path}")
         sys.exit(1)
     
-    print(f"Scanning documents in: {docs_path}")
-    if dry_run:
+    if args.apply:
+        print(f"Applying archive plan: {args.apply}")
+    else:
+        print(f"Scanning documents in: {docs_path}")
+    if dry_run or args.plan:
         print("🔍 DRY RUN MODE - No files will be modified")
     print()
     
     # Scan and archive
-    stats = scan_and_archive(docs_path, dry_run)
+    if args.apply:
+        try:
+            stats = apply_plan(docs_path, args.apply)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Error: could not apply {args.apply}: {e}")
+            sys.exit(1)
+    else:
+        stats = scan_and_archive(docs_path, dry_run, args.plan)
     
     print()
     print("=" * 60)
     print("Archive Summary:")
-    print(f"  Documents scanned: {stats['scanned']}")
-    print(f"  Documents archived: {stats['archived']}")
+    if not args.apply:
+        print(f"  Documents scanned: {stats['scanned']}")
+    print(f"  Documents {'planned' if args.plan else 'archived'}: {stats['archived']}")
     print(f"  Documents skipped: {stats['skipped']}")
+    if args.apply:
+        print(f"  Stale (changed since plan): {stats['stale']}")
     print(f"  Errors: {stats['errors']}")
     print()
     
-    if not dry_run and stats['archived'] > 0:
+    if args.plan:
+        print(f"📝 Plan written to {args.plan}. Review it, then run: python scripts/archive_docs.py --apply {args.plan}")
+        print()
+    
+    # Near-duplicates aren't archived automatically; surface them for review
+    candidates = stats.get('duplicates')
+    if candidates:
+        print(f"🔁 Near-duplicate candidates ({len(candidates)}) - older copies to review for archiving:")
+        for doc, keep in candidates[:10]:
+            print(f"  • {doc['path']} (restates {keep['path']})")
+        if len(candidates) > 10:
+            print(f"  (+{len(candidates) - 10} more, see dedupe_docs.py)")
+        print()
+    
+    if not (dry_run or args.plan) and stats['archived'] > 0:
         print("💡 Tip: Run 'python scripts/index_docs.py' to update the documentation index")
 
 
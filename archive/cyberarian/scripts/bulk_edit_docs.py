@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Edit frontmatter fields across many documents at once.
+Selects documents by tag/status/category/path glob/date range from the scan
+cache, previews the change set, and with --apply rewrites each changed file
+exactly once, touching only the edited frontmatter lines.
+"""
+
+import re
+import sys
+import fnmatch
+import argparse
+from pathlib import Path
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+
+from index_docs import load_cache, save_cache, scan_documents, regenerate_index, DEFAULT_IO_THREADS
+from tag_docs import update_tag_index
+from docs_io import content_hash, replace_if_unchanged, docs_lock
+
+
+FRONTMATTER_RE = re.compile(r'^(---\s*\n)(.*?\n)(---\s*\n)', re.DOTALL)
+KEY_RE = re.compile(r'^([A-Za-z_][\w-]*):(.*)$')
+
+# Sentinel for fields removed with --unset
+UNSET = object()
+
+
+def parse_assignment(text: str) -> tuple[str, object]:
+    """Parse a --set FIELD=VALUE argument; the value is read as YAML."""
+    field, sep, value = text.partition('=')
+    if not sep or not field.strip():
+        raise argparse.ArgumentTypeError(f"expected FIELD=VALUE, got '{text}'")
+    return field.strip(), yaml.safe_load(value) if value.strip() else ''
+
+
+def to_iso(value) -> str:
+    """Render a frontmatter date (date object or string) as YYYY-MM-DD text."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return str(value)
+
+
+def matches(entry: dict, args) -> bool:
+    """Whether an index entry matches every selector given on the command line."""
+    tags = entry['tags'] if isinstance(entry['tags'], list) else []
+    if args.tag and not set(args.tag) & set(tags):
+        return False
+    if args.status and entry['status'] not in args.status:
+        return False
+    if args.category and entry['category'] not in args.category:
+        return False
+    if args.path and not any(fnmatch.fnmatch(entry['path'], pattern) for pattern in args.path):
+        return False
+    updated = to_iso(entry['last_updated'])
+    if args.updated_after and updated < args.updated_after:
+        return False
+    if args.updated_before and updated > args.updated_before:
+        return False
+    return True
+
+
+def compute_changes(metadata: dict, args) -> dict:
+    """The field -> new value changes this run makes to one document's metadata."""
+    changes = {}
+    for field, value in args.set:
+        if metadata.get(field, UNSET) != value:
+            changes[field] = value
+    for field in args.unset:
+        if field in metadata:
+            changes[field] = UNSET
+    
+    if args.add_tag or args.remove_tag:
+        current = metadata.get('tags')
+        tags = list(current) if isinstance(current, list) else []
+        updated = [t for t in tags if t not in args.remove_tag]
+        updated += [t for t in args.add_tag if t not in updated]
+        if updated != tags:
+            changes['tags'] = updated
+    
+    if changes and args.touch:
+        changes.setdefault('last_updated', datetime.now().date())
+    
+    return changes
+
+
+def format_scalar(value) -> str:
+    """Format a scalar the way a human would write it in frontmatter."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    dumped = yaml.safe_dump(value, default_flow_style=True, width=1 << 20).strip()
+    return dumped[:-4].rstrip() if dumped.endswith('\n...') else dumped
+
+
+def format_field(field: str, value, original: list[str]) -> list[str]:
+    """Lines for one field, keeping the list style (flow or block) it had."""
+    if not isinstance(value, list):
+        return [f"{field}: {format_scalar(value)}"]
+    
+    block_items = [line for line in original[1:] if line.lstrip().startswith('- ')]
+    if block_items and '[' not in original[0]:
+        indent = block_items[0][:len(block_items[0]) - len(block_items[0].lstrip())]
+        return [f"{field}:"] + [f"{indent}- {format_scalar(item)}" for item in value]
+    return [f"{field}: [{', '.join(format_scalar(item) for item in value)}]"]
+
+
+def rewrite_frontmatter(content: str, changes: dict) -> str:
+    """
+    Apply field changes to a document's frontmatter, preserving every line
+    that isn't being edited (order, comments, quoting, blank lines) and the
+    document's line endings.
+    """
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        raise ValueError("no YAML frontmatter")
+    opening, body, closing = match.groups()
+    newline = '\r\n' if opening.endswith('\r\n') else '\n'
+    
+    # Group lines into blocks: a top-level key line plus its continuation lines
+    blocks = [[None, []]]
+    for line in body.splitlines():
+        key = KEY_RE.match(line)
+        if key:
+            blocks.append([key.group(1), [line]])
+        else:
+            blocks[-1][1].append(line)
+    
+    remaining = dict(changes)
+    lines = []
+    for field, block in blocks:
+        if field in remaining:
+            value = remaining.pop(field)
+            if value is not UNSET:
+                # Keep trailing blank/comment lines that belong to the layout
+                trailing = []
+                while len(block) > 1 and (not block[-1].strip() or block[-1].lstrip().startswith('#')):
+                    trailing.insert(0, block.pop())
+                lines.extend(format_field(field, value, block) + trailing)
+            continue
+        lines.extend(block)
+    
+    for field, value in remaining.items():
+        if value is not UNSET:
+            lines.extend(format_field(field, value, [field + ':']))
+    
+    return opening + newline.join(lines) + newline + closing + content[match.end():]
+
+
+def plan_document(md_file: Path, args) -> dict:
+    """
+    Read a selected document once and plan its edit: the current metadata,
+    the changes, the rewritten content and the hash of the content it was
+    planned against. A document that can't be read (deleted since the scan)
+    or whose frontmatter can't be parsed is skipped with a warning.
+    """
+    try:
+        data = md_file.read_bytes()
+        content = data.decode('utf-8')
+        match = FRONTMATTER_RE.match(content)
+        metadata = yaml.safe_load(match.group(2)) if match else None
+    except OSError as e:
+        print(f"⚠️  Warning: Could not read {md_file}, skipped: {e}")
+        return {'metadata': {}, 'changes': {}}
+    except (UnicodeDecodeError, yaml.YAMLError) as e:
+        print(f"⚠️  Warning: Could not parse frontmatter in {md_file}, skipped: {e}")
+        return {'metadata': {}, 'changes': {}}
+    if not isinstance(metadata, dict):
+        return {'metadata': {}, 'changes': {}}
+    changes = compute_changes(metadata, args)
+    return {
+        'metadata': metadata,
+        'changes': changes,
+        'content': rewrite_frontmatter(content, changes) if changes else content,
+        'hash': content_hash(data),
+    }
+
+
+def apply_document(md_file: Path, plan: dict) -> None:
+    """Write a planned edit, refusing if the document changed since planning."""
+    replace_if_unchanged(md_file, plan['hash'], plan['content'])
+
+
+def describe(field: str, old, new) -> str:
+    """One preview line for a field change."""
+    if new is UNSET:
+        return f"{field}: {format_scalar(old)} → (removed)"
+    return f"{field}: {format_scalar(old) if old is not UNSET else '(unset)'} → {format_scalar(new)}"
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Bulk-edit document frontmatter. Previews by default; pass --apply to write.")
+    parser.add_argument('path_arg', nargs='?', default=None, metavar='path',
+                        help="project root (defaults to current directory)")
+    
+    select = parser.add_argument_group('selectors (all given selectors must match)')
+    select.add_argument('--tag', action='append', default=[], help="has this tag (repeatable: any of)")
+    select.add_argument('--status', action='append', default=[], help="has this status (repeatable: any of)")
+    select.add_argument('--category', action='append', default=[], help="is in this category (repeatable: any of)")
+    select.add_argument('--path', action='append', default=[], help="path under docs/ matches this glob, e.g. 'plans/auth-*'")
+    select.add_argument('--updated-after', metavar='YYYY-MM-DD', help="last_updated on or after this date")
+    select.add_argument('--updated-before', metavar='YYYY-MM-DD', help="last_updated on or before this date")
+    
+    edit = parser.add_argument_group('edits')
+    edit.add_argument('--set', action='append', default=[], type=parse_assignment, metavar='FIELD=VALUE',
+                      help="set a field (value parsed as YAML, e.g. tags=[a, b])")
+    edit.add_argument('--unset', action='append', default=[], metavar='FIELD', help="remove a field")
+    edit.add_argument('--add-tag', action='append', default=[], metavar='TAG')
+    edit.add_argument('--remove-tag', action='append', default=[], metavar='TAG')
+    edit.add_argument('--touch', action='store_true', help="also set last_updated to today on changed docs")
+    
+    parser.add_argument('--apply', action='store_true', help="write the changes (default is preview only)")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_IO_THREADS, help="parallel file reads/writes")
+    args = parser.parse_args()
+    
+    if not (args.set or args.unset or args.add_tag or args.remove_tag):
+        parser.error("no edits given (use --set, --unset, --add-tag or --remove-tag)")
+    
+    base_path = Path(args.path_arg).resolve() if args.path_arg else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    # Select from the scan cache: only changed docs are re-read here
+    cache = load_cache(docs_path)
+    categories = scan_documents(docs_path, cache=cache)
+    selected = [entry for docs in categories.values() for entry in docs if matches(entry, args)]
+    selected.sort(key=lambda entry: entry['path'])
+    
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        planned = list(pool.map(lambda entry: plan_document(docs_path / entry['path'], args), selected))
+    
+    change_set = [(entry['path'], plan) for entry, plan in zip(selected, planned) if plan['changes']]
+    
+    print(f"Selected {len(selected)} documents; {len(change_set)} would change")
+    print()
+    for path, plan in change_set:
+        print(f"  📄 {path}")
+        for field, value in plan['changes'].items():
+            print(f"     • {describe(field, plan['metadata'].get(field, UNSET), value)}")
+    
+    if not args.apply:
+        print()
+        print("🔍 PREVIEW - No files were modified. Re-run with --apply to write these changes.")
+        return
+    
+    if not change_set:
+        return
+    
+    # Hold the docs lock for the batch so parallel sessions' archive or
+    # bulk-edit runs can't interleave with it; each write is still checked
+    # against the content it was planned from
+    with docs_lock(docs_path):
+        with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+            futures = {path: pool.submit(apply_document, docs_path / path, plan)
+                       for path, plan in change_set}
+        errors = 0
+        for path, future in futures.items():
+            if future.exception():
+                errors += 1
+                print(f"  ❌ Error editing {path}: {future.exception()}")
+        
+        # Refresh the index and tag index: the cache means only the edited
+        # files are re-read
+        categories = scan_documents(docs_path, cache=cache)
+        regenerate_index(docs_path, categories, cache)
+        update_tag_index(docs_path, cache)
+        save_cache(docs_path, cache)
+    
+    print()
+    print(f"✅ Edited {len(change_set) - errors} documents ({errors} errors)")
+    print(f"✅ Updated: {docs_path / 'INDEX.md'}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
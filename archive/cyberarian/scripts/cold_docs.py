@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Cold storage for long-archived documents.
+
+Documents archived more than --older-than days ago are packed out of
+docs/archive/ into one compressed bundle per category under
+docs/archive/cold/. Each document is compressed separately (raw LZMA2
+via the stdlib lzma module; the sidecar's content hash stands in for the xz
+container's checksum) and appended to the bundle; a JSON sidecar records
+its byte offset and length, content hash and index metadata. Search reads only the sidecars, and
+restore seeks straight to one document without unpacking the rest.
+
+Restored documents leave dead bytes behind; once they make up more than
+half of a bundle it is rewritten under a new generation name, and the
+sidecar is switched to it atomically.
+"""
+
+import os
+import sys
+import lzma
+import json
+import argparse
+from pathlib import Path
+from datetime import date, datetime
+
+from index_docs import SKIP_FILES, load_cache, save_cache, scan_documents
+from link_docs import update_graph
+from docs_io import content_hash, atomic_write_text, create_exclusive, docs_lock
+
+
+COLD_DIR = 'cold'
+BUNDLE_VERSION = 1
+
+# Documents archived longer ago than this are packed by default
+COLD_AFTER_DAYS = 180
+
+# Raw streams skip the per-member xz header and index, which matters for
+# the many small documents a bundle holds
+LZMA_FILTERS = [{'id': lzma.FILTER_LZMA2, 'preset': 9}]
+
+# Rewrite a bundle once this fraction of its bytes belongs to restored docs
+COMPACT_FRACTION = 0.5
+
+
+def cold_path(docs_path: Path) -> Path:
+    """Directory holding the bundles and their sidecars."""
+    return docs_path / 'archive' / COLD_DIR
+
+
+def load_sidecar(docs_path: Path, category: str) -> dict:
+    """Load a category's bundle index, or an empty one."""
+    try:
+        sidecar = json.loads((cold_path(docs_path) / f"{category}.json").read_text())
+        if sidecar.get('version') == BUNDLE_VERSION:
+            return sidecar
+    except (OSError, ValueError):
+        pass
+    return {'version': BUNDLE_VERSION, 'generation': 0, 'size': 0, 'dead': 0, 'docs': {}}
+
+
+def save_sidecar(docs_path: Path, category: str, sidecar: dict) -> None:
+    """Atomically replace a category's bundle index."""
+    atomic_write_text(cold_path(docs_path) / f"{category}.json", json.dumps(sidecar, indent=1, sort_keys=True))
+
+
+def bundle_file(docs_path: Path, category: str, sidecar: dict) -> Path:
+    """The bundle file of the sidecar's current generation."""
+    return cold_path(docs_path) / f"{category}-{sidecar['generation']}.bundle"
+
+
+def load_sidecars(docs_path: Path) -> dict:
+    """{category: sidecar} for every bundle."""
+    directory = cold_path(docs_path)
+    if not directory.is_dir():
+        return {}
+    return {path.stem: load_sidecar(docs_path, path.stem) for path in sorted(directory.glob('*.json'))}
+
+
+def archived_on(metadata: dict, fallback: date) -> date:
+    """When a document was archived (archived_date, else last_updated)."""
+    for field in ('archived_date', 'last_updated'):
+        value = metadata.get(field)
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value))
+        except ValueError:
+            continue
+    return fallback
+
+
+def read_member(docs_path: Path, category: str, sidecar: dict, path: str) -> str:
+    """Decompress one document from a bundle, verifying its hash."""
+    record = sidecar['docs'][path]
+    with open(bundle_file(docs_path, category, sidecar), 'rb') as bundle:
+        bundle.seek(record['offset'])
+        data = lzma.decompress(bundle.read(record['length']), format=lzma.FORMAT_RAW, filters=LZMA_FILTERS)
+    if content_hash(data) != record['hash']:
+        raise ValueError(f"{path}: bundle data does not match its recorded hash")
+    return data.decode('utf-8')
+
+
+def compact(docs_path: Path, category: str, sidecar: dict) -> None:
+    """
+    Rewrite a bundle without dead bytes under the next generation name. The
+    new bundle is on disk before the sidecar is switched to it.
+    """
+    old_file = bundle_file(docs_path, category, sidecar)
+    new_sidecar = dict(sidecar, generation=sidecar['generation'] + 1, dead=0, docs={})
+    new_file = bundle_file(docs_path, category, new_sidecar)
+    offset = 0
+    with open(old_file, 'rb') as source, open(new_file, 'wb') as target:
+        for path, record in sorted(sidecar['docs'].items(), key=lambda item: item[1]['offset']):
+            source.seek(record['offset'])
+            target.write(source.read(record['length']))
+            new_sidecar['docs'][path] = dict(record, offset=offset)
+            offset += record['length']
+        target.flush()
+        os.fsync(target.fileno())
+    new_sidecar['size'] = offset
+    save_sidecar(docs_path, category, new_sidecar)
+    old_file.unlink()
+    sidecar.clear()
+    sidecar.update(new_sidecar)
+
+
+def pack(docs_path: Path, older_than: int = COLD_AFTER_DAYS, dry_run: bool = False, force: bool = False) -> dict:
+    """
+    Move documents archived more than older_than days ago into bundles.
+    Documents still linked from other documents are left in place unless
+    force is set. Candidates are picked from the scan cache; only documents
+    actually packed are read. The caller is expected to hold the docs lock.
+    """
+    stats = {'packed': 0, 'linked': 0, 'bytes_in': 0, 'bytes_out': 0}
+    cache = load_cache(docs_path)
+    categories = scan_documents(docs_path, cache=cache)
+    graph, _ = update_graph(docs_path, cache)
+    save_cache(docs_path, cache)
+    today = datetime.now().date()
+    
+    by_category = {}
+    for entry in categories.get('archive', []):
+        parts = Path(entry['path']).parts
+        if len(parts) < 3 or parts[1] == COLD_DIR or Path(entry['path']).name in SKIP_FILES:
+            continue
+        by_category.setdefault(parts[1], []).append(entry)
+    
+    for category, entries in sorted(by_category.items()):
+        sidecar = load_sidecar(docs_path, category)
+        appended = []
+        for entry in entries:
+            md_file = docs_path / entry['path']
+            record = cache['files'][entry['path']]
+            # last_updated in the entry falls back to the mtime; only a real one counts
+            metadata = {'archived_date': record.get('archived_date'),
+                        'last_updated': entry['last_updated'] if record.get('dated') else None}
+            archived = archived_on(metadata, today)
+            if (today - archived).days <= older_than:
+                continue
+            if graph['inbound'].get(entry['path']) and not force:
+                stats['linked'] += 1
+                continue
+            previous = sidecar['docs'].get(entry['path'])
+            if previous and previous['hash'] == record['hash']:
+                # Packed by an interrupted run that didn't get to remove it
+                appended.append((md_file, None))
+                continue
+            data = md_file.read_bytes()
+            compressed = lzma.compress(data, format=lzma.FORMAT_RAW, filters=LZMA_FILTERS)
+            stats['bytes_in'] += len(data)
+            stats['bytes_out'] += len(compressed)
+            appended.append((md_file, {
+                'data': compressed,
+                'hash': content_hash(data),
+                'entry': {key: value for key, value in entry.items() if key not in ('file_modified', 'digest')},
+                'archived_date': archived.isoformat(),
+                'summary': (record.get('digest') or {}).get('summary', ''),
+            }))
+        
+        if dry_run or not appended:
+            stats['packed'] += len(appended)
+            continue
+        
+        # Append to the bundle and flush it to disk before the sidecar points
+        # at the new bytes; only then remove the originals
+        cold_path(docs_path).mkdir(parents=True, exist_ok=True)
+        with open(bundle_file(docs_path, category, sidecar), 'ab') as bundle:
+            bundle.seek(0, 2)
+            offset = bundle.tell()
+            for md_file, member in appended:
+                if member is None:
+                    continue
+                bundle.write(member['data'])
+                path = str(md_file.relative_to(docs_path))
+                if path in sidecar['docs']:
+                    sidecar['dead'] += sidecar['docs'][path]['length']
+                sidecar['docs'][path] = {
+                    'offset': offset,
+                    'length': len(member['data']),
+                    **{key: value for key, value in member.items() if key != 'data'},
+                }
+                offset += len(member['data'])
+            bundle.flush()
+            os.fsync(bundle.fileno())
+        sidecar['size'] = offset
+        save_sidecar(docs_path, category, sidecar)
+        for md_file, _ in appended:
+            md_file.unlink(missing_ok=True)
+        stats['packed'] += len(appended)
+    
+    return stats
+
+
+def search(docs_path: Path, query: str = '', tags: list[str] = (), categories: list[str] = ()) -> list[dict]:
+    """Cold documents whose path, title, tags or summary match, from the sidecars only."""
+    query = query.lower()
+    results = []
+    for category, sidecar in load_sidecars(docs_path).items():
+        if categories and category not in categories:
+            continue
+        for path, record in sorted(sidecar['docs'].items()):
+            entry = record['entry']
+            doc_tags = entry['tags'] if isinstance(entry['tags'], list) else []
+            if tags and not set(tags) & set(doc_tags):
+                continue
+            haystack = ' '.join([path, str(entry['title']), ' '.join(map(str, doc_tags)), record['summary']])
+            if query and query not in haystack.lower():
+                continue
+            results.append({'path': path, 'bundle': category, 'archived_date': record['archived_date'],
+                            'summary': record['summary'], **entry})
+    return results
+
+
+def restore(docs_path: Path, path: str) -> Path:
+    """
+    Extract one document back to its archive path and drop it from its
+    bundle. The caller is expected to hold the docs lock.
+    """
+    for category, sidecar in load_sidecars(docs_path).items():
+        if path not in sidecar['docs']:
+            continue
+        target = docs_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        create_exclusive(target, read_member(docs_path, category, sidecar, path))
+        sidecar['dead'] += sidecar['docs'].pop(path)['length']
+        if not sidecar['docs']:
+            save_sidecar(docs_path, category, sidecar)
+            bundle_file(docs_path, category, sidecar).unlink(missing_ok=True)
+            (cold_path(docs_path) / f"{category}.json").unlink()
+        elif sidecar['dead'] > COMPACT_FRACTION * sidecar['size']:
+            compact(docs_path, category, sidecar)
+        else:
+            save_sidecar(docs_path, category, sidecar)
+        return target
+    raise KeyError(path)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Pack long-archived documents into compressed bundles.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    pack_parser = commands.add_parser('pack', help="move old archived documents into bundles")
+    pack_parser.add_argument('--older-than', type=int, default=COLD_AFTER_DAYS, metavar='DAYS',
+                             help=f"pack documents archived more than DAYS ago (default: {COLD_AFTER_DAYS})")
+    pack_parser.add_argument('--dry-run', action='store_true', help="report what would be packed")
+    pack_parser.add_argument('--force', action='store_true', help="also pack documents other documents link to")
+    
+    search_parser = commands.add_parser('search', help="search packed documents' metadata")
+    search_parser.add_argument('query', nargs='?', default='', help="substring of path, title, tags or summary")
+    search_parser.add_argument('--tag', action='append', default=[], help="has this tag (repeatable: any of)")
+    search_parser.add_argument('--category', action='append', default=[], help="original category (repeatable)")
+    search_parser.add_argument('--json', action='store_true', help="print results as JSON")
+    
+    restore_parser = commands.add_parser('restore', help="extract documents back into docs/archive/")
+    restore_parser.add_argument('docs', nargs='+', metavar='DOC', help="path under docs/, e.g. archive/plans/x.md")
+    
+    # argparse can't tell an omitted [path] from a command's own positionals,
+    # so a leading command name means the current directory
+    argv = sys.argv[1:]
+    if argv and argv[0] in commands.choices:
+        argv.insert(0, os.curdir)
+    args = parser.parse_args(argv)
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    if args.command == 'search':
+        results = search(docs_path, args.query, args.tag, args.category)
+        if args.json:
+            print(json.dumps(results, indent=2, default=str))
+            return
+        print(f"📦 {len(results)} packed document{'s' if len(results) != 1 else ''} match")
+        for doc in results:
+            print(f"  • {doc['path']} — {doc['title']} (archived {doc['archived_date']})")
+        return
+    
+    if args.command == 'restore':
+        errors = 0
+        with docs_lock(docs_path):
+            for doc in args.docs:
+                doc = doc.removeprefix('docs/')
+                try:
+                    restore(docs_path, doc)
+                    print(f"  ✅ Restored: {doc}")
+                except KeyError:
+                    errors += 1
+                    print(f"  ❌ Not in cold storage: {doc}")
+                except (OSError, ValueError) as e:
+                    errors += 1
+                    print(f"  ❌ Error restoring {doc}: {e}")
+        print("💡 Tip: Run 'python scripts/index_docs.py' to update the documentation index")
+        sys.exit(1 if errors else 0)
+    
+    with docs_lock(docs_path):
+        stats = pack(docs_path, args.older_than, args.dry_run, args.force)
+    
+    verb = "Would pack" if args.dry_run else "Packed"
+    print(f"✅ {verb} {stats['packed']} document{'s' if stats['packed'] != 1 else ''} "
+          f"archived more than {args.older_than} days ago")
+    if stats['bytes_in']:
+        print(f"   {stats['bytes_in']:,} bytes → {stats['bytes_out']:,} compressed")
+    if stats['linked']:
+        print(f"   Kept {stats['linked']} still linked from other documents (--force to pack anyway)")
+    if stats['packed'] and not args.dry_run:
+        print("💡 Tip: Run 'python scripts/index_docs.py' to update the documentation index")
+
+
+if __name__ == '__main__':
+    main()
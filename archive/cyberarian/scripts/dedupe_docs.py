@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate documents using the SimHash signatures the index scan
+caches for every document body.
+
+Signatures are split into bands; documents sharing any band land in the same
+LSH bucket and only those pairs are compared. With 64-bit signatures cut
+into six bands of 10-11 bits, any two signatures within Hamming distance 5
+are guaranteed to share a band (pigeonhole), so candidate generation is
+roughly linear in the number of documents instead of pairwise.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+from index_docs import load_cache, save_cache, scan_documents
+from docs_io import docs_lock
+
+
+# A few edits to a restated document typically move its signature 3-6 bits;
+# unrelated documents sit around 32 bits apart
+DEFAULT_DISTANCE = 5
+BANDS = 6
+BAND_EDGES = [round(band * 64 / BANDS) for band in range(BANDS + 1)]
+
+
+def lsh_buckets(signatures: dict) -> dict:
+    """Group paths by (band, band bits) of their signature."""
+    buckets = defaultdict(list)
+    for path, signature in signatures.items():
+        value = int(signature, 16)
+        for band in range(BANDS):
+            low, high = BAND_EDGES[band], BAND_EDGES[band + 1]
+            buckets[(band, value >> low & ((1 << (high - low)) - 1))].append(path)
+    return buckets
+
+
+def find_duplicate_clusters(signatures: dict, max_distance: int = DEFAULT_DISTANCE) -> list[list[str]]:
+    """
+    Cluster documents whose signatures are within max_distance bits.
+    signatures maps path -> 16-hex-digit SimHash. Returns sorted clusters of
+    two or more paths.
+    """
+    parent = {}
+    
+    def find(path):
+        parent.setdefault(path, path)
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+    
+    compared = set()
+    values = {path: int(signature, 16) for path, signature in signatures.items()}
+    for members in lsh_buckets(signatures).values():
+        if len(members) < 2:
+            continue
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair in compared:
+                    continue
+                compared.add(pair)
+                if bin(values[a] ^ values[b]).count('1') <= max_distance:
+                    parent[find(a)] = find(b)
+    
+    clusters = defaultdict(list)
+    for path in parent:
+        clusters[find(path)].append(path)
+    return sorted(sorted(members) for members in clusters.values() if len(members) > 1)
+
+
+def duplicate_clusters(docs_path: Path, cache: dict = None, max_distance: int = DEFAULT_DISTANCE,
+                       include_archive: bool = False) -> tuple[list[list[dict]], dict]:
+    """
+    Scan (through the cache, so only changed docs are read) and cluster
+    near-duplicates. Returns (clusters of index entries, the scan cache).
+    """
+    if cache is None:
+        cache = load_cache(docs_path)
+    scan_documents(docs_path, cache=cache)
+    return cached_clusters(cache, max_distance, include_archive), cache
+
+
+def cached_clusters(cache: dict, max_distance: int = DEFAULT_DISTANCE,
+                    include_archive: bool = False) -> list[list[dict]]:
+    """
+    Cluster near-duplicates from a scan cache that is already up to date,
+    without touching docs/. Returns clusters of index entries.
+    """
+    entries = {path: record['entry'] for path, record in cache['files'].items()}
+    signatures = {
+        path: record['simhash']
+        for path, record in cache['files'].items()
+        if record.get('simhash') and (include_archive or entries[path]['category'] != 'archive')
+    }
+    clusters = find_duplicate_clusters(signatures, max_distance)
+    return [[entries[path] for path in cluster] for cluster in clusters]
+
+
+def archive_candidates(clusters: list[list[dict]]) -> list[tuple[dict, dict]]:
+    """
+    For each cluster, every document except the most recently updated one,
+    paired with the document it appears to restate.
+    """
+    candidates = []
+    for cluster in clusters:
+        ordered = sorted(cluster, key=lambda doc: (str(doc['last_updated']), doc['path']), reverse=True)
+        keep = ordered[0]
+        candidates.extend((doc, keep) for doc in ordered[1:])
+    return candidates
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report near-duplicate documents.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--distance', type=int, default=DEFAULT_DISTANCE,
+                        help=f"max differing signature bits to count as a duplicate (default: {DEFAULT_DISTANCE}, "
+                             f"reliable up to {BANDS - 1})")
+    parser.add_argument('--include-archive', action='store_true', help="also compare documents in archive/")
+    parser.add_argument('--json', action='store_true', help="print clusters as JSON")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    with docs_lock(docs_path):
+        clusters, cache = duplicate_clusters(docs_path, max_distance=args.distance,
+                                             include_archive=args.include_archive)
+        save_cache(docs_path, cache)
+    
+    if args.json:
+        print(json.dumps([[doc['path'] for doc in cluster] for cluster in clusters], indent=2))
+        return
+    
+    if not clusters:
+        print("✅ No near-duplicate documents found")
+        return
+    
+    print(f"⚠️  {len(clusters)} near-duplicate cluster{'s' if len(clusters) != 1 else ''}:")
+    print()
+    for cluster in clusters:
+        for doc in sorted(cluster, key=lambda d: str(d['last_updated']), reverse=True):
+            print(f"  📄 {doc['path']} — {doc['title']} ({doc['status']}, updated {doc['last_updated']})")
+        print()
+    
+    candidates = archive_candidates(clusters)
+    print(f"💡 {len(candidates)} archive candidate{'s' if len(candidates) != 1 else ''} "
+          "(older copies; review before archiving):")
+    for doc, keep in candidates:
+        print(f"  • {doc['path']} (restates {keep['path']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Show per-document digests - first heading, opening paragraph, heading
+outline, word count and reading time - so documents can be triaged without
+being opened.
+
+Digests are computed by the index scan and cached with each document's
+content hash; only documents changed since the last scan are re-read.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from index_docs import load_cache, save_cache, scan_documents
+from bulk_edit_docs import matches
+from docs_io import docs_lock
+
+
+def format_digest(entry: dict, outline: bool = False) -> list[str]:
+    """Display lines for one document's digest."""
+    digest = entry['digest'] or {}
+    lines = [f"📄 {entry['path']} — {entry['title']} "
+             f"({entry['status']}, {digest.get('words', 0)} words, ~{digest.get('minutes', 0)} min)"]
+    if digest.get('summary'):
+        lines.append(f"   {digest['summary']}")
+    if outline:
+        for level, heading in digest.get('outline', []):
+            lines.append(f"   {'  ' * (level - 1)}• {heading}")
+    return lines
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Show document digests without opening the documents.")
+    parser.add_argument('path_arg', nargs='?', default=None, metavar='path',
+                        help="project root (defaults to current directory)")
+    parser.add_argument('--doc', action='append', default=[], metavar='DOC', help="path under docs/ (repeatable)")
+    
+    select = parser.add_argument_group('selectors (all given selectors must match)')
+    select.add_argument('--tag', action='append', default=[], help="has this tag (repeatable: any of)")
+    select.add_argument('--status', action='append', default=[], help="has this status (repeatable: any of)")
+    select.add_argument('--category', action='append', default=[], help="is in this category (repeatable: any of)")
+    select.add_argument('--path', action='append', default=[], help="path under docs/ matches this glob")
+    select.add_argument('--updated-after', metavar='YYYY-MM-DD', help="last_updated on or after this date")
+    select.add_argument('--updated-before', metavar='YYYY-MM-DD', help="last_updated on or before this date")
+    
+    parser.add_argument('--outline', action='store_true', help="include each document's heading outline")
+    parser.add_argument('--json', action='store_true', help="print digests as JSON")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path_arg).resolve() if args.path_arg else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    with docs_lock(docs_path):
+        cache = load_cache(docs_path)
+        categories = scan_documents(docs_path, cache=cache)
+        save_cache(docs_path, cache)
+    
+    entries = {entry['path']: entry for docs in categories.values() for entry in docs}
+    wanted = {doc.removeprefix('docs/') for doc in args.doc}
+    missing = sorted(wanted - set(entries))
+    selected = [entry for path, entry in sorted(entries.items())
+                if (not wanted or path in wanted) and matches(entry, args)]
+    
+    if args.json:
+        print(json.dumps([{'path': e['path'], 'title': e['title'], 'status': e['status'], **(e['digest'] or {})}
+                          for e in selected], indent=2, default=str))
+    else:
+        for entry in selected:
+            print('\n'.join(format_digest(entry, args.outline)))
+    
+    for doc in missing:
+        print(f"❌ Not an indexed document: {doc}", file=sys.stderr)
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Report on documentation health: which docs most need attention.
+Streams over every document's frontmatter once, keeping only bounded top-k
+heaps, so memory stays flat regardless of how large docs/ grows.
+"""
+
+import sys
+import json
+import heapq
+import argparse
+from pathlib import Path
+from datetime import date, datetime
+
+from index_docs import SKIP_FILES, extract_frontmatter
+from archive_docs import ARCHIVING_RULES
+from docs_io import atomic_write_text
+
+
+DEFAULT_TOP = 10
+
+REPORTS = {
+    'stale_active': 'Most stale active documents',
+    'oldest_drafts': 'Drafts open the longest',
+    'untagged': 'Documents with no tags',
+    'near_archive': 'Nearest their archive threshold',
+}
+
+
+def positive_int(text: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{text}'")
+    return value
+
+
+class TopK:
+    """Keeps the k highest-scoring items seen, in O(k) memory."""
+    
+    def __init__(self, k: int):
+        self.k = k
+        self.total = 0
+        self._heap = []
+        self._counter = 0  # tie-breaker so items themselves are never compared
+    
+    def push(self, score, item: dict) -> None:
+        self.total += 1
+        self._counter += 1
+        entry = (score, -self._counter, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def items(self) -> list[dict]:
+        """Items sorted from highest score down."""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+def to_date(value, fallback: date = None) -> date:
+    """Coerce a frontmatter date (date object or YYYY-MM-DD string) to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        return fallback
+
+
+def iter_documents(docs_path: Path):
+    """
+    Yield (path, category, metadata) for every document outside archive/,
+    one at a time.
+    """
+    for category_dir in sorted(docs_path.iterdir()):
+        if not category_dir.is_dir() or category_dir.name.startswith('.') or category_dir.name == 'archive':
+            continue
+        
+        for md_file in category_dir.rglob('*.md'):
+            if md_file.name in SKIP_FILES:
+                continue
+            yield md_file, category_dir.name, extract_frontmatter(md_file)
+
+
+def collect_health(docs_path: Path, top: int = DEFAULT_TOP, today: date = None) -> dict:
+    """Stream over all documents and build the top-k health lists."""
+    today = today or datetime.now().date()
+    heaps = {name: TopK(top) for name in REPORTS}
+    scanned = 0
+    
+    for md_file, category, metadata in iter_documents(docs_path):
+        scanned += 1
+        
+        status = metadata.get('status', 'unknown')
+        modified = datetime.fromtimestamp(md_file.stat().st_mtime).date()
+        last_updated = to_date(metadata.get('last_updated'), modified)
+        created = to_date(metadata.get('created'), last_updated)
+        
+        item = {
+            'path': str(md_file.relative_to(docs_path)),
+            'title': str(metadata.get('title', md_file.stem)),
+            'status': str(status),
+            'last_updated': last_updated.isoformat(),
+            'days_since_update': (today - last_updated).days,
+        }
+        
+        if status == 'active':
+            heaps['stale_active'].push(item['days_since_update'], item)
+        
+        if status == 'draft':
+            days_open = (today - created).days
+            heaps['oldest_drafts'].push(days_open, {**item, 'days_open': days_open})
+        
+        if not metadata.get('tags'):
+            heaps['untagged'].push(item['days_since_update'], item)
+        
+        rules = ARCHIVING_RULES.get(category, {})
+        threshold = rules.get('complete_after_days')
+        if rules.get('auto_archive') and threshold and status == 'complete':
+            days_left = threshold - item['days_since_update']
+            if days_left > 0:
+                # Fewest days left scores highest
+                heaps['near_archive'].push(-days_left, {**item, 'days_until_archive': days_left})
+    
+    return {
+        'generated': today.isoformat(),
+        'scanned': scanned,
+        'top': top,
+        'reports': {
+            name: {'title': REPORTS[name], 'total': heap.total, 'items': heap.items()}
+            for name, heap in heaps.items()
+        }
+    }
+
+
+def format_markdown(health: dict) -> str:
+    """Render the health report as markdown."""
+    detail = {
+        'stale_active': lambda d: f"{d['days_since_update']} days since update",
+        'oldest_drafts': lambda d: f"open {d['days_open']} days",
+        'untagged': lambda d: f"{d['status']}, updated {d['last_updated']}",
+        'near_archive': lambda d: f"archives in {d['days_until_archive']} days",
+    }
+    
+    lines = [
+        "# Documentation Health",
+        "",
+        f"Generated {health['generated']} from {health['scanned']} documents.",
+        "",
+    ]
+    for name, report in health['reports'].items():
+        lines.append(f"## {report['title']} ({report['total']})")
+        lines.append("")
+        if not report['items']:
+            lines.append("_None._")
+        for doc in report['items']:
+            lines.append(f"- [{doc['title']}]({doc['path']}) — {detail[name](doc)}")
+        if report['total'] > len(report['items']):
+            lines.append(f"- _(+{report['total'] - len(report['items'])} more)_")
+        lines.append("")
+    
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report the docs most in need of attention.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--top', type=positive_int, default=DEFAULT_TOP, help=f"entries per list (default: {DEFAULT_TOP})")
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown')
+    parser.add_argument('--output', type=Path, help="write the report to a file instead of stdout")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    health = collect_health(docs_path, top=args.top)
+    
+    if args.format == 'json':
+        report = json.dumps(health, indent=2, default=str)
+    else:
+        report = format_markdown(health)
+    
+    if args.output:
+        atomic_write_text(args.output, report + '\n')
+        print(f"✅ Wrote health report for {health['scanned']} documents to {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Concurrency-safe file helpers shared by the cyberarian scripts.
+
+Several agent sessions or worktrees may run maintenance against the same
+docs/ at once. Mutating operations take an advisory lock on
+docs/.cyberarian/lock, every write goes through a temp file + os.replace so
+readers never see a half-written file, and document rewrites check the
+content hash they planned against before replacing the file.
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Shared state directory inside docs/ (hidden from the category scan)
+STATE_DIR = '.cyberarian'
+LOCK_FILE = 'lock'
+
+# How long to wait for another session's lock before giving up
+DEFAULT_LOCK_TIMEOUT = 60.0
+
+# Read once at import: os.umask can only be queried by setting it, which is
+# not safe to do while other threads are creating files
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+class LockTimeout(RuntimeError):
+    """Another process held the docs lock for longer than the timeout."""
+
+
+class ConcurrentModification(RuntimeError):
+    """A document changed on disk between planning and rewriting it."""
+
+
+def state_dir(docs_path: Path) -> Path:
+    """Return docs/.cyberarian, creating it (self-gitignored) if needed."""
+    path = docs_path / STATE_DIR
+    path.mkdir(exist_ok=True)
+    gitignore = path / '.gitignore'
+    if not gitignore.exists():
+        gitignore.write_text('*\n')
+    return path
+
+
+def content_hash(data: bytes) -> str:
+    """Hash used for cache records and optimistic concurrency checks."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write a file via a sibling temp file and os.replace."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o7777)
+        else:
+            # mkstemp creates files 0600; give new files the usual mode
+            os.chmod(tmp_name, 0o666 & ~UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def create_exclusive(path: Path, text: str) -> None:
+    """
+    Atomically write a file that must not already exist. Raises
+    FileExistsError if another writer claimed the name first.
+    """
+    path = Path(path)
+    with open(path, 'x', encoding='utf-8'):
+        pass  # claim the name; the content lands atomically below
+    try:
+        atomic_write_text(path, text)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+
+def replace_if_unchanged(path: Path, expected_hash: str, text: str) -> None:
+    """
+    Rewrite a document only if its content still hashes to expected_hash,
+    raising ConcurrentModification otherwise.
+    """
+    current = content_hash(Path(path).read_bytes())
+    if current != expected_hash:
+        raise ConcurrentModification(f"{path} changed since it was read; re-run to pick up the new content")
+    atomic_write_text(path, text)
+
+
+@contextmanager
+def docs_lock(docs_path: Path, timeout: float = DEFAULT_LOCK_TIMEOUT):
+    """
+    Hold the exclusive advisory lock for docs/ for the duration of the block.
+    Other cyberarian processes wait; plain readers are unaffected.
+    """
+    lock_path = state_dir(docs_path) / LOCK_FILE
+    deadline = time.monotonic() + timeout
+    with open(lock_path, 'a+') as handle:
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"timed out after {timeout:.0f}s waiting for {lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
@@ -7,19 +7,75 @@ Reads YAML frontmatter to extract metadata and organize the index.
 import os
 import sys
 import re
+import json
+import time
+import hashlib
+import argparse
+import posixpath
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+from urllib.parse import unquote
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 import yaml
 
+from docs_io import STATE_DIR, state_dir, content_hash, atomic_write_text, docs_lock
 
-def extract_frontmatter(file_path: Path) -> dict:
-    """Extract YAML frontmatter from a markdown file."""
+
+# Skip these files when scanning
+SKIP_FILES = {'README.md', 'INDEX.md', '.gitkeep'}
+
+# Default thread count for --io-threads when given without a value. I/O-bound
+# work benefits from far more threads than cores: each one mostly sits waiting
+# on a network round trip.
+DEFAULT_IO_THREADS = 32
+
+# Scan cache location (inside docs/, hidden from the category scan) and format
+CACHE_FILE = 'index_cache.json'
+CACHE_VERSION = 7
+
+# Near-duplicate signatures: 64-bit SimHash over word shingles. Bodies with
+# fewer tokens than this are too short to fingerprint meaningfully.
+SIMHASH_SHINGLE = 3
+SIMHASH_MIN_TOKENS = 20
+
+# Per-document digests: enough to triage a document without opening it
+DIGEST_SUMMARY_CHARS = 240
+DIGEST_OUTLINE_MAX = 30
+WORDS_PER_MINUTE = 200
+
+FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+WORD_RE = re.compile(r'\w+')
+
+# Terms for related-document similarity (see related_docs.py)
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9_-]*[a-z0-9]')
+STOPWORDS = frozenset("""
+    about above after again against all also and any are because been before being below between both but
+    can could did does doing down during each few for from further had has have having her here hers him
+    his how into its itself just more most not now off once only other our ours out over own same she
+    should some such than that the their theirs them then there these they this those through too under
+    until very was were what when where which while who whom why will with would you your yours
+""".split())
+
+# Relative links between documents: inline [text](href) links and reference
+# definitions ([id]: href). Group 2 is the href. Links inside fenced code
+# blocks are examples, not references, and are skipped.
+LINK_RE = re.compile(r'(\]\(\s*<?|^ {0,3}\[[^\]\n]+\]:[ \t]*<?)([^\s()<>]+)', re.MULTILINE)
+FENCE_RE = re.compile(r'^ {0,3}(```|~~~).*?(?:^ {0,3}\1[^\n]*$|\Z)', re.MULTILINE | re.DOTALL)
+HEADING_RE = re.compile(r'^ {0,3}(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$')
+FENCE_LINE_RE = re.compile(r'^ {0,3}(```|~~~)')
+# Markdown markup stripped from digest summaries, which are shown out of
+# context (relative links would resolve against the wrong directory)
+INLINE_LINK_RE = re.compile(r'!?\[([^\]]*)\](?:\([^)]*\)|\[[^\]]*\])')
+INLINE_MARKUP_RE = re.compile(r'<[^>\n]*>|\*\*|__')
+URL_SCHEME_RE = re.compile(r'^[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+
+
+def parse_frontmatter(content: str, file_path: Path) -> dict:
+    """Parse YAML frontmatter from already-read markdown content."""
     try:
-        content = file_path.read_text()
-        
         # Match YAML frontmatter between --- delimiters
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
+        match = FRONTMATTER_RE.match(content)
         if not match:
             return {}
         
@@ -29,62 +85,364 @@ def extract_frontmatter(file_path: Path) -> dict:
         return metadata if isinstance(metadata, dict) else {}
     
     except Exception as e:
-        print(f"⚠️  Warning: Could not parse frontmatter in {file_path}: {e}")
+        print(f"⚠️  Warning: Could not parse frontmatter in {file_path}: {e}", file=sys.stderr)
         return {}
 
 
-def get_file_stats(file_path: Path) -> dict:
-    """Get file statistics."""
-    stats = file_path.stat()
+def extract_frontmatter(file_path: Path) -> dict:
+    """Extract YAML frontmatter from a markdown file."""
+    try:
+        content = file_path.read_text()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not parse frontmatter in {file_path}: {e}", file=sys.stderr)
+        return {}
+    return parse_frontmatter(content, file_path)
+
+
+def document_body(content: str) -> str:
+    """The markdown content after the frontmatter block."""
+    match = FRONTMATTER_RE.match(content)
+    return content[match.end():] if match else content
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, minus stopwords and very short words."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOPWORDS]
+
+
+def term_counts(text: str) -> dict:
+    """Counts of the tokenize() terms in a text."""
+    counts = {}
+    for term in tokenize(text):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def simhash(text: str) -> str | None:
+    """
+    64-bit SimHash of a text's word shingles, as 16 hex digits, or None if
+    the text is too short. Near-identical texts differ in only a few bits.
+    """
+    tokens = WORD_RE.findall(text.lower())
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+    
+    weights = defaultdict(int)
+    for i in range(len(tokens) - SIMHASH_SHINGLE + 1):
+        weights[' '.join(tokens[i:i + SIMHASH_SHINGLE])] += 1
+    
+    totals = [0] * 64
+    for shingle, weight in weights.items():
+        bits = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            totals[bit] += weight if bits >> bit & 1 else -weight
+    
+    return format(sum(1 << bit for bit in range(64) if totals[bit] > 0), '016x')
+
+
+def document_digest(body: str) -> dict:
+    """
+    Cheap summary of a document body: first heading, first paragraph
+    (truncated), heading outline, word count and reading time in minutes.
+    Fenced code blocks are skipped for everything but the word count.
+    """
+    outline, paragraph, current, in_fence = [], None, [], False
+    for line in body.splitlines():
+        if FENCE_LINE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            if len(outline) < DIGEST_OUTLINE_MAX:
+                outline.append([len(heading.group(1)), heading.group(2).strip()])
+        elif paragraph is None and line.strip():
+            current.append(line.strip())
+            continue
+        if current and paragraph is None:
+            paragraph = ' '.join(current)
+    if current and paragraph is None:
+        paragraph = ' '.join(current)
+    
+    if paragraph:
+        paragraph = ' '.join(INLINE_MARKUP_RE.sub('', INLINE_LINK_RE.sub(r'\1', paragraph)).split())
+    if paragraph and len(paragraph) > DIGEST_SUMMARY_CHARS:
+        paragraph = paragraph[:DIGEST_SUMMARY_CHARS].rsplit(' ', 1)[0] + '…'
+    words = len(WORD_RE.findall(body))
     return {
+        'heading': outline[0][1] if outline else None,
+        'summary': paragraph or '',
+        'outline': outline,
+        'words': words,
+        'minutes': max(1, round(words / WORDS_PER_MINUTE)) if words else 0,
+    }
+
+
+def link_matches(text: str):
+    """LINK_RE matches in markdown text, excluding fenced code blocks."""
+    fences = [m.span() for m in FENCE_RE.finditer(text)]
+    for match in LINK_RE.finditer(text):
+        if not any(start <= match.start() < end for start, end in fences):
+            yield match
+
+
+def link_target(href: str, source: str) -> tuple[str, str] | None:
+    """
+    Resolve a link href found in source (a path relative to docs/) to the
+    docs-relative path of the document it points at, plus any #fragment or
+    ?query suffix. Returns None for URLs, absolute paths, same-page anchors,
+    non-markdown targets and targets outside docs/.
+    """
+    if URL_SCHEME_RE.match(href) or href.startswith('/'):
+        return None
+    cut = min((i for i in (href.find('#'), href.find('?')) if i >= 0), default=len(href))
+    path, suffix = unquote(href[:cut]), href[cut:]
+    if not path.endswith('.md'):
+        return None
+    target = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+    if target == '..' or target.startswith('../'):
+        return None
+    return target, suffix
+
+
+def extract_links(content: str, source: str) -> list[str]:
+    """Sorted docs-relative paths of the documents a document links to."""
+    targets = set()
+    for match in link_matches(document_body(content)):
+        resolved = link_target(match.group(2), source)
+        if resolved:
+            targets.add(resolved[0])
+    return sorted(targets)
+
+
+def load_cache(docs_path: Path) -> dict:
+    """Load the scan cache, or an empty one if missing, corrupt or outdated."""
+    cache_path = docs_path / STATE_DIR / CACHE_FILE
+    try:
+        cache = json.loads(cache_path.read_text())
+        if cache.get('version') == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {'version': CACHE_VERSION, 'files': {}, 'dirs': {}}
+
+
+def save_cache(docs_path: Path, cache: dict) -> None:
+    """Persist the scan cache (in the self-gitignored state directory)."""
+    atomic_write_text(state_dir(docs_path) / CACHE_FILE, json.dumps(cache, default=str))
+
+
+def json_safe(value):
+    """Normalize YAML scalars (dates, datetimes) to plain strings."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [json_safe(v) for v in value]
+    return value
+
+
+def visit_file(md_file: Path, docs_path: Path, category_name: str, cached_files: dict) -> tuple[dict, bool]:
+    """
+    Stat a document and build its cache record, reading it only if it changed.
+    Returns (record, was_read).
+    """
+    relative_path = str(md_file.relative_to(docs_path))
+    stats = md_file.stat()
+    
+    cached = cached_files.get(relative_path)
+    if cached and cached['mtime_ns'] == stats.st_mtime_ns and cached['size'] == stats.st_size:
+        return cached, False
+    
+    data = md_file.read_bytes()
+    content = data.decode('utf-8', errors='replace')
+    metadata = parse_frontmatter(content, md_file)
+    body = document_body(content)
+    modified = datetime.fromtimestamp(stats.st_mtime)
+    
+    entry = {
+        'path': relative_path,
+        'title': metadata.get('title', md_file.stem),
+        'status': metadata.get('status', 'unknown'),
+        'created': metadata.get('created', 'unknown'),
+        'last_updated': metadata.get('last_updated', modified.strftime('%Y-%m-%d')),
+        'tags': metadata.get('tags', []),
+        'category': category_name,
+    }
+    record = {
+        'mtime_ns': stats.st_mtime_ns,
         'size': stats.st_size,
-        'modified': datetime.fromtimestamp(stats.st_mtime)
+        'hash': content_hash(data),
+        'simhash': simhash(body),
+        'links': extract_links(content, relative_path),
+        'digest': document_digest(body),
+        'terms': term_counts(body),
+        # last_updated falls back to the mtime; archiving needs the real one
+        'dated': 'last_updated' in metadata,
+        'archived_date': json_safe(metadata.get('archived_date')),
+        'entry': {key: json_safe(value) for key, value in entry.items()},
     }
+    return record, True
 
 
-def scan_documents(docs_path: Path) -> dict:
-    """Scan all markdown documents in docs/ and extract metadata."""
+def visit_directory(directory: Path, docs_path: Path, cache: dict, prune_dirs: bool) -> dict:
+    """
+    Stat a directory and list its children, unless pruning is enabled and the
+    directory is unchanged since the cached scan, in which case the cached
+    child list is reused without listing.
+    """
+    relative_path = str(directory.relative_to(docs_path))
+    # Stat before listing: a change racing the listing then shows up next run
+    mtime_ns = directory.stat().st_mtime_ns
+    
+    cached = cache['dirs'].get(relative_path)
+    # A directory entry without records for its files (a damaged cache) is relisted
+    if (prune_dirs and cached and cached['mtime_ns'] == mtime_ns
+            and all(os.path.join(relative_path, name) in cache['files'] for name in cached['files'])):
+        return {'path': relative_path, 'mtime_ns': mtime_ns, 'pruned': True,
+                'files': cached['files'], 'subdirs': cached['subdirs']}
+    
+    files, subdirs = [], []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(entry.name)
+            elif entry.name.endswith('.md') and entry.name not in SKIP_FILES:
+                files.append(entry.name)
+    return {'path': relative_path, 'mtime_ns': mtime_ns, 'pruned': False,
+            'files': files, 'subdirs': subdirs}
+
+
+class InlineExecutor:
+    """Executor stand-in that runs each task immediately, for serial scans."""
+    
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+def scan_documents(docs_path: Path, io_threads: int = 0, cache: dict = None,
+                   prune_dirs: bool = False, stats: dict = None) -> dict:
+    """
+    Scan all markdown documents in docs/ and extract metadata.
+    
+    With io_threads > 0, directory listings, stats and reads are pipelined
+    through a bounded thread pool so many requests are in flight at once.
+    That hides per-call latency on network filesystems (NFS, SMB); on a
+    local disk the serial scan is just as fast.
+    
+    With a cache (see load_cache), unchanged files are stat'ed but not read,
+    and the cache is rebuilt in place from this scan. With prune_dirs as
+    well, a directory whose mtime is unchanged is not even listed: its cached
+    files are reused without a stat. Directory mtimes change when entries
+    are added, removed or renamed (which includes editors that save via
+    rename), but not on in-place writes, so pruning trades that case for
+    near-instant no-op scans.
+    
+    If given, stats is filled with counters: read, cached, dirs_listed,
+    dirs_pruned.
+    """
     categories = defaultdict(list)
+    old_cache = cache if cache is not None else {'files': {}, 'dirs': {}}
+    new_files, new_dirs = {}, {}
+    counters = {'read': 0, 'cached': 0, 'dirs_listed': 0, 'dirs_pruned': 0}
     
-    # Skip these files/directories
-    skip_files = {'README.md', 'INDEX.md', '.gitkeep'}
-    skip_dirs = {'archive'}  # We'll handle archive separately
+    max_in_flight = max(io_threads, 1) * 4
+    pending_dirs = []   # (directory, category) waiting to be visited
+    pending_files = []  # (file, category) waiting to be visited
     
     for category_dir in docs_path.iterdir():
-        if not category_dir.is_dir() or category_dir.name.startswith('.'):
-            continue
-        
-        category_name = category_dir.name
-        
-        # Find all markdown files
-        for md_file in category_dir.rglob('*.md'):
-            if md_file.name in skip_files:
-                continue
-            
-            # Extract metadata
-            metadata = extract_frontmatter(md_file)
-            stats = get_file_stats(md_file)
+        if category_dir.is_dir() and not category_dir.name.startswith('.'):
+            pending_dirs.append((category_dir, category_dir.name))
+    
+    def add_record(relative_path, record):
+        new_files[relative_path] = record
+        entry = dict(record['entry'])
+        entry['file_modified'] = datetime.fromtimestamp(record['mtime_ns'] / 1e9)
+        entry['digest'] = record.get('digest')
+        categories[entry['category']].append(entry)
+    
+    if io_threads > 0:
+        executor = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix='scan')
+    else:
+        executor = InlineExecutor()
+    
+    with executor as pool:
+        in_flight = {}
+        while pending_dirs or pending_files or in_flight:
+            # Top up the pool, directories first so the walk stays ahead of
+            # the reads. At most max_in_flight tasks are queued (readahead),
+            # keeping memory bounded on huge trees.
+            while len(in_flight) < max_in_flight and (pending_dirs or pending_files):
+                if pending_dirs:
+                    directory, category = pending_dirs.pop()
+                    future = pool.submit(visit_directory, directory, docs_path, old_cache, prune_dirs)
+                    in_flight[future] = (directory, category)
+                else:
+                    md_file, category = pending_files.pop()
+                    future = pool.submit(visit_file, md_file, docs_path, category, old_cache['files'])
+                    in_flight[future] = (md_file, category)
             
-            # Build document entry
-            relative_path = md_file.relative_to(docs_path)
-            doc_entry = {
-                'path': str(relative_path),
-                'title': metadata.get('title', md_file.stem),
-                'status': metadata.get('status', 'unknown'),
-                'created': metadata.get('created', 'unknown'),
-                'last_updated': metadata.get('last_updated', stats['modified'].strftime('%Y-%m-%d')),
-                'tags': metadata.get('tags', []),
-                'category': category_name,
-                'file_modified': stats['modified']
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, category = in_flight.pop(future)
+                result = future.result()
+                if isinstance(result, tuple):
+                    record, was_read = result
+                    counters['read' if was_read else 'cached'] += 1
+                    add_record(record['entry']['path'], record)
+                    continue
+                
+                new_dirs[result['path']] = result
+                pending_dirs.extend((path / name, category) for name in result['subdirs'])
+                if result['pruned']:
+                    counters['dirs_pruned'] += 1
+                    for name in result['files']:
+                        relative_path = os.path.join(result['path'], name)
+                        counters['cached'] += 1
+                        add_record(relative_path, old_cache['files'][relative_path])
+                else:
+                    counters['dirs_listed'] += 1
+                    pending_files.extend((path / name, category) for name in result['files'])
+    
+    if cache is not None:
+        cache['files'] = new_files
+        cache['dirs'] = {
+            relative_path: {
+                'mtime_ns': info['mtime_ns'],
+                'files': sorted(info['files']),
+                'subdirs': sorted(info['subdirs']),
             }
-            
-            categories[category_name].append(doc_entry)
+            for relative_path, info in new_dirs.items()
+        }
+    if stats is not None:
+        stats.update(counters)
+    
+    # Completion order is nondeterministic; keep ties stable
+    for docs in categories.values():
+        docs.sort(key=lambda d: d['path'])
     
     return categories
 
 
-def generate_index(categories: dict) -> str:
-    """Generate the INDEX.md content."""
+def generate_index(categories: dict, related: dict = None, digests: bool = False) -> str:
+    """
+    Generate the INDEX.md content. If related ({path: [[path, score], ...]},
+    see related_docs.py) is given, each document gets a "Related" line. With
+    digests, each document also shows its length and reading time and gets
+    a one-line summary.
+    """
+    titles = {doc['path']: doc['title'] for docs in categories.values() for doc in docs}
     total_docs = sum(len(docs) for docs in categories.values())
     
     index_lines = [
@@ -134,20 +492,55 @@ def generate_index(categories: dict) -> str:
                 parts = [title_link, status_badge, updated]
                 if tags:
                     parts.append(tags)
+                digest = doc.get('digest') if digests else None
+                if digest:
+                    parts.append(f"{digest['words']} words, ~{digest['minutes']} min")
                 
                 index_lines.append(f"- {' | '.join(parts)}")
+                
+                if digest and digest['summary']:
+                    index_lines.append(f"  - {digest['summary']}")
+                
+                if related and related.get(doc['path']):
+                    links = [f"[{titles.get(path, path)}]({path})" for path, _ in related[doc['path']]]
+                    index_lines.append(f"  - Related: {', '.join(links)}")
             
             index_lines.append("")
     
     return '\n'.join(index_lines)
 
 
+def regenerate_index(docs_path: Path, categories: dict, cache: dict) -> None:
+    """
+    Rewrite INDEX.md with the optional sections (Related lines, digests) it
+    was last generated with by this script, as recorded in the scan cache,
+    so tools that edit documents don't drop them. The caller is expected to
+    hold the docs lock.
+    """
+    options = cache.get('index', {})
+    related = None
+    if options.get('related'):
+        from related_docs import update_related
+        related = update_related(docs_path, categories, cache)
+    atomic_write_text(docs_path / 'INDEX.md', generate_index(categories, related, options.get('digests', False)))
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) > 1:
-        base_path = Path(sys.argv[1]).resolve()
-    else:
-        base_path = Path.cwd()
+    parser = argparse.ArgumentParser(description="Regenerate docs/INDEX.md.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--io-threads', type=int, nargs='?', const=DEFAULT_IO_THREADS, default=0, metavar='N',
+                        help=f"pipeline I/O through N threads for high-latency filesystems (default when given: {DEFAULT_IO_THREADS})")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and don't update the scan cache")
+    parser.add_argument('--prune-dirs', action='store_true',
+                        help="skip listing directories whose mtime is unchanged (misses in-place edits)")
+    parser.add_argument('--related', action='store_true',
+                        help="add a 'Related' line per document (TF-IDF similarity, see related_docs.py)")
+    parser.add_argument('--digests', action='store_true',
+                        help="add word count, reading time and a one-line summary per document")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
     
     docs_path = base_path / 'docs'
     
@@ -159,18 +552,51 @@ def main():
     print(f"Scanning documents in: {docs_path}")
     
     # Scan all documents
-    categories = scan_documents(docs_path)
-    
-    # Generate index content
-    index_content = generate_index(categories)
+    # --no-cache scans into a throwaway cache: everything is read, nothing saved
+    cache = {'version': CACHE_VERSION, 'files': {}, 'dirs': {}} if args.no_cache else load_cache(docs_path)
+    scan_stats = {}
+    started = time.perf_counter()
+    categories = scan_documents(docs_path, io_threads=args.io_threads, cache=cache,
+                                prune_dirs=args.prune_dirs and not args.no_cache, stats=scan_stats)
+    elapsed = time.perf_counter() - started
     
-    # Write INDEX.md
+    # Write INDEX.md and the caches; the lock keeps parallel sessions from
+    # interleaving them, the atomic writes keep readers from seeing partial files
     index_path = docs_path / 'INDEX.md'
-    index_path.write_text(index_content)
+    with docs_lock(docs_path):
+        related = None
+        if args.related:
+            from related_docs import update_related
+            related = update_related(docs_path, categories, cache)
+        
+        # Broken-link check: only documents changed since the last scan are revisited
+        from link_docs import update_graph
+        graph, _ = update_graph(docs_path, cache)
+        from tag_docs import update_tag_index
+        update_tag_index(docs_path, cache)
+        # LOGBOOK-ARCHIVE.md is only read past the offset indexed last time
+        from logbook_docs import update_logbook, ledger_items
+        logbook, logbook_stats = update_logbook(docs_path)
+        
+        atomic_write_text(index_path, generate_index(categories, related, args.digests))
+        cache['index'] = {'related': args.related, 'digests': args.digests}
+        if not args.no_cache:
+            save_cache(docs_path, cache)
     
     total_docs = sum(len(docs) for docs in categories.values())
+    mode = f"{args.io_threads} I/O threads" if args.io_threads else "serial"
+    print(f"✅ Scanned {total_docs} documents in {elapsed:.2f}s ({total_docs / max(elapsed, 1e-9):.0f} files/sec, {mode})")
+    print(f"   Read {scan_stats['read']}, reused {scan_stats['cached']} from cache | "
+          f"directories: {scan_stats['dirs_listed']} listed, {scan_stats['dirs_pruned']} pruned")
     print(f"✅ Generated index with {total_docs} documents")
     print(f"✅ Updated: {index_path}")
+    if logbook['files']:
+        print(f"✅ Indexed {len(ledger_items(logbook))} logbook items ({logbook_stats['new']} new)")
+    if graph['broken']:
+        broken = sum(len(targets) for targets in graph['broken'].values())
+        print(f"⚠️  {broken} broken link{'s' if broken != 1 else ''} in {len(graph['broken'])} "
+              f"document{'s' if len(graph['broken']) != 1 else ''} "
+              "(run 'python scripts/link_docs.py' for details)")
 
 
 if __name__ == '__main__':
@@ -9,6 +9,8 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+from docs_io import atomic_write_text
+
 
 DIRECTORY_STRUCTURE = {
     'ai_docs': 'Reference materials for Claude Code: SDKs, API docs, repo context',
@@ -99,7 +101,7 @@ def create_readme(base_path: Path) -> None:
         timestamp=datetime.now().strftime('%Y-%m-%d')
     )
     
-    readme_path.write_text(readme_content)
+    atomic_write_text(readme_path, readme_content)
     print(f"✅ Created: {readme_path}")
 
 
@@ -125,7 +127,7 @@ Total documents: 0
 _No documents found. Add documents to the category directories and regenerate the index._
 """
     
-    index_path.write_text(index_content)
+    atomic_write_text(index_path, index_content)
     print(f"✅ Created: {index_path}")
 
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Maintain the document link graph and report broken links.
+
+The index scan extracts each document's relative links into the scan cache.
+This module keeps docs/.cyberarian/links.json - every document's outbound
+links, the inverse (inbound) map and the current set of broken links - and
+updates it only for documents whose content hash changed or that were
+added or removed, so checking a large tree after a few edits is cheap.
+
+archive_docs.py uses the inbound map to rewrite links to a document in the
+same locked batch as the move.
+"""
+
+import sys
+import json
+import argparse
+import posixpath
+from pathlib import Path
+from urllib.parse import quote
+
+from index_docs import load_cache, save_cache, scan_documents, link_matches, link_target
+from docs_io import STATE_DIR, state_dir, atomic_write_text, docs_lock
+
+
+LINKS_FILE = 'links.json'
+LINKS_VERSION = 1
+
+
+def empty_graph() -> dict:
+    """A graph with no documents."""
+    return {'version': LINKS_VERSION, 'hashes': {}, 'outbound': {}, 'inbound': {}, 'broken': {}}
+
+
+def load_graph(docs_path: Path) -> dict:
+    """Load the link graph, or an empty one if missing, corrupt or outdated."""
+    try:
+        graph = json.loads((docs_path / STATE_DIR / LINKS_FILE).read_text())
+        if graph.get('version') == LINKS_VERSION:
+            return graph
+    except (OSError, ValueError):
+        pass
+    return empty_graph()
+
+
+def save_graph(docs_path: Path, graph: dict) -> None:
+    """Persist the link graph (in the self-gitignored state directory)."""
+    atomic_write_text(state_dir(docs_path) / LINKS_FILE, json.dumps(graph))
+
+
+def target_exists(docs_path: Path, graph: dict, target: str) -> bool:
+    """
+    Whether a link target exists. Indexed documents are looked up in the
+    graph; anything else (README.md, INDEX.md) falls back to the filesystem.
+    """
+    return target in graph['hashes'] or (docs_path / target).is_file()
+
+
+def recheck(docs_path: Path, graph: dict, source: str) -> None:
+    """Recompute the broken links of one source document."""
+    broken = [t for t in graph['outbound'].get(source, []) if not target_exists(docs_path, graph, t)]
+    if broken:
+        graph['broken'][source] = broken
+    else:
+        graph['broken'].pop(source, None)
+
+
+def set_outbound(graph: dict, source: str, targets: list[str] | None) -> None:
+    """Replace a source's outbound edges (None removes the source)."""
+    for target in graph['outbound'].pop(source, []):
+        sources = graph['inbound'].get(target, [])
+        if source in sources:
+            sources.remove(source)
+        if not sources:
+            graph['inbound'].pop(target, None)
+    if targets is None:
+        graph['broken'].pop(source, None)
+        return
+    graph['outbound'][source] = list(targets)
+    for target in targets:
+        sources = graph['inbound'].setdefault(target, [])
+        if source not in sources:
+            sources.append(source)
+            sources.sort()
+
+
+def update_graph(docs_path: Path, scan_cache: dict = None) -> tuple[dict, dict]:
+    """
+    Bring the link graph up to date with the scan cache and save it.
+    Returns (graph, counts of changed and removed documents).
+    
+    Only changed, added and removed documents are touched: their outbound
+    edges are replaced, and documents linking to an added or removed path
+    have their broken links rechecked. The caller is expected to hold the
+    docs lock.
+    """
+    if scan_cache is None:
+        scan_cache = load_cache(docs_path)
+        scan_documents(docs_path, cache=scan_cache)
+    graph = load_graph(docs_path)
+    records = scan_cache['files']
+    
+    changed = [path for path, record in records.items() if graph['hashes'].get(path) != record['hash']]
+    removed = [path for path in graph['hashes'] if path not in records]
+    appeared = [path for path in changed if path not in graph['hashes']]
+    
+    for path in removed:
+        del graph['hashes'][path]
+        set_outbound(graph, path, None)
+    for path in changed:
+        graph['hashes'][path] = records[path]['hash']
+        set_outbound(graph, path, records[path].get('links', []))
+    
+    recheck_sources = set(changed)
+    for path in removed + appeared:
+        recheck_sources.update(graph['inbound'].get(path, []))
+    for source in recheck_sources:
+        if source in graph['hashes']:
+            recheck(docs_path, graph, source)
+    
+    save_graph(docs_path, graph)
+    return graph, {'changed': len(changed), 'removed': len(removed)}
+
+
+def relative_href(source: str, target: str, suffix: str = '', quoted: bool = False) -> str:
+    """Href from document source to document target (both docs-relative)."""
+    href = posixpath.relpath(target, posixpath.dirname(source) or '.')
+    return (quote(href, safe='/._-~') if quoted else href) + suffix
+
+
+def rewrite_links(content: str, source: str, new_source: str, moves: dict) -> str:
+    """
+    Rewrite the relative links in a document so they still resolve after it
+    moves from source to new_source and after each moves[old] -> new target
+    move. Links whose destination doesn't change are left untouched.
+    """
+    edits = []
+    for match in link_matches(content):
+        href = match.group(2)
+        resolved = link_target(href, source)
+        if not resolved:
+            continue
+        target, suffix = resolved
+        new_target = moves.get(target, target)
+        if new_source == source and new_target == target:
+            continue
+        edits.append((match.span(2), relative_href(new_source, new_target, suffix, '%' in href)))
+    
+    for (start, end), href in reversed(edits):
+        content = content[:start] + href + content[end:]
+    return content
+
+
+def move_node(graph: dict, old: str, new: str) -> None:
+    """Record in the graph that a document moved (its links already rewritten)."""
+    if old in graph['hashes']:
+        graph['hashes'][new] = graph['hashes'].pop(old)
+    targets = graph['outbound'].get(old)
+    # A document linking to itself is handled with its own outbound edges
+    sources = [source for source in graph['inbound'].get(old, []) if source != old]
+    if targets is not None:
+        set_outbound(graph, old, None)
+        set_outbound(graph, new, [new if t == old else t for t in targets])
+    for source in sources:
+        set_outbound(graph, source, [new if t == old else t for t in graph['outbound'][source]])
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Check links between documents.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--inbound', action='append', default=[], metavar='DOC',
+                        help="list the documents linking to DOC (path under docs/, repeatable)")
+    parser.add_argument('--json', action='store_true', help="print broken links as JSON")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    with docs_lock(docs_path):
+        cache = load_cache(docs_path)
+        scan_documents(docs_path, cache=cache)
+        graph, _ = update_graph(docs_path, cache)
+        save_cache(docs_path, cache)
+    
+    if args.inbound:
+        for doc in args.inbound:
+            doc = doc.removeprefix('docs/')
+            sources = graph['inbound'].get(doc, [])
+            print(f"📄 {doc} ← {len(sources)} document{'s' if len(sources) != 1 else ''}")
+            for source in sources:
+                print(f"   • {source}")
+        return
+    
+    if args.json:
+        print(json.dumps(graph['broken'], indent=2, sort_keys=True))
+        return
+    
+    if not graph['broken']:
+        print(f"✅ No broken links ({sum(len(t) for t in graph['outbound'].values())} links checked)")
+        return
+    
+    total = sum(len(targets) for targets in graph['broken'].values())
+    print(f"⚠️  {total} broken link{'s' if total != 1 else ''} in {len(graph['broken'])} "
+          f"document{'s' if len(graph['broken']) != 1 else ''}:")
+    for source in sorted(graph['broken']):
+        print(f"  📄 {source}")
+        for target in graph['broken'][source]:
+            print(f"     ✗ {target}")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Index the follow-up ledger (LOGBOOK.md and LOGBOOK-ARCHIVE.md at the project
+root) and search it by text, category, status and date.
+
+Every `- [ ]` / `- [x]` item becomes a record with its category heading,
+title, source, capture date, priority, resolved/dismissed/relocated marker
+and link comment, parsed the same way as hooks/lib/logbook.cjs.
+
+The records are kept in docs/.cyberarian/logbook.json together with the byte
+offset parsing stopped at. LOGBOOK-ARCHIVE.md only grows, so a run checks the
+bytes just before that offset are unchanged and parses only what follows;
+any other change (the file shrank, or text before the offset was rewritten)
+falls back to a full parse. The hot LOGBOOK.md is edited in place and is
+small, so it is reparsed whenever its content changes.
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from docs_io import STATE_DIR, state_dir, content_hash, atomic_write_text, docs_lock
+
+
+LOGBOOK_FILE = 'logbook.json'
+LOGBOOK_VERSION = 1
+
+# Ledger files at the project root: (location, file name, append-only)
+LEDGERS = (
+    ('hot', 'LOGBOOK.md', False),
+    ('archive', 'LOGBOOK-ARCHIVE.md', True),
+)
+
+# Bytes before the stored offset that must be unchanged for an append-only
+# file to be parsed incrementally
+CHECK_WINDOW = 4096
+
+# Ledger category headings (lowercased) and their category keys
+CATEGORIES = {
+    'ideas': 'ideas',
+    'deferred fixes': 'fixes',
+    'open questions': 'questions',
+    'risks': 'risks',
+    'tech debt': 'debt',
+}
+STATUSES = ('open', 'resolved', 'dismissed')
+
+HEADING_RE = re.compile(r'^##\s+(.+?)\s*$')
+ITEM_RE = re.compile(r'^-\s+\[([ xX])\]\s+(.*)$')
+COMMENT_RE = re.compile(r'\s*<!--\s*(.+?)\s*-->\s*$')
+MARKER_RE = re.compile(r'(resolved|dismissed|relocated):(\d{4}-\d{2}-\d{2})')
+DATE_RE = re.compile(r'\s*\((\d{4}-\d{2}-\d{2})\)\s*$')
+
+# Title/source separators, em dash first; the last one in the line wins
+SEPARATORS = (' — ', ' – ', ' - ')
+
+
+def parse_item(check: str, body: str, category: str | None, in_archive: bool) -> dict | None:
+    """One item line's fields, or None if the line is malformed."""
+    markers = {'resolved': None, 'dismissed': None, 'relocated': None}
+    link = None
+    comment = COMMENT_RE.search(body)
+    if comment:
+        payload = comment.group(1)
+        for kind, day in MARKER_RE.findall(payload):
+            markers[kind] = markers[kind] or day
+        payload = MARKER_RE.sub('', payload).strip()
+        link = payload.removeprefix('link:').strip() or None
+        body = body[:comment.start()]
+    
+    date = DATE_RE.search(body)
+    if not date:
+        return None
+    body = body[:date.start()]
+    
+    index, length = max((body.rfind(sep), len(sep)) for sep in SEPARATORS)
+    if index == -1:
+        return None
+    title = body[:index].strip()
+    priority = 'high' if title.startswith('!') else 'low' if title.startswith('~') else 'normal'
+    title = title.lstrip('!~').strip()
+    if not title:
+        return None
+    
+    # An explicit marker wins; otherwise checked (or under ## Archive) means resolved
+    if markers['dismissed']:
+        status = 'dismissed'
+    elif markers['resolved']:
+        status = 'resolved'
+    else:
+        status = 'resolved' if check.lower() == 'x' or in_archive else 'open'
+    
+    return {
+        'title': title,
+        'category': category or 'ideas',
+        'source': body[index + length:].strip(),
+        'date': date.group(1),
+        'status': status,
+        'priority': priority,
+        'link': link,
+        **markers,
+    }
+
+
+def parse_ledger(data: bytes, offset: int, line: int, context: dict) -> tuple[list[dict], dict]:
+    """
+    Parse ledger bytes that start at byte offset / line number `line` under
+    the given heading context. Returns (items, resume state): the offset,
+    line and context to continue from. A last line without a newline is
+    parsed but not consumed, so it is read again once it is complete.
+    """
+    items = []
+    resume = {'offset': offset, 'line': line, 'context': context}
+    category, in_archive = context['category'], context['in_archive']
+    position = 0
+    while position < len(data):
+        end = data.find(b'\n', position)
+        complete = end != -1
+        if not complete:
+            end = len(data)
+        text = data[position:end].decode('utf-8', errors='replace').rstrip('\r')
+        
+        heading = HEADING_RE.match(text)
+        if heading:
+            name = heading.group(1).lower()
+            in_archive = name == 'archive'
+            category = CATEGORIES.get(name)
+        else:
+            box = ITEM_RE.match(text)
+            if box and (category or in_archive):
+                item = parse_item(box.group(1), box.group(2), category, in_archive)
+                if item:
+                    item.update(offset=offset + position, line=line, hash=content_hash(text.encode()))
+                    items.append(item)
+        
+        position = end + 1
+        line += 1
+        if complete:
+            resume = {'offset': offset + position, 'line': line,
+                      'context': {'category': category, 'in_archive': in_archive}}
+    return items, resume
+
+
+def empty_index() -> dict:
+    """A ledger index with no files."""
+    return {'version': LOGBOOK_VERSION, 'files': {}}
+
+
+def load_logbook(docs_path: Path) -> dict:
+    """Load the ledger index, or an empty one if missing, corrupt or outdated."""
+    try:
+        index = json.loads((docs_path / STATE_DIR / LOGBOOK_FILE).read_text())
+        if index.get('version') == LOGBOOK_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return empty_index()
+
+
+def update_ledger(path: Path, state: dict | None, append_only: bool, stats: dict) -> dict | None:
+    """
+    Bring one ledger file's state ({offset, line, context, check, items})
+    up to date, or return None if the file doesn't exist. An unchanged state
+    is returned as is.
+    """
+    try:
+        handle = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with handle:
+        size = os.fstat(handle.fileno()).st_size
+        resume = None
+        if state and state['offset'] <= size:
+            # Resume only if the bytes before the offset hash as they did when parsed
+            start = max(0, state['offset'] - CHECK_WINDOW) if append_only else 0
+            handle.seek(start)
+            checked = handle.read(state['offset'] - start)
+            if content_hash(checked) == state['check']:
+                if state['offset'] == size:
+                    return state
+                # A last line parsed without its newline is parsed again
+                kept = [item for item in state['items'] if item['offset'] < state['offset']]
+                appended = handle.read()
+                items, resume = parse_ledger(appended, state['offset'], state['line'], state['context'])
+                data = checked + appended
+        if resume is None:
+            start, kept = 0, []
+            handle.seek(0)
+            data = handle.read()
+            stats['reparsed'] += 1
+            items, resume = parse_ledger(data, 0, 1, {'category': None, 'in_archive': False})
+    
+    stats['read'] += len(data)
+    known = {item['hash'] for item in state['items']} if state else set()
+    stats['new'] += sum(item['hash'] not in known for item in items)
+    check_start = max(0, resume['offset'] - CHECK_WINDOW) if append_only else 0
+    resume['check'] = content_hash(data[check_start - start:resume['offset'] - start])
+    return dict(resume, items=kept + items)
+
+
+def update_logbook(docs_path: Path, rebuild: bool = False) -> tuple[dict, dict]:
+    """
+    Bring the ledger index up to date with LOGBOOK.md and LOGBOOK-ARCHIVE.md
+    next to docs/ and save it if anything changed. Returns (index, counts of
+    bytes read, new items and fully reparsed files). The caller is expected
+    to hold the docs lock.
+    """
+    index = empty_index() if rebuild else load_logbook(docs_path)
+    stats = {'read': 0, 'new': 0, 'reparsed': 0}
+    changed = rebuild
+    for _, name, append_only in LEDGERS:
+        previous = index['files'].get(name)
+        state = update_ledger(docs_path.parent / name, previous, append_only, stats)
+        if state is None:
+            index['files'].pop(name, None)
+        else:
+            index['files'][name] = state
+        changed = changed or state is not previous
+    if changed:
+        atomic_write_text(state_dir(docs_path) / LOGBOOK_FILE, json.dumps(index))
+    return index, stats
+
+
+def ledger_items(index: dict) -> list[dict]:
+    """Every indexed item, in file order, tagged with its file and location."""
+    return [dict(item, file=name, location=location)
+            for location, name, _ in LEDGERS
+            for item in index['files'].get(name, {}).get('items', [])]
+
+
+def search_items(items: list[dict], text: str = '', categories: list[str] = (), statuses: list[str] = (),
+                 since: str = None, until: str = None) -> list[dict]:
+    """Items matching every given filter; dates compare against the capture date."""
+    needle = text.lower()
+    return [item for item in items
+            if (not needle or needle in f"{item['title']} {item['source']} {item['link'] or ''}".lower())
+            and (not categories or item['category'] in categories)
+            and (not statuses or item['status'] in statuses)
+            and (not since or item['date'] >= since)
+            and (not until or item['date'] <= until)]
+
+
+def format_item(item: dict) -> str:
+    """One display line for an item."""
+    closed = item['dismissed'] or item['resolved']
+    status = f"{item['status']} {closed}" if closed else item['status']
+    if item['relocated'] and item['status'] == 'open':
+        status += f", relocated {item['relocated']}"
+    flag = {'high': '! ', 'low': '~ '}.get(item['priority'], '')
+    return (f"  • {item['date']} [{item['category']}] {flag}{item['title']} — {item['source']} "
+            f"({status}) {item['file']}:{item['line']}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Search the LOGBOOK.md / LOGBOOK-ARCHIVE.md follow-up ledger.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--search', default='', metavar='TEXT', help="substring of the title, source or link")
+    parser.add_argument('--category', action='append', default=[], choices=sorted(CATEGORIES.values()),
+                        help="in this category (repeatable: any of)")
+    parser.add_argument('--status', action='append', default=[], choices=STATUSES,
+                        help="has this status (repeatable: any of)")
+    parser.add_argument('--since', metavar='YYYY-MM-DD', help="captured on or after this date")
+    parser.add_argument('--until', metavar='YYYY-MM-DD', help="captured on or before this date")
+    parser.add_argument('--limit', type=int, default=50, help="items to show, newest first (default: 50)")
+    parser.add_argument('--rebuild', action='store_true', help="reparse both files from the start")
+    parser.add_argument('--json', action='store_true', help="print matching items as JSON")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    with docs_lock(docs_path):
+        index, stats = update_logbook(docs_path, args.rebuild)
+    
+    if not index['files']:
+        print(f"❌ Error: no LOGBOOK.md or LOGBOOK-ARCHIVE.md at {base_path}")
+        sys.exit(1)
+    
+    items = search_items(ledger_items(index), args.search, args.category, args.status, args.since, args.until)
+    items.sort(key=lambda item: item['date'], reverse=True)
+    
+    if args.json:
+        print(json.dumps(items[:args.limit], indent=2))
+        return
+    
+    counts = {status: sum(item['status'] == status for item in items) for status in STATUSES}
+    print(f"📒 {len(items)} item{'s' if len(items) != 1 else ''} match "
+          f"({', '.join(f'{count} {status}' for status, count in counts.items())}); "
+          f"read {stats['read']} bytes, {stats['new']} new")
+    for item in items[:args.limit]:
+        print(format_item(item))
+    if len(items) > args.limit:
+        print(f"  (+{len(items) - args.limit} more)")
+
+
+if __name__ == '__main__':
+    main()
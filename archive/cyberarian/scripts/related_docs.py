@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Find related documents by TF-IDF cosine similarity over titles, tags and
+body text.
+
+Body term counts come from the index scan, which only reads changed
+documents; weighted counts are cached per document (keyed by content hash)
+and only recomputed for changed ones. The TF-IDF matrix is rebuilt from the cached counts as
+an array-backed CSR matrix, and each document's top-N neighbors are stored
+in docs/.cyberarian/related.json for INDEX.md's "Related" lines and for
+queries.
+"""
+
+import sys
+import json
+import math
+import argparse
+from array import array
+from pathlib import Path
+
+from index_docs import load_cache, save_cache, scan_documents, tokenize
+from docs_io import STATE_DIR, state_dir, atomic_write_text, docs_lock
+
+
+RELATED_FILE = 'related.json'
+RELATED_VERSION = 1
+
+DEFAULT_TOP = 5
+MIN_SCORE = 0.1
+
+# Title and tag terms describe the whole document; weight them over body terms
+FIELD_WEIGHT = 3
+
+# Incremental updates keep unchanged documents' stored scores, which drift as
+# document frequencies shift; past this fraction of changed docs, rebuild all
+REBUILD_FRACTION = 0.2
+
+# Terms in more than this fraction of documents carry little signal and make
+# the similarity join quadratic, so they are dropped
+MAX_DF_FRACTION = 0.5
+
+
+class CSRMatrix:
+    """Minimal compressed sparse row matrix backed by stdlib arrays."""
+    
+    def __init__(self, n_cols: int):
+        self.n_cols = n_cols
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        self.data = array('d')
+    
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+    
+    def append_row(self, row: dict) -> None:
+        """Append a row given as {column: value}, columns in ascending order."""
+        for column in sorted(row):
+            self.indices.append(column)
+            self.data.append(row[column])
+        self.indptr.append(len(self.indices))
+    
+    def row(self, i: int):
+        """(indices, values) of row i."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+    
+    def transpose(self) -> 'CSRMatrix':
+        """Transpose (equivalently, this matrix in CSC form)."""
+        counts = [0] * (self.n_cols + 1)
+        for column in self.indices:
+            counts[column + 1] += 1
+        for c in range(self.n_cols):
+            counts[c + 1] += counts[c]
+        
+        result = CSRMatrix(self.n_rows)
+        result.indptr = array('l', counts)
+        result.indices = array('l', [0]) * len(self.indices)
+        result.data = array('d', [0.0]) * len(self.data)
+        cursor = list(counts[:-1])
+        for r in range(self.n_rows):
+            for k in range(self.indptr[r], self.indptr[r + 1]):
+                column = self.indices[k]
+                result.indices[cursor[column]] = r
+                result.data[cursor[column]] = self.data[k]
+                cursor[column] += 1
+        return result
+
+
+def document_terms(title: str, tags, body_terms: dict) -> dict:
+    """Weighted term counts for one document, given its body's term counts."""
+    counts = dict(body_terms)
+    tag_text = ' '.join(str(t) for t in tags) if isinstance(tags, list) else ''
+    for term in tokenize(f"{title} {tag_text}"):
+        counts[term] = counts.get(term, 0) + FIELD_WEIGHT
+    return counts
+
+
+def build_tfidf(term_counts: list[dict]) -> CSRMatrix:
+    """L2-normalized TF-IDF rows (sublinear tf, smoothed idf) as a CSR matrix."""
+    n_docs = len(term_counts)
+    df = {}
+    for counts in term_counts:
+        for term in counts:
+            df[term] = df.get(term, 0) + 1
+    
+    max_df = max(2, MAX_DF_FRACTION * n_docs)
+    vocabulary = {term: i for i, term in enumerate(sorted(t for t, n in df.items() if n <= max_df))}
+    idf = {term: math.log((1 + n_docs) / (1 + df[term])) + 1 for term in vocabulary}
+    
+    matrix = CSRMatrix(len(vocabulary))
+    for counts in term_counts:
+        row = {vocabulary[t]: (1 + math.log(c)) * idf[t] for t, c in counts.items() if t in vocabulary}
+        norm = math.sqrt(sum(v * v for v in row.values())) or 1.0
+        matrix.append_row({column: value / norm for column, value in row.items()})
+    return matrix
+
+
+def similarities(matrix: CSRMatrix, postings: CSRMatrix, i: int) -> dict:
+    """Cosine similarity of row i to every row sharing a term with it."""
+    scores = {}
+    columns, values = matrix.row(i)
+    for column, value in zip(columns, values):
+        rows, weights = postings.row(column)
+        for j, weight in zip(rows, weights):
+            if j != i:
+                scores[j] = scores.get(j, 0.0) + value * weight
+    return scores
+
+
+def top_n(scores: dict, paths: list[str], n: int) -> list:
+    """The n best [path, score] pairs at or above MIN_SCORE."""
+    best = sorted(((s, paths[j]) for j, s in scores.items() if s >= MIN_SCORE), key=lambda p: (-p[0], p[1]))
+    return [[path, round(score, 4)] for score, path in best[:n]]
+
+
+def load_related(docs_path: Path) -> dict:
+    """Load the related-docs cache, or an empty one."""
+    try:
+        related = json.loads((docs_path / STATE_DIR / RELATED_FILE).read_text())
+        if related.get('version') == RELATED_VERSION:
+            return related
+    except (OSError, ValueError):
+        pass
+    return {'version': RELATED_VERSION, 'top': DEFAULT_TOP, 'docs': {}, 'neighbors': {}}
+
+
+def update_related(docs_path: Path, categories: dict = None, scan_cache: dict = None,
+                   top: int = DEFAULT_TOP, rebuild: bool = False) -> dict:
+    """
+    Bring the related-docs cache up to date with the current tree and return
+    {path: [[related path, score], ...]}.
+    
+    Only documents whose content hash changed are re-weighted, from the
+    body term counts the scan cached; no document is read here.
+    Neighbor lists are recomputed for changed documents and for documents
+    whose lists pointed at a changed or removed one; other documents only
+    gain a changed document as a neighbor if it now outranks their list.
+    
+    The caller is expected to hold the docs lock.
+    """
+    if scan_cache is None:
+        scan_cache = load_cache(docs_path)
+    if categories is None:
+        categories = scan_documents(docs_path, cache=scan_cache)
+    records = scan_cache['files']
+    
+    related = load_related(docs_path)
+    previous_docs = related['docs']
+    entries = sorted((entry for docs in categories.values() for entry in docs), key=lambda e: e['path'])
+    paths = [entry['path'] for entry in entries]
+    
+    docs, changed = {}, set()
+    for entry in entries:
+        path = entry['path']
+        record = records[path]
+        cached = previous_docs.get(path)
+        if cached and cached['hash'] == record['hash']:
+            docs[path] = cached
+            continue
+        docs[path] = {'hash': record['hash'], 'terms': document_terms(str(entry['title']), entry['tags'], record['terms'])}
+        changed.add(path)
+    removed = set(previous_docs) - set(docs)
+    
+    matrix = build_tfidf([docs[path]['terms'] for path in paths])
+    postings = matrix.transpose()
+    index_of = {path: i for i, path in enumerate(paths)}
+    
+    neighbors = related['neighbors']
+    full = (rebuild or not neighbors or related.get('top') != top
+            or len(changed) + len(removed) > REBUILD_FRACTION * max(len(paths), 1))
+    if full:
+        affected = set(paths)
+    else:
+        touched = changed | removed
+        affected = changed | {p for p, lst in neighbors.items() if p in index_of and any(q in touched for q, _ in lst)}
+    
+    result = {}
+    for path in paths:
+        if path not in affected:
+            result[path] = [pair for pair in neighbors.get(path, []) if pair[0] not in removed]
+    for path in sorted(affected):
+        scores = similarities(matrix, postings, index_of[path])
+        result[path] = top_n(scores, paths, top)
+        if path in changed and not full:
+            # Similarity is symmetric: offer the changed doc to everyone else
+            for j, score in scores.items():
+                other = paths[j]
+                if other in affected or score < MIN_SCORE:
+                    continue
+                current = result[other]
+                if len(current) < top or score > current[-1][1]:
+                    current.append([path, round(score, 4)])
+                    current.sort(key=lambda p: (-p[1], p[0]))
+                    del current[top:]
+    
+    related.update({'top': top, 'docs': docs, 'neighbors': result})
+    atomic_write_text(state_dir(docs_path) / RELATED_FILE, json.dumps(related))
+    return result
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Update and query related-document recommendations.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--doc', action='append', default=[], metavar='DOC',
+                        help="show documents related to DOC (path under docs/, repeatable)")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f"neighbors per document (default: {DEFAULT_TOP})")
+    parser.add_argument('--rebuild', action='store_true', help="recompute every neighbor list from scratch")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    with docs_lock(docs_path):
+        cache = load_cache(docs_path)
+        categories = scan_documents(docs_path, cache=cache)
+        related = update_related(docs_path, categories, cache, top=args.top, rebuild=args.rebuild)
+        save_cache(docs_path, cache)
+    
+    if not args.doc:
+        linked = sum(1 for lst in related.values() if lst)
+        print(f"✅ Related documents computed for {len(related)} documents ({linked} with at least one match)")
+        return
+    
+    for doc in args.doc:
+        doc = doc.removeprefix('docs/')
+        if doc not in related:
+            print(f"❌ Not an indexed document: {doc}")
+            continue
+        print(f"📄 {doc}")
+        if not related[doc]:
+            print("   (no related documents)")
+        for other, score in related[doc]:
+            print(f"   • {other} ({score:.2f})")
+
+
+if __name__ == '__main__':
+    main()
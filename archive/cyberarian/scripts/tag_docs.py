@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Maintain the tag index: per-tag counts, tag co-occurrence, prefix
+autocomplete and "did you mean" suggestions for near-duplicate tags.
+
+The index (docs/.cyberarian/tags.json) is updated from the tags in the scan
+cache, adjusting counts only for documents whose tags changed, so no
+document is re-read for it. An optional docs/tags.yml vocabulary lists the
+known tags (and synonyms mapping variants to them); validate_doc_metadata.py
+then flags any other tag.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import yaml
+
+from index_docs import load_cache, save_cache, scan_documents
+from docs_io import STATE_DIR, state_dir, atomic_write_text, docs_lock
+
+
+TAGS_FILE = 'tags.json'
+TAGS_VERSION = 1
+VOCABULARY_FILE = 'tags.yml'
+
+# Tags are compared for near-duplicates only within the same leading
+# characters (a trie subtree), which keeps suggestions far from quadratic
+SUGGEST_PREFIX = 2
+SIMILARITY = 0.8
+
+# A tag that is a prefix of another (auth, authentication) of at least this
+# length counts as a variant
+MIN_SHARED_PREFIX = 3
+
+# Real synonyms rarely appear on the same document; a pair that co-occurs on
+# more than this fraction of the rarer tag's documents is two distinct tags
+MAX_COOCCURRENCE = 0.5
+
+
+class TagTrie:
+    """Prefix trie over tags, for autocomplete and candidate lookup."""
+    
+    def __init__(self, counts: dict = None):
+        self.root = {}
+        for tag, count in (counts or {}).items():
+            self.insert(tag, count)
+    
+    def insert(self, tag: str, count: int) -> None:
+        """Add a tag with its document count."""
+        node = self.root
+        for char in tag.lower():
+            node = node.setdefault(char, {})
+        node.setdefault('\0', {})[tag] = count
+    
+    def _subtree(self, prefix: str) -> dict | None:
+        node = self.root
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+    
+    def tags_with_prefix(self, prefix: str) -> dict:
+        """{tag: count} for every tag starting with prefix (case-insensitive)."""
+        found, stack = {}, [self._subtree(prefix)]
+        while stack:
+            node = stack.pop()
+            if not node:
+                continue
+            for key, child in node.items():
+                if key == '\0':
+                    found.update(child)
+                else:
+                    stack.append(child)
+        return found
+    
+    def complete(self, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        """The most used tags starting with prefix."""
+        return sorted(self.tags_with_prefix(prefix).items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def empty_index() -> dict:
+    """A tag index with no documents."""
+    return {'version': TAGS_VERSION, 'docs': {}, 'counts': {}, 'cooccur': {}}
+
+
+def load_tag_index(docs_path: Path) -> dict:
+    """Load the tag index, or an empty one if missing, corrupt or outdated."""
+    try:
+        index = json.loads((docs_path / STATE_DIR / TAGS_FILE).read_text())
+        if index.get('version') == TAGS_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return empty_index()
+
+
+def document_tags(entry: dict) -> list[str]:
+    """A document's tags as a sorted list of distinct strings."""
+    tags = entry.get('tags')
+    return sorted({str(tag) for tag in tags}) if isinstance(tags, list) else []
+
+
+def adjust(index: dict, tags: list[str], delta: int) -> None:
+    """Add (delta=1) or remove (delta=-1) one document's tags from the counts."""
+    counts, cooccur = index['counts'], index['cooccur']
+    for tag in tags:
+        counts[tag] = counts.get(tag, 0) + delta
+        if counts[tag] <= 0:
+            del counts[tag]
+    for a, b in combinations(tags, 2):
+        for x, y in ((a, b), (b, a)):
+            row = cooccur.setdefault(x, {})
+            row[y] = row.get(y, 0) + delta
+            if row[y] <= 0:
+                del row[y]
+            if not row:
+                del cooccur[x]
+
+
+def update_tag_index(docs_path: Path, scan_cache: dict = None) -> dict:
+    """
+    Bring the tag index up to date with the scan cache and save it. Only
+    documents whose tags changed (or that were added or removed) adjust the
+    counts. The caller is expected to hold the docs lock.
+    """
+    if scan_cache is None:
+        scan_cache = load_cache(docs_path)
+        scan_documents(docs_path, cache=scan_cache)
+    index = load_tag_index(docs_path)
+    current = {path: document_tags(record['entry']) for path, record in scan_cache['files'].items()}
+    
+    for path in [p for p in index['docs'] if p not in current]:
+        adjust(index, index['docs'].pop(path), -1)
+    for path, tags in current.items():
+        previous = index['docs'].get(path)
+        if previous == tags:
+            continue
+        if previous:
+            adjust(index, previous, -1)
+        adjust(index, tags, 1)
+        index['docs'][path] = tags
+    
+    atomic_write_text(state_dir(docs_path) / TAGS_FILE, json.dumps(index))
+    return index
+
+
+def normalize(tag: str) -> str:
+    """Comparison form: lowercase, no separators, no plural s."""
+    key = ''.join(char for char in tag.lower() if char.isalnum())
+    return key[:-1] if key.endswith('s') and len(key) > 2 else key
+
+
+def looks_alike(a: str, b: str) -> bool:
+    """Whether two tags are plausibly spellings of the same concept."""
+    na, nb = normalize(a), normalize(b)
+    if na == nb:
+        return True
+    shorter, longer = sorted((na, nb), key=len)
+    if len(shorter) >= MIN_SHARED_PREFIX and longer.startswith(shorter):
+        return True
+    return SequenceMatcher(None, na, nb).ratio() >= SIMILARITY
+
+
+def suggest(index: dict, tag: str, trie: TagTrie = None, vocabulary: dict = None) -> list[str]:
+    """
+    "Did you mean" candidates for a tag: known tags that look alike and
+    rarely appear together with it, most used first. With a vocabulary, its
+    synonym mapping wins and only vocabulary tags are suggested.
+    """
+    if vocabulary and tag in vocabulary['synonyms']:
+        return [vocabulary['synonyms'][tag]]
+    if trie is None:
+        trie = TagTrie(index['counts'])
+    counts = index['counts']
+    candidates = trie.tags_with_prefix(tag[:SUGGEST_PREFIX])
+    if vocabulary:
+        candidates = {t: counts.get(t, 0) for t in candidates if t in vocabulary['tags']}
+        candidates.update({t: counts.get(t, 0) for t in vocabulary['tags']
+                           if t[:SUGGEST_PREFIX].lower() == tag[:SUGGEST_PREFIX].lower()})
+    own = counts.get(tag, 0)
+    together = index['cooccur'].get(tag, {})
+    matches = []
+    for other, count in candidates.items():
+        if other == tag or not looks_alike(tag, other):
+            continue
+        rarer = min(own, count) or 1
+        if together.get(other, 0) / rarer > MAX_COOCCURRENCE:
+            continue
+        matches.append((other, count))
+    return [other for other, _ in sorted(matches, key=lambda item: (-item[1], item[0]))]
+
+
+def near_duplicate_tags(index: dict) -> list[tuple[str, int, str, int]]:
+    """(tag, count, suggested tag, its count) for tags that look like a more used tag."""
+    trie = TagTrie(index['counts'])
+    pairs = []
+    for tag, count in sorted(index['counts'].items()):
+        for other in suggest(index, tag, trie):
+            other_count = index['counts'][other]
+            if (other_count, tag) > (count, other):
+                pairs.append((tag, count, other, other_count))
+                break
+    return pairs
+
+
+def vocabulary_check(vocabulary: dict, index: dict):
+    """
+    Validation check for a document's tags against the vocabulary: returns
+    a function of metadata yielding (rule, message) for each unknown tag.
+    """
+    trie = TagTrie(index['counts'])
+    
+    def check(metadata: dict) -> list[tuple[str, str]]:
+        errors = []
+        for tag in document_tags(metadata):
+            if tag in vocabulary['tags']:
+                continue
+            alternatives = suggest(index, tag, trie, vocabulary)
+            hint = f" (did you mean {alternatives[0]}?)" if alternatives else ""
+            errors.append((f"unknown-tag:{tag}", f"Unknown tag: {tag}{hint}"))
+        return errors
+    
+    return check
+
+
+def load_vocabulary(docs_path: Path) -> dict | None:
+    """
+    Load docs/tags.yml if present: {'tags': set, 'synonyms': {variant: tag}}.
+    The file holds a `tags` list and an optional `synonyms` mapping.
+    """
+    path = docs_path / VOCABULARY_FILE
+    if not path.exists():
+        return None
+    data = yaml.safe_load(path.read_text()) or {}
+    synonyms = {str(k): str(v) for k, v in (data.get('synonyms') or {}).items()}
+    return {'tags': {str(t) for t in data.get('tags') or []} | set(synonyms.values()), 'synonyms': synonyms}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Explore the tag vocabulary.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--complete', metavar='PREFIX', help="autocomplete a tag prefix")
+    parser.add_argument('--related', metavar='TAG', help="tags most often used together with TAG")
+    parser.add_argument('--check', metavar='TAG', action='append', default=[],
+                        help="is TAG in use (or in docs/tags.yml)? suggests alternatives if not (repeatable)")
+    parser.add_argument('--suggest', action='store_true', help="list tags that look like variants of a more used tag")
+    parser.add_argument('--top', type=int, default=20, help="entries to show (default: 20)")
+    parser.add_argument('--json', action='store_true', help="print the counts and co-occurrence as JSON")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
+    
+    docs_path = base_path / 'docs'
+    
+    if not docs_path.exists():
+        print(f"❌ Error: docs/ directory not found at {docs_path}")
+        sys.exit(1)
+    
+    with docs_lock(docs_path):
+        cache = load_cache(docs_path)
+        scan_documents(docs_path, cache=cache)
+        index = update_tag_index(docs_path, cache)
+        save_cache(docs_path, cache)
+    counts = index['counts']
+    vocabulary = load_vocabulary(docs_path)
+    
+    if args.json:
+        print(json.dumps({'counts': counts, 'cooccur': index['cooccur']}, indent=2, sort_keys=True))
+        return
+    
+    if args.complete is not None:
+        for tag, count in TagTrie(counts).complete(args.complete, args.top):
+            print(f"  {tag} ({count})")
+        return
+    
+    if args.related:
+        together = sorted(index['cooccur'].get(args.related, {}).items(), key=lambda item: (-item[1], item[0]))
+        print(f"🏷️  {args.related} ({counts.get(args.related, 0)} docs) is used with:")
+        for tag, count in together[:args.top]:
+            print(f"  {tag} ({count})")
+        return
+    
+    if args.check:
+        unknown = 0
+        for tag in args.check:
+            known = tag in vocabulary['tags'] if vocabulary else tag in counts
+            if known:
+                print(f"  ✅ {tag} ({counts.get(tag, 0)} docs)")
+                continue
+            unknown += 1
+            alternatives = suggest(index, tag, vocabulary=vocabulary)
+            hint = f" - did you mean {', '.join(alternatives[:3])}?" if alternatives else ""
+            print(f"  ❌ {tag} is not a known tag{hint}")
+        sys.exit(1 if unknown else 0)
+    
+    if args.suggest:
+        pairs = near_duplicate_tags(index)
+        if not pairs:
+            print("✅ No near-duplicate tags")
+        for tag, count, other, other_count in pairs:
+            print(f"  {tag} ({count}) → did you mean {other} ({other_count})?")
+        return
+    
+    print(f"🏷️  {len(counts)} tags across {len(index['docs'])} documents")
+    for tag, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:args.top]:
+        print(f"  {tag} ({count})")
+    if len(counts) > args.top:
+        print(f"  (+{len(counts) - args.top} more)")
+
+
+if __name__ == '__main__':
+    main()
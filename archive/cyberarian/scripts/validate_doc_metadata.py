@@ -1,20 +1,39 @@
 #!/usr/bin/env python3
 """
 Validate that all documents have proper YAML frontmatter metadata.
-Reports documents with missing or invalid metadata.
+Reports documents with missing or invalid metadata, aggregated by rule.
+
+Rules come from a schema: docs/metadata-schema.yml (or --schema <file>) if
+present, otherwise derived from references/metadata-schema.md. Each schema is
+compiled once per category into a list of validator closures.
 """
 
-import sys
 import re
+import sys
+import argparse
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+from collections import defaultdict
 import yaml
 
+from index_docs import load_cache, save_cache, scan_documents
+from docs_io import docs_lock
 
+
+# Fallback schema, used only if neither a config file nor the schema
+# reference can be read
 REQUIRED_FIELDS = ['title', 'category', 'status', 'created', 'last_updated']
 VALID_STATUSES = ['draft', 'active', 'complete', 'archived']
 VALID_CATEGORIES = ['ai_docs', 'specs', 'analysis', 'plans', 'templates', 'archive']
 
+SCHEMA_CONFIG = 'metadata-schema.yml'
+SCHEMA_REFERENCE = Path(__file__).resolve().parent.parent / 'references' / 'metadata-schema.md'
+
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Example paths shown per rule in the summary report
+EXAMPLES_PER_RULE = 5
+
 
 def extract_frontmatter(file_path: Path) -> dict:
     """Extract YAML frontmatter from a markdown file."""
@@ -37,66 +56,226 @@ def extract_frontmatter(file_path: Path) -> dict:
 
 def validate_date(date_str: str) -> bool:
     """Validate date format (YYYY-MM-DD)."""
+    # YAML already parses unquoted dates into date objects
+    if isinstance(date_str, date) and not isinstance(date_str, datetime):
+        return True
+    value = str(date_str)
+    if not DATE_RE.fullmatch(value):
+        return False
     try:
-        datetime.strptime(str(date_str), '%Y-%m-%d')
+        date.fromisoformat(value)
         return True
-    except (ValueError, TypeError):
+    except ValueError:
         return False
 
 
-def validate_metadata(metadata: dict, category_from_path: str) -> list[str]:
+def default_schema() -> dict:
+    """Schema equivalent to the hard-coded fallback constants."""
+    fields = {name: {'required': True} for name in REQUIRED_FIELDS}
+    fields['status']['enum'] = list(VALID_STATUSES)
+    fields['category']['enum'] = list(VALID_CATEGORIES)
+    fields['created']['type'] = 'date'
+    fields['last_updated']['type'] = 'date'
+    fields['tags'] = {'type': 'list'}
+    return {'fields': fields, 'categories': {}}
+
+
+def parse_schema_reference(text: str) -> dict:
     """
-    Validate metadata against requirements.
-    Returns list of validation errors (empty if valid).
+    Derive a schema from references/metadata-schema.md.
+    
+    Reads the field headings under Required Fields / Optional Fields, their
+    Type (Date and List are checked), their Valid values lists, and the
+    per-category lines under Category Overrides.
     """
-    errors = []
+    fields, categories = {}, {}
+    section = field = override = None
+    in_values = False
     
-    if metadata is None:
-        return ["No YAML frontmatter found"]
+    for line in text.splitlines():
+        if line.startswith('## '):
+            section = line[3:].strip().lower()
+            field = override = None
+            continue
+        if line.startswith('### '):
+            name = line[4:].strip()
+            if section in ('required fields', 'optional fields'):
+                field = fields.setdefault(name, {'required': section == 'required fields'})
+            elif section == 'category overrides':
+                override = categories.setdefault(name, {})
+            in_values = False
+            continue
+        
+        if field is not None:
+            type_match = re.match(r'-\s+\*\*Type\*\*:\s*(.+)', line)
+            if type_match:
+                declared = type_match.group(1).lower()
+                if declared.startswith('date'):
+                    field['type'] = 'date'
+                elif declared.startswith('list'):
+                    field['type'] = 'list'
+                continue
+            if re.match(r'-\s+\*\*Valid values\*\*', line):
+                in_values = True
+                field['enum'] = []
+                continue
+            value_match = re.match(r'\s+-\s+`([^`]+)`', line)
+            if in_values and value_match:
+                field['enum'].append(value_match.group(1))
+                continue
+            in_values = False
+        
+        if override is not None:
+            override_match = re.match(r'-\s+`([^`]+)`:\s*(required|optional)', line)
+            if override_match:
+                override[override_match.group(1)] = {'required': override_match.group(2) == 'required'}
     
-    if '_error' in metadata:
-        return [f"Failed to parse frontmatter: {metadata['_error']}"]
+    return {'fields': fields, 'categories': categories}
+
+
+def load_schema(docs_path: Path, schema_file: Path = None) -> tuple[dict, str]:
+    """
+    Load the validation schema. Returns (schema, source description).
+    Order: explicit --schema file, docs/metadata-schema.yml, the schema
+    reference markdown, then the built-in fallback.
+    """
+    config = schema_file or docs_path / SCHEMA_CONFIG
+    if config.exists():
+        schema = yaml.safe_load(config.read_text()) or {}
+        return {'fields': schema.get('fields', {}), 'categories': schema.get('categories') or {}}, str(config)
     
-    # Check required fields
-    for field in REQUIRED_FIELDS:
-        if field not in metadata:
-            errors.append(f"Missing required field: {field}")
+    if SCHEMA_REFERENCE.exists():
+        schema = parse_schema_reference(SCHEMA_REFERENCE.read_text())
+        if schema['fields']:
+            return schema, str(SCHEMA_REFERENCE)
     
-    # Validate status
-    if 'status' in metadata:
-        if metadata['status'] not in VALID_STATUSES:
-            errors.append(f"Invalid status '{metadata['status']}'. Must be one of: {', '.join(VALID_STATUSES)}")
+    return default_schema(), 'built-in defaults'
+
+
+def compile_field(name: str, spec: dict) -> list:
+    """Compile one field spec into (rule, check) closures."""
+    checks = []
+    
+    if spec.get('required'):
+        def check_required(metadata, _name=name):
+            if _name not in metadata:
+                return f"Missing required field: {_name}"
+        checks.append((f"missing:{name}", check_required))
     
-    # Validate category
-    if 'category' in metadata:
-        if metadata['category'] not in VALID_CATEGORIES:
-            errors.append(f"Invalid category '{metadata['category']}'. Must be one of: {', '.join(VALID_CATEGORIES)}")
-        elif metadata['category'] != category_from_path:
-            errors.append(f"Category mismatch: metadata says '{metadata['category']}' but file is in '{category_from_path}/'")
+    if spec.get('enum'):
+        allowed = frozenset(spec['enum'])
+        listing = ', '.join(spec['enum'])
+        
+        def check_enum(metadata, _name=name):
+            if _name in metadata:
+                value = metadata[_name]
+                try:
+                    ok = value in allowed
+                except TypeError:  # unhashable, e.g. a list
+                    ok = False
+                if not ok:
+                    return f"Invalid {_name} '{value}'. Must be one of: {listing}"
+        checks.append((f"invalid:{name}", check_enum))
     
-    # Validate dates
-    for date_field in ['created', 'last_updated']:
-        if date_field in metadata:
-            if not validate_date(metadata[date_field]):
-                errors.append(f"Invalid {date_field} date format. Must be YYYY-MM-DD")
+    if spec.get('type') == 'date':
+        def check_date(metadata, _name=name):
+            if _name in metadata and not validate_date(metadata[_name]):
+                return f"Invalid {_name} date format. Must be YYYY-MM-DD"
+        checks.append((f"date-format:{name}", check_date))
     
-    # Validate tags (optional but must be list if present)
-    if 'tags' in metadata:
-        if not isinstance(metadata['tags'], list):
-            errors.append("Tags must be a list")
+    elif spec.get('type') == 'list':
+        def check_list(metadata, _name=name):
+            if _name in metadata and not isinstance(metadata[_name], list):
+                return f"{_name.capitalize()} must be a list"
+        checks.append((f"not-list:{name}", check_list))
     
-    return errors
+    return checks
+
 
+def compile_schema(schema: dict, category: str) -> list:
+    """Compile the schema for one category directory into (rule, check) closures."""
+    fields = {name: dict(spec or {}) for name, spec in schema['fields'].items()}
+    for name, spec in (schema['categories'].get(category) or {}).items():
+        fields.setdefault(name, {}).update(spec or {})
+    
+    checks = []
+    for name, spec in fields.items():
+        checks.extend(compile_field(name, spec))
+    
+    # The category field must also match the directory the file is in
+    allowed_categories = frozenset(fields.get('category', {}).get('enum') or ())
+    
+    def check_category_path(metadata):
+        value = metadata.get('category')
+        if value is None or (allowed_categories and not isinstance(value, str)):
+            return None
+        if allowed_categories and value not in allowed_categories:
+            return None  # already reported by the enum rule
+        if value != category:
+            return f"Category mismatch: metadata says '{value}' but file is in '{category}/'"
+    checks.append(('category-mismatch', check_category_path))
+    
+    return checks
 
-def scan_and_validate(docs_path: Path) -> dict:
+
+class SchemaValidator:
+    """Validates metadata against a schema, compiling each category once."""
+    
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self._compiled = {}
+    
+    def checks_for(self, category: str) -> list:
+        checks = self._compiled.get(category)
+        if checks is None:
+            checks = self._compiled[category] = compile_schema(self.schema, category)
+        return checks
+    
+    def validate(self, metadata: dict, category_from_path: str) -> list[tuple[str, str]]:
+        """Returns a list of (rule, message) violations (empty if valid)."""
+        if metadata is None:
+            return [('no-frontmatter', "No YAML frontmatter found")]
+        
+        if '_error' in metadata:
+            return [('parse-error', f"Failed to parse frontmatter: {metadata['_error']}")]
+        
+        errors = []
+        for rule, check in self.checks_for(category_from_path):
+            message = check(metadata)
+            if message:
+                errors.append((rule, message))
+        return errors
+
+
+_default_validator = None
+
+
+def validate_metadata(metadata: dict, category_from_path: str) -> list[str]:
+    """
+    Validate metadata against requirements.
+    Returns list of validation errors (empty if valid).
+    """
+    global _default_validator
+    if _default_validator is None:
+        _default_validator = SchemaValidator(default_schema())
+    return [message for _, message in _default_validator.validate(metadata, category_from_path)]
+
+
+def scan_and_validate(docs_path: Path, validator: SchemaValidator = None, tag_check=None) -> dict:
     """
-    Scan all documents and validate their metadata.
-    Returns validation results.
+    Scan all documents and validate their metadata. tag_check, if given, is
+    an extra check of a document's metadata returning (rule, message) pairs
+    (see tag_docs.vocabulary_check).
+    Returns validation results, with violations also grouped by rule.
     """
+    if validator is None:
+        validator = SchemaValidator(load_schema(docs_path)[0])
+    
     results = {
         'valid': [],
         'invalid': [],
         'no_frontmatter': [],
+        'by_rule': defaultdict(list),
         'total': 0
     }
     
@@ -114,29 +293,56 @@ def scan_and_validate(docs_path: Path) -> dict:
                 continue
             
             results['total'] += 1
-            relative_path = md_file.relative_to(docs_path)
+            relative_path = str(md_file.relative_to(docs_path))
             
             # Extract and validate metadata
             metadata = extract_frontmatter(md_file)
-            errors = validate_metadata(metadata, category_name)
+            errors = validator.validate(metadata, category_name)
+            if tag_check and metadata:
+                errors += tag_check(metadata)
             
             if not errors:
-                results['valid'].append(str(relative_path))
-            else:
-                results['invalid'].append({
-                    'path': str(relative_path),
-                    'errors': errors
-                })
+                results['valid'].append(relative_path)
+                continue
+            
+            if metadata is None:
+                results['no_frontmatter'].append(relative_path)
+            results['invalid'].append({
+                'path': relative_path,
+                'errors': [message for _, message in errors]
+            })
+            for rule, message in errors:
+                results['by_rule'][rule].append((relative_path, message))
     
     return results
 
 
+def describe_rule(rule: str, count: int) -> str:
+    """Human summary line for a rule, e.g. '412 docs missing last_updated'."""
+    docs = f"{count} doc{'s' if count != 1 else ''}"
+    kind, _, field = rule.partition(':')
+    descriptions = {
+        'missing': f"{docs} missing {field}",
+        'invalid': f"{docs} with invalid {field}",
+        'date-format': f"{docs} with malformed {field} date",
+        'not-list': f"{docs} where {field} is not a list",
+        'category-mismatch': f"{docs} whose category doesn't match their directory",
+        'no-frontmatter': f"{docs} without YAML frontmatter",
+        'parse-error': f"{docs} with unparseable frontmatter",
+        'unknown-tag': f"{docs} tagged '{field}', which is not in the tag vocabulary",
+    }
+    return descriptions.get(kind, f"{docs} failing {rule}")
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) > 1:
-        base_path = Path(sys.argv[1]).resolve()
-    else:
-        base_path = Path.cwd()
+    parser = argparse.ArgumentParser(description="Validate document frontmatter in docs/.")
+    parser.add_argument('path', nargs='?', default=None, help="project root (defaults to current directory)")
+    parser.add_argument('--schema', type=Path, help=f"schema file (default: docs/{SCHEMA_CONFIG}, else the schema reference)")
+    parser.add_argument('--verbose', action='store_true', help="also list every invalid document with its errors")
+    args = parser.parse_args()
+    
+    base_path = Path(args.path).resolve() if args.path else Path.cwd()
     
     docs_path = base_path / 'docs'
     
@@ -144,11 +350,28 @@ def main():
         print(f"❌ Error: docs/ directory not found at {docs_path}")
         sys.exit(1)
     
+    schema, source = load_schema(docs_path, args.schema)
+    
     print(f"Validating documents in: {docs_path}")
+    print(f"Schema: {source}")
     print()
     
+    # Tags are checked against docs/tags.yml when it exists; the tag index
+    # (updated from the scan cache) supplies "did you mean" suggestions
+    from tag_docs import load_vocabulary, update_tag_index, vocabulary_check, near_duplicate_tags
+    with docs_lock(docs_path):
+        cache = load_cache(docs_path)
+        scan_documents(docs_path, cache=cache)
+        tag_index = update_tag_index(docs_path, cache)
+        save_cache(docs_path, cache)
+    vocabulary = load_vocabulary(docs_path)
+    if vocabulary:
+        print(f"Tag vocabulary: {docs_path / 'tags.yml'} ({len(vocabulary['tags'])} tags)")
+        print()
+    
     # Scan and validate
-    results = scan_and_validate(docs_path)
+    results = scan_and_validate(docs_path, SchemaValidator(schema),
+                                vocabulary_check(vocabulary, tag_index) if vocabulary else None)
     
     # Display results
     print("=" * 60)
@@ -158,7 +381,18 @@ def main():
     print(f"  ❌ Invalid: {len(results['invalid'])}")
     print()
     
-    if results['invalid']:
+    if results['by_rule']:
+        print("Issues by rule:")
+        print()
+        for rule, hits in sorted(results['by_rule'].items(), key=lambda item: (-len(item[1]), item[0])):
+            print(f"  • {describe_rule(rule, len(hits))}")
+            for path, message in hits[:EXAMPLES_PER_RULE]:
+                print(f"     📄 {path}" + (f" — {message}" if rule.startswith(('invalid', 'unknown-tag')) else ""))
+            if len(hits) > EXAMPLES_PER_RULE:
+                print(f"     (+{len(hits) - EXAMPLES_PER_RULE} more)")
+            print()
+    
+    if args.verbose and results['invalid']:
         print("Invalid Documents:")
         print()
         for item in results['invalid']:
@@ -167,6 +401,31 @@ def main():
                 print(f"     • {error}")
             print()
     
+    # Near-duplicates are a warning, not a failure: the metadata is fine,
+    # but one document probably restates another. The signatures come from
+    # the scan cache refreshed above, so docs/ isn't walked again
+    from dedupe_docs import cached_clusters
+    clusters = cached_clusters(cache)
+    if clusters:
+        print(f"⚠️  Warning: {len(clusters)} near-duplicate cluster{'s' if len(clusters) != 1 else ''} "
+              "(run dedupe_docs.py for details):")
+        for cluster in clusters[:EXAMPLES_PER_RULE]:
+            print(f"     📄 {' ≈ '.join(doc['path'] for doc in cluster)}")
+        if len(clusters) > EXAMPLES_PER_RULE:
+            print(f"     (+{len(clusters) - EXAMPLES_PER_RULE} more)")
+        print()
+    
+    # Without a vocabulary, tag variants are only a warning
+    variants = [] if vocabulary else near_duplicate_tags(tag_index)
+    if variants:
+        print(f"⚠️  Warning: {len(variants)} tag{'s' if len(variants) != 1 else ''} look like variants of a more used tag "
+              "(run tag_docs.py --suggest for details):")
+        for tag, count, other, other_count in variants[:EXAMPLES_PER_RULE]:
+            print(f"     🏷️  {tag} ({count}) → {other} ({other_count})")
+        if len(variants) > EXAMPLES_PER_RULE:
+            print(f"     (+{len(variants) - EXAMPLES_PER_RULE} more)")
+        print()
+    
     if results['valid'] and not results['invalid']:
         print("🎉 All documents have valid metadata!")
     
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Index the docs/ trees of many repositories into one federated catalog.
+
+`index` scans a list (or glob) of repository roots concurrently in a bounded
+process pool. Each repository keeps its own incremental scan cache in
+docs/.cyberarian/, so a re-run only reads documents that changed. Results
+are merged into a single SQLite catalog with a repo column; only rows whose
+content hash changed are rewritten. `search` then queries every repository
+at once. The LOGBOOK.md / LOGBOOK-ARCHIVE.md follow-up ledger next to each
+docs/ is cataloged too (see logbook_docs.py) and searched with --logbook.
+"""
+
+import os
+import sys
+import json
+import glob
+import sqlite3
+import argparse
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from index_docs import load_cache, save_cache, scan_documents, regenerate_index
+from logbook_docs import update_logbook, ledger_items
+from docs_io import docs_lock
+
+
+DEFAULT_CATALOG = Path.home() / '.cyberarian' / 'catalog.sqlite'
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+
+LOGBOOK_COLUMNS = ('file', 'byte_offset', 'line', 'category', 'title', 'source', 'date', 'status',
+                   'priority', 'link', 'resolved', 'dismissed', 'relocated', 'hash')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    repo TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    scanned_at TEXT NOT NULL,
+    documents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    repo TEXT NOT NULL,
+    path TEXT NOT NULL,
+    title TEXT,
+    status TEXT,
+    category TEXT,
+    created TEXT,
+    last_updated TEXT,
+    tags TEXT,
+    summary TEXT,
+    words INTEGER,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (repo, path)
+);
+CREATE TABLE IF NOT EXISTS doc_tags (
+    repo TEXT NOT NULL,
+    path TEXT NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logbook (
+    repo TEXT NOT NULL,
+    file TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    line INTEGER,
+    category TEXT,
+    title TEXT,
+    source TEXT,
+    date TEXT,
+    status TEXT,
+    priority TEXT,
+    link TEXT,
+    resolved TEXT,
+    dismissed TEXT,
+    relocated TEXT,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (repo, file, byte_offset)
+);
+CREATE INDEX IF NOT EXISTS doc_tags_tag ON doc_tags (tag);
+CREATE INDEX IF NOT EXISTS doc_tags_doc ON doc_tags (repo, path);
+CREATE INDEX IF NOT EXISTS docs_status ON docs (status);
+CREATE INDEX IF NOT EXISTS logbook_date ON logbook (date);
+"""
+
+
+def expand_roots(patterns: list[str]) -> list[Path]:
+    """Repository roots from paths and globs, keeping those that have docs/."""
+    roots = []
+    for pattern in patterns:
+        matches = glob.glob(os.path.expanduser(pattern)) if glob.has_magic(pattern) else [os.path.expanduser(pattern)]
+        for match in sorted(matches):
+            root = Path(match).resolve()
+            if (root / 'docs').is_dir() and root not in roots:
+                roots.append(root)
+    return roots
+
+
+def repo_names(roots: list[Path], known: dict = None) -> dict:
+    """
+    Short, unique repo names: the directory name, plus parents on clashes.
+    Roots in known ({root: name}, from the catalog) keep their name, and new
+    roots never take one of those names.
+    """
+    known = known or {}
+    names = {root: known[root] for root in roots if root in known}
+    taken = set(known.values())
+    depth = 1
+    while len(names) < len(roots):
+        candidates = {root: '/'.join(root.parts[-depth:]) for root in roots if root not in names}
+        counts = {}
+        for name in candidates.values():
+            counts[name] = counts.get(name, 0) + 1
+        for root, name in candidates.items():
+            if (counts[name] == 1 and name not in taken) or depth >= len(root.parts):
+                names[root] = name
+                taken.add(name)
+        depth += 1
+    return names
+
+
+def scan_repo(root: str, write_index: bool = False) -> dict:
+    """
+    Scan one repository's docs/ through its own cache (in a worker process).
+    Returns {'root', 'docs': [catalog rows], 'logbook': [ledger rows], 'read',
+    'cached'} or {'root', 'error'}.
+    """
+    docs_path = Path(root) / 'docs'
+    try:
+        stats = {}
+        with docs_lock(docs_path):
+            cache = load_cache(docs_path)
+            categories = scan_documents(docs_path, cache=cache, stats=stats)
+            if write_index:
+                regenerate_index(docs_path, categories, cache)
+            save_cache(docs_path, cache)
+            ledger, _ = update_logbook(docs_path)
+    except Exception as e:
+        return {'root': root, 'error': str(e)}
+    
+    rows = []
+    for path, record in cache['files'].items():
+        entry = record['entry']
+        digest = record.get('digest') or {}
+        tags = entry['tags'] if isinstance(entry['tags'], list) else []
+        rows.append({
+            'path': path,
+            'title': str(entry['title']),
+            'status': str(entry['status']),
+            'category': entry['category'],
+            'created': str(entry['created']),
+            'last_updated': str(entry['last_updated']),
+            'tags': [str(tag) for tag in tags],
+            'summary': digest.get('summary', ''),
+            'words': digest.get('words', 0),
+            'hash': record['hash'],
+        })
+    logbook = [dict({column: item.get(column) for column in LOGBOOK_COLUMNS}, byte_offset=item['offset'])
+               for item in ledger_items(ledger)]
+    return {'root': root, 'docs': rows, 'logbook': logbook, 'read': stats['read'], 'cached': stats['cached']}
+
+
+def open_catalog(catalog_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the catalog database."""
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(catalog_path)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.executescript(SCHEMA)
+    return db
+
+
+def known_repos(db: sqlite3.Connection) -> tuple[dict, list[str]]:
+    """
+    ({root: name} of the cataloged repos, names dropped). Repos whose root no
+    longer has a docs/ directory (moved, renamed or deleted) are dropped from
+    the catalog, as are extra names for a root cataloged more than once.
+    """
+    known, dropped = {}, []
+    for repo, root in db.execute('SELECT repo, root FROM repos ORDER BY length(repo), repo').fetchall():
+        root = Path(root)
+        if root in known or not (root / 'docs').is_dir():
+            forget_repo(db, repo)
+            dropped.append(repo)
+        else:
+            known[root] = repo
+    return known, dropped
+
+
+def forget_repo(db: sqlite3.Connection, repo: str) -> None:
+    """Remove every catalog row of one repo."""
+    for table in ('docs', 'doc_tags', 'logbook', 'repos'):
+        db.execute(f'DELETE FROM {table} WHERE repo = ?', (repo,))
+
+
+def merge_repo(db: sqlite3.Connection, repo: str, root: str, rows: list[dict]) -> int:
+    """
+    Bring one repo's catalog rows in line with its scan, rewriting only rows
+    whose hash changed. Returns the number of rows written or removed.
+    """
+    known = dict(db.execute('SELECT path, hash FROM docs WHERE repo = ?', (repo,)))
+    current = {row['path'] for row in rows}
+    removed = [path for path in known if path not in current]
+    changed = [row for row in rows if known.get(row['path']) != row['hash']]
+    
+    for path in removed + [row['path'] for row in changed]:
+        db.execute('DELETE FROM doc_tags WHERE repo = ? AND path = ?', (repo, path))
+    db.executemany('DELETE FROM docs WHERE repo = ? AND path = ?', [(repo, path) for path in removed])
+    db.executemany(
+        'INSERT OR REPLACE INTO docs VALUES (:repo, :path, :title, :status, :category, :created, '
+        ':last_updated, :tags, :summary, :words, :hash)',
+        [dict(row, repo=repo, tags=json.dumps(row['tags'])) for row in changed])
+    db.executemany('INSERT INTO doc_tags VALUES (?, ?, ?)',
+                   [(repo, row['path'], tag) for row in changed for tag in row['tags']])
+    db.execute('INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?)',
+               (repo, root, datetime.now().isoformat(timespec='seconds'), len(rows)))
+    return len(removed) + len(changed)
+
+
+def merge_logbook(db: sqlite3.Connection, repo: str, rows: list[dict]) -> int:
+    """
+    Bring one repo's ledger rows in line with its logbook index, rewriting
+    only items whose line changed. Returns the number of rows written or removed.
+    """
+    known = {(file, offset): line_hash for file, offset, line_hash in
+             db.execute('SELECT file, byte_offset, hash FROM logbook WHERE repo = ?', (repo,))}
+    current = {(row['file'], row['byte_offset']) for row in rows}
+    removed = [key for key in known if key not in current]
+    changed = [row for row in rows if known.get((row['file'], row['byte_offset'])) != row['hash']]
+    
+    db.executemany('DELETE FROM logbook WHERE repo = ? AND file = ? AND byte_offset = ?',
+                   [(repo, file, offset) for file, offset in removed])
+    db.executemany(f'INSERT OR REPLACE INTO logbook VALUES (:repo, {", ".join(":" + c for c in LOGBOOK_COLUMNS)})',
+                   [dict(row, repo=repo) for row in changed])
+    return len(removed) + len(changed)
+
+
+def index_workspace(roots: list[Path], catalog_path: Path, jobs: int = DEFAULT_JOBS,
+                    write_index: bool = False) -> tuple[list[dict], list[str]]:
+    """
+    Scan every root concurrently and merge each into the catalog as it
+    finishes. A repo is identified by its resolved root: a root cataloged
+    before keeps its name whatever other roots are indexed with it.
+    Returns (one result per root in completion order, names of repos dropped
+    from the catalog because their root is gone).
+    """
+    results = []
+    db = open_catalog(catalog_path)
+    try:
+        with db:
+            known, dropped = known_repos(db)
+        names = repo_names(roots, known)
+        with ProcessPoolExecutor(max_workers=max(jobs, 1)) as pool:
+            futures = {pool.submit(scan_repo, str(root), write_index): root for root in roots}
+            for future in as_completed(futures):
+                root = futures[future]
+                result = future.result()
+                result['repo'] = names[root]
+                if 'error' not in result:
+                    with db:
+                        result['updated'] = merge_repo(db, names[root], str(root), result.pop('docs'))
+                        result['updated'] += merge_logbook(db, names[root], result.pop('logbook'))
+                results.append(result)
+    finally:
+        db.close()
+    return results, dropped
+
+
+def search_catalog(catalog_path: Path, query: str = '', tags: list[str] = (), repos: list[str] = (),
+                   statuses: list[str] = (), limit: int = 50) -> list[dict]:
+    """Documents across all repos matching every given filter."""
+    clauses, params = [], []
+    if query:
+        clauses.append('(title LIKE ? OR path LIKE ? OR summary LIKE ? OR tags LIKE ?)')
+        params += [f'%{query}%'] * 4
+    if tags:
+        clauses.append('EXISTS (SELECT 1 FROM doc_tags t WHERE t.repo = docs.repo AND t.path = docs.path '
+                       f'AND t.tag IN ({",".join("?" * len(tags))}))')
+        params += list(tags)
+    for column, values in (('repo', repos), ('status', statuses)):
+        if values:
+            clauses.append(f'{column} IN ({",".join("?" * len(values))})')
+            params += list(values)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    
+    db = sqlite3.connect(catalog_path)
+    db.row_factory = sqlite3.Row
+    try:
+        rows = db.execute(f'SELECT * FROM docs {where} ORDER BY last_updated DESC, repo, path LIMIT ?',
+                          params + [limit]).fetchall()
+    finally:
+        db.close()
+    return [dict(row, tags=json.loads(row['tags'])) for row in rows]
+
+
+def search_logbook(catalog_path: Path, query: str = '', repos: list[str] = (), statuses: list[str] = (),
+                   categories: list[str] = (), limit: int = 50) -> list[dict]:
+    """Ledger items across all repos matching every given filter, newest first."""
+    clauses, params = [], []
+    if query:
+        clauses.append('(title LIKE ? OR source LIKE ? OR link LIKE ?)')
+        params += [f'%{query}%'] * 3
+    for column, values in (('repo', repos), ('status', statuses), ('category', categories)):
+        if values:
+            clauses.append(f'{column} IN ({",".join("?" * len(values))})')
+            params += list(values)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    
+    db = sqlite3.connect(catalog_path)
+    db.row_factory = sqlite3.Row
+    try:
+        rows = db.execute(f'SELECT * FROM logbook {where} ORDER BY date DESC, repo, file, byte_offset LIMIT ?',
+                          params + [limit]).fetchall()
+    finally:
+        db.close()
+    return [dict(row) for row in rows]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Index and search docs/ across many repositories.")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG,
+                        help=f"catalog database (default: {DEFAULT_CATALOG})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    index_parser = commands.add_parser('index', help="scan repositories into the catalog")
+    index_parser.add_argument('roots', nargs='*', metavar='ROOT', help="repository roots or globs, e.g. '~/src/*'")
+    index_parser.add_argument('--roots-file', type=Path, help="file with one root or glob per line")
+    index_parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                              help=f"repositories scanned at once (default: {DEFAULT_JOBS})")
+    index_parser.add_argument('--write-index', action='store_true', help="also regenerate each repo's INDEX.md")
+    
+    search_parser = commands.add_parser('search', help="search the catalog")
+    search_parser.add_argument('query', nargs='?', default='', help="substring of title, path, summary or tags")
+    search_parser.add_argument('--tag', action='append', default=[], help="has this tag (repeatable: any of)")
+    search_parser.add_argument('--repo', action='append', default=[], help="in this repo (repeatable)")
+    search_parser.add_argument('--status', action='append', default=[], help="has this status (repeatable)")
+    search_parser.add_argument('--category', action='append', default=[],
+                               help="ledger category, with --logbook (repeatable)")
+    search_parser.add_argument('--logbook', action='store_true', help="search LOGBOOK follow-up items instead of docs")
+    search_parser.add_argument('--limit', type=int, default=50)
+    search_parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+    
+    if args.command == 'search':
+        if not args.catalog.exists():
+            print(f"❌ Error: no catalog at {args.catalog}; run 'workspace_docs.py index' first")
+            sys.exit(1)
+        if args.logbook:
+            results = search_logbook(args.catalog, args.query, args.repo, args.status, args.category, args.limit)
+            if args.json:
+                print(json.dumps(results, indent=2))
+                return
+            print(f"📒 {len(results)} logbook item{'s' if len(results) != 1 else ''} match")
+            for item in results:
+                print(f"  • {item['repo']}: {item['date']} [{item['category']}] {item['title']} — {item['source']} "
+                      f"({item['status']}) {item['file']}:{item['line']}")
+            return
+        results = search_catalog(args.catalog, args.query, args.tag, args.repo, args.status, args.limit)
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print(f"📋 {len(results)} document{'s' if len(results) != 1 else ''} match")
+        for doc in results:
+            print(f"  • {doc['repo']}: {doc['path']} — {doc['title']} ({doc['status']}, updated {doc['last_updated']})")
+        return
+    
+    patterns = list(args.roots)
+    if args.roots_file:
+        patterns += [line.strip() for line in args.roots_file.read_text().splitlines()
+                     if line.strip() and not line.startswith('#')]
+    roots = expand_roots(patterns)
+    if not roots:
+        print("❌ Error: no repository roots with a docs/ directory given")
+        sys.exit(1)
+    
+    print(f"Indexing {len(roots)} repositories with {args.jobs} workers into {args.catalog}")
+    started = datetime.now()
+    results, dropped = index_workspace(roots, args.catalog, args.jobs, args.write_index)
+    elapsed = (datetime.now() - started).total_seconds()
+    
+    errors = [r for r in results if 'error' in r]
+    for result in sorted(results, key=lambda r: r['repo']):
+        if 'error' in result:
+            print(f"  ❌ {result['repo']}: {result['error']}")
+        else:
+            print(f"  ✅ {result['repo']}: read {result['read']}, reused {result['cached']}, "
+                  f"{result['updated']} catalog rows updated")
+    for repo in sorted(dropped):
+        print(f"  🗑️  {repo}: root no longer has a docs/ directory, removed from the catalog")
+    total = sum(r['read'] + r['cached'] for r in results if 'error' not in r)
+    print(f"✅ Cataloged {total} documents from {len(results) - len(errors)} repositories in {elapsed:.2f}s")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
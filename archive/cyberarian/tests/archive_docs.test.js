@@ -0,0 +1,82 @@
+// End-to-end tests for archive_docs.py: the --plan / --apply workflow and
+// the near-duplicate candidates reported after a run.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "node:fs";
+import path from "node:path";
+import { daysAgo, doc, exists, readDoc, run, withProject, writeDocs } from "./fixture.js";
+
+const RESTATED = "The rollout plan for the billing service covers queue draining, ledger migrations, staged traffic "
+  + "shifts, alerting thresholds and the rollback checklist for the on-call engineers.";
+
+const FILES = {
+  "plans/done.md": doc({ title: "Done", status: "complete", last_updated: daysAgo(100) }),
+  "plans/edited.md": doc({ title: "Edited", status: "complete", last_updated: daysAgo(100) }),
+  "plans/deleted.md": doc({ title: "Deleted", status: "complete", last_updated: daysAgo(100) }),
+  "plans/recent.md": doc({ title: "Recent", status: "complete", last_updated: daysAgo(3) }),
+  "specs/links.md": doc({ title: "Links", status: "active" }, "See [done](../plans/done.md#steps)."),
+};
+
+test("--plan records the moves and changes nothing", () => {
+  withProject(FILES, (root) => {
+    const planFile = path.join(root, "plan.json");
+    const { code, out } = run("archive_docs.py", [root, "--plan", planFile]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Documents planned: 3/);
+    const plan = JSON.parse(fs.readFileSync(planFile, "utf-8"));
+    assert.deepEqual(plan.moves.map((m) => m.path), ["plans/deleted.md", "plans/done.md", "plans/edited.md"]);
+    assert.ok(plan.moves.every((m) => m.hash && m.reason.startsWith("100 days old")));
+    assert.ok(exists(root, "plans/done.md"));
+    assert.ok(!exists(root, "archive"));
+  });
+});
+
+test("--apply moves what is unchanged and skips stale or missing documents", () => {
+  withProject(FILES, (root) => {
+    const planFile = path.join(root, "plan.json");
+    assert.equal(run("archive_docs.py", [root, "--plan", planFile]).code, 0);
+    writeDocs(root, { "plans/edited.md": doc({ title: "Edited", status: "complete", last_updated: daysAgo(100) }, "Changed.") });
+    fs.rmSync(path.join(root, "docs", "plans", "deleted.md"));
+
+    const { code, out } = run("archive_docs.py", [root, "--apply", planFile]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Stale: plans\/edited.md changed since the plan was made/);
+    assert.match(out, /Skipped: plans\/deleted.md \(no longer exists\)/);
+    assert.match(out, /Documents archived: 1\n {2}Documents skipped: 1\n {2}Stale \(changed since plan\): 1/);
+    assert.ok(exists(root, "plans/edited.md"));
+    assert.ok(!exists(root, "plans/done.md"));
+    assert.match(readDoc(root, "archive/plans/done.md"), /^status: archived$/m);
+    assert.match(readDoc(root, "specs/links.md"), /\]\(\.\.\/archive\/plans\/done\.md#steps\)/);
+  });
+});
+
+test("--apply refuses a plan made for another tree", () => {
+  withProject(FILES, (root) => {
+    const planFile = path.join(root, "plan.json");
+    assert.equal(run("archive_docs.py", [root, "--plan", planFile]).code, 0);
+    withProject(FILES, (other) => {
+      const { code, out } = run("archive_docs.py", [other, "--apply", planFile]);
+      assert.equal(code, 1);
+      assert.match(out, /was made for .*, not /);
+      assert.ok(exists(other, "plans/done.md"));
+    });
+  });
+});
+
+test("near-duplicates are reported, except copies the run just archived", () => {
+  withProject({
+    "plans/old-copy.md": doc({ title: "Old copy", status: "complete", last_updated: daysAgo(100) }, RESTATED),
+    "plans/new-copy.md": doc({ title: "New copy", status: "complete", last_updated: daysAgo(99) }, RESTATED),
+    "specs/draft.md": doc({ title: "Draft", status: "draft", last_updated: daysAgo(20) }, RESTATED),
+    "specs/final.md": doc({ title: "Final", status: "active", last_updated: daysAgo(10) }, RESTATED),
+  }, (root) => {
+    let { code, out } = run("archive_docs.py", [root, "--dry-run"]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Near-duplicate candidates \(2\) - .*\n {2}• plans\/old-copy.md \(restates plans\/new-copy.md\)\n {2}• specs/);
+
+    ({ code, out } = run("archive_docs.py", [root]));
+    assert.equal(code, 0, out);
+    assert.match(out, /Documents archived: 2/);
+    assert.match(out, /Near-duplicate candidates \(1\) - .*\n {2}• specs\/draft.md \(restates specs\/final.md\)\n\n/);
+  });
+});
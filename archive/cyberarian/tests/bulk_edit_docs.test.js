@@ -0,0 +1,66 @@
+// End-to-end tests for bulk_edit_docs.py: previewing and applying
+// frontmatter edits selected from the scan cache.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { daysAgo, doc, readDoc, run, withProject } from "./fixture.js";
+
+const BODY = "Deploying the billing service needs the queue workers drained and the ledger migrations applied first.";
+
+const FILES = {
+  "plans/auth.md": "---\ntitle: Auth rollout\n# owner: platform\nstatus: active\ntags:\n  - auth\n  - rollout\n---\n# Auth\n",
+  "plans/billing.md": doc({ title: "Billing rollout", status: "active", tags: ["billing"] }, BODY),
+  "specs/billing.md": doc({ title: "Billing deploy", status: "complete", last_updated: daysAgo(2), tags: ["billing"] }, BODY),
+};
+
+function tagCounts(root) {
+  return JSON.parse(readDoc(root, ".cyberarian/tags.json")).counts;
+}
+
+test("previews the change set without writing", () => {
+  withProject(FILES, (root) => {
+    const { code, out } = run("bulk_edit_docs.py", [root, "--category", "plans", "--add-tag", "q3"]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Selected 2 documents; 2 would change/);
+    assert.match(out, /📄 plans\/auth.md\n {5}• tags: \[auth, rollout\] → \[auth, rollout, q3\]/);
+    assert.match(out, /PREVIEW - No files were modified/);
+    assert.equal(readDoc(root, "plans/auth.md"), FILES["plans/auth.md"]);
+  });
+});
+
+test("--apply edits only the selected fields and refreshes INDEX.md and the tag index", () => {
+  withProject(FILES, (root) => {
+    assert.equal(run("index_docs.py", [root, "--related"]).code, 0);
+    assert.deepEqual(tagCounts(root), { auth: 1, billing: 2, rollout: 1 });
+
+    const { code, out } = run("bulk_edit_docs.py",
+      [root, "--category", "plans", "--add-tag", "q3", "--remove-tag", "rollout", "--set", "owner=platform", "--apply"]);
+    assert.equal(code, 0, out);
+    assert.match(out, /✅ Edited 2 documents \(0 errors\)/);
+    assert.equal(readDoc(root, "plans/auth.md"),
+      "---\ntitle: Auth rollout\n# owner: platform\nstatus: active\ntags:\n  - auth\n  - q3\nowner: platform\n---\n# Auth\n");
+    assert.match(readDoc(root, "plans/billing.md"), /^tags: \[billing, q3\]$/m);
+    assert.equal(readDoc(root, "specs/billing.md"), FILES["specs/billing.md"]);
+    assert.deepEqual(tagCounts(root), { auth: 1, billing: 2, q3: 2 });
+    assert.match(readDoc(root, "INDEX.md"), /- Related: \[Billing deploy\]\(specs\/billing.md\)/);
+  });
+});
+
+test("--apply keeps CRLF line endings", () => {
+  const crlf = "---\r\ntitle: Windows\r\nstatus: draft\r\ntags: [a]\r\n---\r\n# Windows\r\n\r\nBody.\r\n";
+  withProject({ "plans/win.md": crlf }, (root) => {
+    const { code, out } = run("bulk_edit_docs.py", [root, "--set", "status=active", "--add-tag", "b", "--apply"]);
+    assert.equal(code, 0, out);
+    assert.equal(readDoc(root, "plans/win.md"), crlf.replace("draft", "active").replace("[a]", "[a, b]"));
+  });
+});
+
+test("a document with unparseable frontmatter is skipped, the rest applied", () => {
+  withProject({ ...FILES, "plans/broken.md": "---\ntitle: [unclosed\nstatus: active\n---\n# Broken\n" }, (root) => {
+    const { code, out } = run("bulk_edit_docs.py", [root, "--category", "plans", "--set", "status=complete", "--apply"]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Warning: Could not parse frontmatter in .*broken\.md, skipped/);
+    assert.match(out, /Selected 3 documents; 2 would change/);
+    assert.match(readDoc(root, "plans/broken.md"), /^status: active$/m);
+    assert.match(readDoc(root, "plans/auth.md"), /^status: complete$/m);
+  });
+});
@@ -0,0 +1,81 @@
+// End-to-end tests for cold_docs.py: packing long-archived documents into
+// compressed bundles, searching their metadata and restoring them.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "node:fs";
+import path from "node:path";
+import { daysAgo, doc, exists, readDoc, run, withProject } from "./fixture.js";
+
+function archived(title, days, tags = [], body = `${title} notes.`) {
+  return doc({ title, status: "archived", last_updated: daysAgo(days + 30), archived_date: daysAgo(days), tags }, body);
+}
+
+const FILES = {
+  "archive/plans/oauth.md": archived("OAuth migration", 400, ["auth"]),
+  "archive/plans/billing.md": archived("Billing cutover", 300, ["billing"]),
+  "archive/specs/cache.md": archived("Cache spec", 250),
+  "archive/specs/recent.md": archived("Recent spec", 20),
+  "archive/specs/linked.md": archived("Linked spec", 500),
+  "specs/live.md": doc({ title: "Live", status: "active" }, "Background in [the old spec](../archive/specs/linked.md)."),
+};
+
+function cold(root) {
+  return fs.readdirSync(path.join(root, "docs", "archive", "cold")).sort();
+}
+
+test("packs old archived documents, keeps recent and linked ones in place", () => {
+  withProject(FILES, (root) => {
+    let { code, out } = run("cold_docs.py", [root, "pack", "--dry-run"]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Would pack 3 documents archived more than 180 days ago/);
+    assert.ok(exists(root, "archive/plans/oauth.md"));
+
+    ({ code, out } = run("cold_docs.py", ["pack"], { cwd: root }));
+    assert.equal(code, 0, out);
+    assert.match(out, /Packed 3 documents .*\n {3}[\d,]+ bytes → [\d,]+ compressed\n {3}Kept 1 still linked/);
+    assert.deepEqual(cold(root), ["plans-0.bundle", "plans.json", "specs-0.bundle", "specs.json"]);
+    assert.ok(!exists(root, "archive/plans/oauth.md"));
+    assert.ok(exists(root, "archive/specs/recent.md"));
+    assert.ok(exists(root, "archive/specs/linked.md"));
+  });
+});
+
+test("search reads the sidecars and restore brings back the exact document", () => {
+  withProject(FILES, (root) => {
+    assert.equal(run("cold_docs.py", [root, "pack"]).code, 0);
+    let { code, out } = run("cold_docs.py", [root, "search", "--json", "migration"]);
+    assert.equal(code, 0, out);
+    assert.deepEqual(JSON.parse(out).map((d) => [d.path, d.bundle, d.archived_date, d.tags]),
+      [["archive/plans/oauth.md", "plans", daysAgo(400), ["auth"]]]);
+    ({ out } = run("cold_docs.py", [root, "search", "--tag", "billing"]));
+    assert.match(out, /📦 1 packed document match\n {2}• archive\/plans\/billing.md — Billing cutover/);
+
+    ({ code, out } = run("cold_docs.py", [root, "restore", "docs/archive/plans/oauth.md", "archive/plans/nope.md"]));
+    assert.equal(code, 1);
+    assert.match(out, /✅ Restored: archive\/plans\/oauth.md\n {2}❌ Not in cold storage: archive\/plans\/nope.md/);
+    assert.equal(readDoc(root, "archive/plans/oauth.md"), FILES["archive/plans/oauth.md"]);
+    assert.equal(JSON.parse(run("cold_docs.py", [root, "search", "--json"]).out).length, 2);
+  });
+});
+
+test("a bundle mostly made of restored documents is compacted into a new generation", () => {
+  const body = (seed) => Array.from({ length: 40 }, (_, i) => `${seed} line ${i * 7919 % 1000}`).join("\n");
+  withProject({
+    "archive/plans/a.md": archived("A", 400, [], body("alpha")),
+    "archive/plans/b.md": archived("B", 400, [], body("bravo")),
+    "archive/plans/c.md": archived("C", 400, [], body("charlie")),
+  }, (root) => {
+    assert.equal(run("cold_docs.py", [root, "pack"]).code, 0);
+    assert.equal(run("cold_docs.py", [root, "restore", "archive/plans/a.md"]).code, 0);
+    assert.deepEqual(cold(root), ["plans-0.bundle", "plans.json"]);
+    assert.equal(run("cold_docs.py", [root, "restore", "archive/plans/b.md"]).code, 0);
+    assert.deepEqual(cold(root), ["plans-1.bundle", "plans.json"]);
+    const sidecar = JSON.parse(readDoc(root, "archive/cold/plans.json"));
+    assert.equal(sidecar.dead, 0);
+    assert.equal(sidecar.size, fs.statSync(path.join(root, "docs", "archive", "cold", "plans-1.bundle")).size);
+
+    assert.equal(run("cold_docs.py", [root, "restore", "archive/plans/c.md"]).code, 0);
+    assert.match(readDoc(root, "archive/plans/c.md"), /charlie line/);
+    assert.deepEqual(cold(root), []);
+  });
+});
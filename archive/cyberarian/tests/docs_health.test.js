@@ -0,0 +1,65 @@
+// End-to-end tests for docs_health.py: the streaming top-k report in
+// markdown and JSON, against a throwaway docs/ tree.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { daysAgo, doc, run, withProject } from "./fixture.js";
+
+const FILES = {
+  "specs/old.md": doc({ title: "Old", status: "active", last_updated: daysAgo(300), tags: ["a"] }),
+  "specs/older.md": doc({ title: "Older", status: "active", last_updated: daysAgo(400), tags: ["a"] }),
+  "specs/recent.md": doc({ title: "Recent", status: "active", last_updated: daysAgo(5) }),
+  "plans/draft.md": doc({ title: "Draft", status: "draft", created: daysAgo(50), last_updated: daysAgo(1), tags: ["b"] }),
+  "plans/done.md": doc({ title: "Done", status: "complete", last_updated: daysAgo(25), tags: ["b"] }),
+  "archive/specs/gone.md": doc({ title: "Gone", status: "active", last_updated: daysAgo(900) }),
+};
+
+test("JSON report ranks each list and leaves archive/ out", () => {
+  withProject(FILES, (root) => {
+    const { code, out } = run("docs_health.py", [root, "--format", "json", "--top", "2"]);
+    assert.equal(code, 0);
+    const health = JSON.parse(out);
+    assert.equal(health.scanned, 5);
+    const { stale_active, oldest_drafts, untagged, near_archive } = health.reports;
+    assert.equal(stale_active.total, 3);
+    assert.deepEqual(stale_active.items.map((d) => d.title), ["Older", "Old"]);
+    assert.deepEqual(oldest_drafts.items.map((d) => [d.title, d.days_open]), [["Draft", 50]]);
+    assert.deepEqual(untagged.items.map((d) => d.path), ["specs/recent.md"]);
+    assert.deepEqual(near_archive.items.map((d) => [d.path, d.days_until_archive]), [["plans/done.md", 5]]);
+  });
+});
+
+test("markdown report notes how many entries were cut by --top", () => {
+  withProject(FILES, (root) => {
+    const { code, out } = run("docs_health.py", [root, "--top", "1"]);
+    assert.equal(code, 0);
+    assert.match(out, /^# Documentation Health\n/);
+    assert.match(out, /## Most stale active documents \(3\)\n\n- \[Older\]\(specs\/older.md\) — 400 days since update\n- _\(\+2 more\)_/);
+    assert.match(out, /## Drafts open the longest \(1\)\n\n- \[Draft\]\(plans\/draft.md\) — open 50 days\n\n/);
+  });
+});
+
+test("--top below 1 is rejected", () => {
+  withProject(FILES, (root) => {
+    for (const top of ["0", "-3", "x"]) {
+      const { code, err } = run("docs_health.py", [root, "--top", top]);
+      assert.equal(code, 2);
+      assert.match(err, /--top: expected a positive integer/);
+    }
+  });
+});
+
+test("bad frontmatter and YAML-typed titles still give valid JSON on stdout", () => {
+  withProject({
+    ...FILES,
+    "specs/broken.md": "---\ntitle: [unclosed\n---\n# Broken\n",
+    "specs/dated.md": doc({ title: daysAgo(10), status: "active", last_updated: daysAgo(10), tags: ["a"] }),
+  }, (root) => {
+    const { code, out, err } = run("docs_health.py", [root, "--format", "json"]);
+    assert.equal(code, 0);
+    const health = JSON.parse(out);
+    assert.equal(health.scanned, 7);
+    assert.match(err, /Warning: Could not parse frontmatter in .*broken\.md/);
+    assert.ok(health.reports.stale_active.items.some((d) => d.title === daysAgo(10)));
+    assert.ok(health.reports.untagged.items.some((d) => d.path === "specs/broken.md"));
+  });
+});
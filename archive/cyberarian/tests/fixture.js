@@ -0,0 +1,60 @@
+// Shared helpers for the cyberarian script tests: a throwaway project with a
+// docs/ tree, and a runner for the scripts against it. Dates are relative to
+// today so age-based rules (archiving, staleness) behave the same on any day.
+import { spawnSync } from "node:child_process";
+import fs from "node:fs";
+import os from "node:os";
+import path from "node:path";
+
+const SCRIPTS = new URL("../scripts/", import.meta.url).pathname;
+
+export function daysAgo(days) {
+  return new Date(Date.now() - days * 86400000).toISOString().slice(0, 10);
+}
+
+// Markdown with YAML frontmatter; list values are written inline
+export function doc(meta, body = "Some text.") {
+  const lines = Object.entries(meta).map(([k, v]) => `${k}: ${Array.isArray(v) ? `[${v.join(", ")}]` : v}`);
+  return `---\n${lines.join("\n")}\n---\n# ${meta.title ?? "Untitled"}\n\n${body}\n`;
+}
+
+// A project root whose docs/ holds the given {relative path: content} files
+export function makeProject(files = {}) {
+  const root = fs.mkdtempSync(path.join(os.tmpdir(), "cyberarian-"));
+  fs.mkdirSync(path.join(root, "docs"));
+  writeDocs(root, files);
+  return root;
+}
+
+export function writeDocs(root, files) {
+  for (const [rel, content] of Object.entries(files)) {
+    const file = path.join(root, "docs", rel);
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    fs.writeFileSync(file, content);
+  }
+}
+
+export function readDoc(root, rel) {
+  return fs.readFileSync(path.join(root, "docs", rel), "utf-8");
+}
+
+export function exists(root, rel) {
+  return fs.existsSync(path.join(root, "docs", rel));
+}
+
+export function run(script, args = [], { cwd } = {}) {
+  const res = spawnSync("python3", [path.join(SCRIPTS, script), ...args], {
+    cwd: cwd ?? os.tmpdir(),
+    encoding: "utf-8",
+  });
+  return { code: res.status, out: res.stdout, err: res.stderr };
+}
+
+export function withProject(files, fn) {
+  const root = makeProject(files);
+  try {
+    fn(root);
+  } finally {
+    fs.rmSync(root, { recursive: true, force: true });
+  }
+}
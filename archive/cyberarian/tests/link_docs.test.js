@@ -0,0 +1,54 @@
+// End-to-end tests for link_docs.py and the link rewriting archive_docs.py
+// does through the link graph, including documents that link to themselves.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "node:fs";
+import path from "node:path";
+import { daysAgo, doc, readDoc, run, withProject } from "./fixture.js";
+
+const OLD = { status: "complete", last_updated: daysAgo(100) };
+
+const FILES = {
+  "plans/self.md": doc({ title: "Self", ...OLD }, "See [the top](self.md#self) and [other](other.md)."),
+  "plans/other.md": doc({ title: "Other", status: "active" }, "Back to [self](self.md)."),
+  "specs/broken.md": doc({ title: "Broken", status: "active" }, "Points at [nothing](../plans/gone.md)."),
+};
+
+function outbound(root) {
+  const graph = JSON.parse(readDoc(root, ".cyberarian/links.json"));
+  return Object.fromEntries(Object.entries(graph.outbound).map(([k, v]) => [k, [...v].sort()]));
+}
+
+test("reports broken links and inbound links", () => {
+  withProject(FILES, (root) => {
+    let { code, out } = run("link_docs.py", [root, "--json"]);
+    assert.equal(code, 0);
+    assert.deepEqual(JSON.parse(out), { "specs/broken.md": ["plans/gone.md"] });
+    ({ code, out } = run("link_docs.py", [root]));
+    assert.equal(code, 1);
+    assert.match(out, /1 broken link in 1 document:\n {2}📄 specs\/broken.md\n {5}✗ plans\/gone.md/);
+    ({ out } = run("link_docs.py", [root, "--inbound", "docs/plans/self.md"]));
+    assert.equal(out, "📄 plans/self.md ← 2 documents\n   • plans/other.md\n   • plans/self.md\n");
+  });
+});
+
+test("archiving a document that links to itself rewrites every link and keeps the graph exact", () => {
+  withProject(FILES, (root) => {
+    const { code, out } = run("archive_docs.py", [root]);
+    assert.equal(code, 0, out);
+    assert.match(out, /Archived: plans\/self.md → archive\/plans\/self.md\n.*\n {5}Rewrote links in 1 document/);
+
+    const moved = readDoc(root, "archive/plans/self.md");
+    assert.match(moved, /\]\(self\.md#self\)/);
+    assert.match(moved, /\]\(\.\.\/\.\.\/plans\/other\.md\)/);
+    assert.match(readDoc(root, "plans/other.md"), /\]\(\.\.\/archive\/plans\/self\.md\)/);
+
+    const kept = outbound(root);
+    assert.deepEqual(kept["archive/plans/self.md"], ["archive/plans/self.md", "plans/other.md"]);
+    assert.equal(kept["plans/self.md"], undefined);
+    fs.rmSync(path.join(root, "docs", ".cyberarian", "links.json"));
+    const { out: report } = run("link_docs.py", [root, "--json"]);
+    assert.deepEqual(JSON.parse(report), { "specs/broken.md": ["plans/gone.md"] });
+    assert.deepEqual(outbound(root), kept);
+  });
+});
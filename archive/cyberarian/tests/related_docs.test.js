@@ -0,0 +1,38 @@
+// End-to-end tests for related_docs.py: TF-IDF neighbors computed through
+// the shared scan cache.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { doc, run, withProject, writeDocs } from "./fixture.js";
+
+const FILES = {
+  "specs/billing.md": doc({ title: "Billing deploy", tags: ["billing"] },
+    "Deploying the billing service needs the queue workers drained and the ledger migrations applied first."),
+  "plans/billing.md": doc({ title: "Billing rollout", tags: ["billing"] },
+    "The billing rollout drains queue workers, applies ledger migrations and shifts traffic in stages."),
+  "plans/hiring.md": doc({ title: "Hiring plan", tags: ["team"] },
+    "Interview loops, onboarding buddies and the headcount budget for next quarter."),
+};
+
+test("lists the documents most related to a given one", () => {
+  withProject(FILES, (root) => {
+    const { code, out } = run("related_docs.py", [root, "--doc", "docs/specs/billing.md"]);
+    assert.equal(code, 0, out);
+    assert.match(out, /^📄 specs\/billing.md\n {3}• plans\/billing.md \(0\.\d\d\)\n$/m);
+    assert.doesNotMatch(out, /hiring/);
+  });
+});
+
+test("saves the scan cache, so the next scan only reads what changed", () => {
+  withProject(FILES, (root) => {
+    assert.equal(run("related_docs.py", [root]).code, 0);
+    let { out } = run("index_docs.py", [root]);
+    assert.match(out, /Read 0, reused 3 from cache/);
+
+    writeDocs(root, { "plans/hiring.md": doc({ title: "Hiring plan", tags: ["billing"] },
+      "Hiring for the billing team: queue workers on-call, ledger migrations ownership and rollout duty.") });
+    ({ out } = run("related_docs.py", [root, "--doc", "plans/hiring.md"]));
+    assert.match(out, /plans\/hiring.md\n {3}• /);
+    ({ out } = run("index_docs.py", [root]));
+    assert.match(out, /Read 0, reused 3 from cache/);
+  });
+});
@@ -0,0 +1,89 @@
+// End-to-end tests for workspace_docs.py: cataloging several repositories'
+// docs/ trees into one SQLite catalog and searching it.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "node:fs";
+import path from "node:path";
+import { daysAgo, doc, makeProject, readDoc, run, writeDocs } from "./fixture.js";
+
+const BODY = "Deploying the billing service needs the queue workers drained and the ledger migrations applied first.";
+
+function withWorkspace(fn) {
+  const ws = makeProject();
+  const repo = (rel, files) => {
+    const root = path.join(ws, rel);
+    fs.mkdirSync(path.join(root, "docs"), { recursive: true });
+    writeDocs(root, files);
+    return root;
+  };
+  try {
+    fn({ ws, repo, catalog: path.join(ws, "catalog.sqlite") });
+  } finally {
+    fs.rmSync(ws, { recursive: true, force: true });
+  }
+}
+
+function search(catalog, ...args) {
+  const { code, out } = run("workspace_docs.py", ["--catalog", catalog, "search", "--json", ...args]);
+  assert.equal(code, 0);
+  return JSON.parse(out);
+}
+
+test("indexes several repos into one catalog and rereads only changed docs", () => {
+  withWorkspace(({ ws, repo, catalog }) => {
+    const a = repo("a", {
+      "specs/one.md": doc({ title: "One", status: "active", last_updated: daysAgo(1), tags: ["billing"] }),
+      "plans/two.md": doc({ title: "Two", status: "draft", last_updated: daysAgo(2) }),
+    });
+    repo("b", { "specs/three.md": doc({ title: "Three", status: "active", last_updated: daysAgo(3), tags: ["billing"] }) });
+
+    let { code, out } = run("workspace_docs.py", ["--catalog", catalog, "index", path.join(ws, "*")]);
+    assert.equal(code, 0, out);
+    assert.match(out, /✅ a: read 2, reused 0, 2 catalog rows updated/);
+    assert.deepEqual(search(catalog, "--tag", "billing").map((d) => `${d.repo}:${d.path}`), ["a:specs/one.md", "b:specs/three.md"]);
+
+    writeDocs(a, { "plans/two.md": doc({ title: "Two", status: "complete", last_updated: daysAgo(0) }) });
+    ({ code, out } = run("workspace_docs.py", ["--catalog", catalog, "index", path.join(ws, "*")]));
+    assert.equal(code, 0, out);
+    assert.match(out, /✅ a: read 1, reused 1, 1 catalog rows updated/);
+    assert.match(out, /✅ b: read 0, reused 1, 0 catalog rows updated/);
+    assert.deepEqual(search(catalog, "--status", "complete").map((d) => d.title), ["Two"]);
+  });
+});
+
+test("a repo keeps its name across runs and is dropped once its root is gone", () => {
+  withWorkspace(({ ws, repo, catalog }) => {
+    repo("a/x", { "specs/a.md": doc({ title: "From a" }) });
+    repo("b/x", { "specs/b.md": doc({ title: "From b" }) });
+    const index = (...roots) => {
+      const { code, out } = run("workspace_docs.py", ["--catalog", catalog, "index", ...roots]);
+      assert.equal(code, 0, out);
+      return out;
+    };
+    const repos = () => [...new Set(search(catalog).map((d) => `${d.repo}=${d.title}`))].sort();
+
+    index(path.join(ws, "a", "x"));
+    index(path.join(ws, "*", "x"));
+    assert.deepEqual(repos(), ["b/x=From b", "x=From a"]);
+
+    fs.renameSync(path.join(ws, "b"), path.join(ws, "c"));
+    const out = index(path.join(ws, "*", "x"));
+    assert.match(out, /🗑️ {2}b\/x: root no longer has a docs\/ directory/);
+    assert.deepEqual(repos(), ["c/x=From b", "x=From a"]);
+  });
+});
+
+test("--write-index keeps the Related and digest sections of INDEX.md", () => {
+  withWorkspace(({ ws, repo, catalog }) => {
+    const root = repo("r", {
+      "specs/deploy.md": doc({ title: "Billing deploy" }, BODY),
+      "plans/rollout.md": doc({ title: "Billing rollout" }, `${BODY} Rollout waits on the ledger.`),
+    });
+    assert.equal(run("index_docs.py", [root, "--related", "--digests"]).code, 0);
+    const { code, out } = run("workspace_docs.py", ["--catalog", catalog, "index", "--write-index", root]);
+    assert.equal(code, 0, out);
+    const index = readDoc(root, "INDEX.md");
+    assert.match(index, /- Related: \[Billing rollout\]\(plans\/rollout.md\)/);
+    assert.match(index, /\d+ words, ~1 min/);
+  });
+});
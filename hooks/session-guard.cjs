@@ -16,8 +16,9 @@
  *   node session-guard.js remind
  */
 
-const { existsSync } = require('fs');
+const { existsSync, readFileSync } = require('fs');
 const { join } = require('path');
+const { homedir } = require('os');
 const { spawn } = require('child_process');
 
 const config = require('./lib/config.cjs');
@@ -76,6 +77,9 @@ function checkBackground() {
   // 0) Git repository validation
   const { gitRoot } = checkGit(PROJECT_DIR, output);
 
+  // 0b) Plugin updates found by wright's background prefetch (a file read)
+  checkPluginUpdates(output);
+
   // 1) CLAUDE.md existence
   if (!existsSync(CLAUDE_MD)) {
     output.add('[SESSION GUARD] \u26A0\uFE0F  No CLAUDE.md found in project root.');
@@ -214,6 +218,26 @@ function checkLogbookDirty(gitRoot, output) {
   }
 }
 
+// ─── plugin updates ─────────────────────────────────────────────────
+// wright's SessionStart prefetch (update-plugins.py --prefetch) records which
+// installed plugins have a newer version on offer. Reporting the count is a
+// file read — the network work already happened (or is happening) in the
+// detached prefetch, never on the session's critical path.
+
+function checkPluginUpdates(output) {
+  const configDir = process.env.CLAUDE_CONFIG_DIR || join(homedir(), '.claude');
+  let available;
+  try {
+    available = JSON.parse(readFileSync(join(configDir, 'wright', 'state.json'), 'utf-8')).available;
+  } catch {
+    return;
+  }
+  const names = Object.keys(available || {}).map((id) => id.split('@')[0]).sort();
+  if (names.length) {
+    output.add(`[SESSION GUARD] 🔧 ${names.length} plugin update${names.length === 1 ? '' : 's'} available (${names.join(', ')}) — run /wright to apply.`);
+  }
+}
+
 // ─── brace check ──────────────────────────────────────────────────
 
 function checkBrace(projectDir, output) {
@@ -4,40 +4,280 @@
 The CLI already does the real work — refreshing marketplace sources (including
 the GCS-backed official marketplace, so superpowers et al. are covered),
 resolving versions, populating the cache. This wrapper adds only what the CLI
-lacks: update-all-at-once, and update-one-by-fuzzy-name.
+lacks: update-all-at-once, and update-some-by-fuzzy-name.
+
+Any number of queries can be given at once: a fuzzy name, `name@market`,
+`@market` for all of a marketplace's plugins, or a glob (`super*`). They are
+matched against an n-gram index of the installed ids built once per run and
+all resolved up front, so their marketplaces are refreshed together and the
+updates done in one pass.
 
   claude plugin marketplace update [name]   refresh sources (all, or one)
   claude plugin update <plugin>             update a plugin (restart to apply)
   claude plugin list                        installed plugins + versions
 
-No dry-run exists in the CLI, so a preview can't predict the new version — it
-only resolves the targets. Default runs the updates and reports before -> after
-by diffing `plugin list`; --dry-run resolves targets and prints what would run,
-without touching anything.
+Installed versions are read straight from the CLI's own registry
+(~/.claude/plugins/installed_plugins.json, or under $CLAUDE_CONFIG_DIR) — a
+file read instead of a Node startup, and immune to `plugin list` cosmetics.
+`plugin list` is only parsed when the registry is missing or in a format
+this script doesn't know.
+
+The CLI has no dry-run, but the versions on offer are sitting in the local
+marketplace clones (known_marketplaces.json -> each clone's
+.claude-plugin/marketplace.json, or a relative-path plugin's plugin.json).
+Default refreshes the clones, skips plugins whose installed version already
+matches what's offered, updates the rest and reports before -> after;
+--dry-run prints BEFORE -> AVAILABLE from the clones as they are (--refresh
+fetches them first) without updating anything.
+
+Refreshes are remembered per marketplace in ~/.claude/wright/state.json, so a
+marketplace refreshed within --max-age (by any session) isn't fetched again;
+the ones that are due refresh concurrently.
+
+--prefetch is for the SessionStart hook: at most once per PREFETCH_INTERVAL it
+detaches a background worker that refreshes the marketplaces and records in
+the state file which installed plugins have a newer version on offer. The
+session banner reports that count from the file (no network on startup),
+and a later run within --max-age of the prefetch skips straight to applying
+the known updates. WRIGHT_PREFETCH=0 turns it off.
+
+Updates are independent network fetches, so they run --jobs at a time; each
+plugin's line prints as it finishes, the BEFORE/AFTER table and result line
+stay sorted regardless of finishing order.
+
+Every CLI call has a --timeout (its whole process group is killed when it
+expires) and the run as a whole a --budget: a call never gets longer than
+what's left of it. Refreshes are retried with jittered exponential backoff.
+A marketplace that still won't refresh only holds back its own plugins, and
+a plugin that runs out of time is reported as `timeout` rather than stalling
+everything queued behind it.
+
+--json prints one document instead of the table: each plugin's before /
+available / after versions, status, time taken and CLI stderr tail, each
+marketplace's refresh, and the wall time of every step (progress lines go
+to stderr meanwhile).
+
+--gc updates nothing; it tidies the plugin cache (cache/<market>/<plugin>/
+<version>). Version directories no registry record points at are removed,
+except the --keep newest per installed plugin for rollback. Byte-identical
+files left in the cache (most of a plugin is unchanged from one version to
+the next) are then hardlinked to one copy. Only files that share a size are
+hashed, and the hashes are kept in a content-hash index beside the state
+file so later runs don't read unchanged files again. Cached versions are
+never modified in place, so sharing their files is safe.
 """
 from __future__ import annotations
 
 import argparse
+import contextlib
 import difflib
+import fnmatch
+import hashlib
+import json
+import os
+import random
 import re
+import shutil
+import signal
+import stat
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
 RESULT_MARKER = "WRIGHT_RESULT"
+DEFAULT_JOBS = 4
+DEFAULT_MAX_AGE = "15m"
+PREFETCH_INTERVAL = 6 * 3600
+DEFAULT_TIMEOUT = "2m"
+DEFAULT_BUDGET = "10m"
+REFRESH_ATTEMPTS = 3
+BACKOFF = 1.0  # seconds; attempt n sleeps up to BACKOFF * 2**n
+TIMED_OUT = 124  # rc reported for a call that ran out of time, as timeout(1) does
+STDERR_TAIL = 5  # lines of CLI stderr kept per call in --json output
+DEFAULT_KEEP = 1  # unused cached versions --gc keeps per installed plugin, for rollback
+CACHE_INDEX = "cache-index.json"  # --gc's content-hash index, next to the state file
+HASH_CHUNK = 1 << 20
+UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class Budget:
+    """Per-call timeout, capped by what's left of the run's total budget."""
+
+    def __init__(self, timeout: float, total: float):
+        self.timeout = timeout
+        self.deadline = time.monotonic() + total
+
+    def left(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def next_call(self) -> float:
+        return min(self.timeout, self.left())
+
+
+# No budget until main() sets one (e.g. installed()'s `plugin list` fallback)
+UNLIMITED = Budget(float("inf"), float("inf"))
+
+
+def claude(*args: str, budget: Budget = UNLIMITED) -> tuple[int, str, str]:
+    """Run `claude plugin <args>` -> (rc, stdout, stderr); rc is TIMED_OUT if
+    it runs out of time.
+
+    The CLI runs in its own process group so a timeout also kills the git
+    fetches it spawned, which would otherwise hold the pipes open.
+    """
+    timeout = budget.next_call()
+    if timeout <= 0:
+        return TIMED_OUT, "", "run budget exhausted"
+    group = ({"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == "nt"
+             else {"start_new_session": True})
+    p = subprocess.Popen(["claude", "plugin", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                         text=True, **group)
+    try:
+        out, err = p.communicate(timeout=None if timeout == float("inf") else timeout)
+    except subprocess.TimeoutExpired:
+        if os.name == "nt":
+            p.kill()
+        else:
+            os.killpg(p.pid, signal.SIGKILL)
+        p.wait()
+        return TIMED_OUT, "", f"timed out after {timeout:.0f}s"
+    return p.returncode, out, err
+
+
+def status(rc: int) -> str:
+    return "ok" if rc == 0 else "timeout" if rc == TIMED_OUT else "failed"
+
+
+def tail(text: str, lines: int = STDERR_TAIL) -> str:
+    return "\n".join(text.strip().splitlines()[-lines:])
+
+
+@contextlib.contextmanager
+def timed(timing: dict, step: str):
+    """Record the wall time of a block in timing[step], in seconds."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        timing[step] = round(time.monotonic() - started, 3)
+
+
+def config_dir() -> Path:
+    return Path(os.environ.get("CLAUDE_CONFIG_DIR") or Path.home() / ".claude")
+
+
+def plugins_dir() -> Path:
+    return config_dir() / "plugins"
+
 
+def state_path() -> Path:
+    return config_dir() / "wright" / "state.json"
 
-def claude(*args: str) -> tuple[int, str]:
-    p = subprocess.run(["claude", "plugin", *args], capture_output=True, text=True)
-    return p.returncode, p.stdout + p.stderr
+
+def load_state() -> dict:
+    try:
+        state = json.loads(state_path().read_text())
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def write_json(path: Path, data) -> None:
+    """Write a JSON file atomically (temp file + rename), so a concurrent
+    session never reads half of it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+
+def save_state(state: dict) -> None:
+    write_json(state_path(), state)
+
+
+def duration(text: str) -> float:
+    """Parse `90`, `30s`, `15m`, `2h`, `1d` into seconds (argparse type)."""
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd]?)", text.strip())
+    if not m:
+        raise argparse.ArgumentTypeError(f"not a duration: {text!r} (e.g. 30s, 15m, 2h)")
+    return float(m.group(1)) * UNITS[m.group(2)]
+
+
+def refresh_one(market: str, budget: Budget) -> dict:
+    """`claude plugin marketplace update <market>`, retried with jittered
+    backoff. Returns {status, attempts, seconds, stderr}."""
+    started = time.monotonic()
+    for attempt in range(1, REFRESH_ATTEMPTS + 1):
+        rc, out, err = claude("marketplace", "update", market, budget=budget)
+        if rc == 0 or attempt == REFRESH_ATTEMPTS:
+            break
+        time.sleep(max(0.0, min(random.uniform(0, BACKOFF * 2 ** (attempt - 1)), budget.left())))
+    return {"status": status(rc), "attempts": attempt, "seconds": round(time.monotonic() - started, 3),
+            "stderr": tail(err if rc == 0 else err or out)}
+
+
+def refresh(markets: list[str], max_age: float, jobs: int, budget: Budget = UNLIMITED) -> dict[str, dict]:
+    """Refresh the marketplaces not refreshed in the last max_age seconds,
+    concurrently, recording each success. Returns each market's refresh_one()
+    result, or {status: fresh} for the ones skipped."""
+    started = time.time()
+    last = load_state().get("refreshed", {})
+    due = [m for m in markets if started - last.get(m, 0) >= max_age]
+    report = {m: {"status": "fresh"} for m in markets if m not in due}
+    if not due:
+        print(f"Marketplace sources refreshed within the last {max_age:g}s — skipping refresh")
+        return report
+    print(f"Refreshing {len(due)} marketplace source(s)…" + (f" ({len(report)} still fresh)" if report else ""))
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for m, result in zip(due, pool.map(lambda m: refresh_one(m, budget), due)):
+            report[m] = result
+            if result["status"] != "ok":
+                print(f"{m}: {result['stderr']}", file=sys.stderr)
+    # Re-read before writing so another session's entries aren't dropped
+    state = load_state()
+    state.setdefault("refreshed", {}).update({m: started for m in due if report[m]["status"] == "ok"})
+    save_state(state)
+    return report
+
+
+def registry() -> dict[str, str] | None:
+    """Map plugin@marketplace id -> version, from installed_plugins.json.
+
+    Knows registry versions 1 (one record per id) and 2 (a list of
+    per-scope records; user/managed scope, or project/local scope for this
+    directory). Returns None for a missing file or anything unrecognised, so
+    the caller falls back to the CLI rather than trusting a guess.
+    """
+    try:
+        data = json.loads((plugins_dir() / "installed_plugins.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") not in (1, 2) or not isinstance(data.get("plugins"), dict):
+        return None
+    cwd = os.getcwd()
+    ids: dict[str, str] = {}
+    for pid, records in data["plugins"].items():
+        for r in records if isinstance(records, list) else [records]:
+            if not isinstance(r, dict) or not isinstance(r.get("version"), str) or "@" not in pid:
+                return None
+            if r.get("scope", "user") in ("user", "managed") or r.get("projectPath") == cwd:
+                ids[pid] = r["version"]
+                break
+    return ids
 
 
 def installed() -> dict[str, str]:
-    """Map plugin@marketplace id -> version, from `claude plugin list`."""
-    rc, out = claude("list")
+    """Map plugin@marketplace id -> version: the registry, else `claude plugin list`."""
+    ids = registry()
+    if ids is not None:
+        return ids
+    rc, out, err = claude("list")
     if rc != 0:
-        print(out, file=sys.stderr)
+        print(out + err, file=sys.stderr)
         raise SystemExit(1)
-    ids: dict[str, str] = {}
+    ids = {}
     current: str | None = None
     for line in out.splitlines():
         m = re.search(r"❯\s*(\S+)", line)
@@ -51,88 +291,509 @@ def installed() -> dict[str, str]:
     return ids
 
 
-def pick(ids: list[str], query: str) -> str | None:
-    """Match a query to one plugin id: exact base, then unique/closest substring.
+def clones() -> dict[str, Path]:
+    """Map marketplace name -> local clone directory, from known_marketplaces.json."""
+    try:
+        data = json.loads((plugins_dir() / "known_marketplaces.json").read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {name: Path(m["installLocation"]) for name, m in data.items()
+            if isinstance(m, dict) and isinstance(m.get("installLocation"), str)}
+
 
-    No catch-all fuzzy fallback across the whole install list — that tier
-    matched clearly-unrelated queries (e.g. "nonexistent-xyz" -> "context7")
-    often enough to be worse than just saying "no match" and letting the
-    caller (the LLM driving this skill) reason about the full plugin list
-    with actual context, instead of a bare string-distance guess.
+def offered_version(clone: Path, entry: dict) -> str | None:
+    """Version a marketplace entry offers: the plugin.json inside the clone for
+    a relative-path source, else the entry's own `version`. None if neither
+    says (remote sources without a pinned version)."""
+    src = entry.get("source")
+    if isinstance(src, str):
+        try:
+            v = json.loads((clone / src / ".claude-plugin" / "plugin.json").read_text()).get("version")
+            if isinstance(v, str):
+                return v
+        except (OSError, ValueError, AttributeError):
+            pass
+    v = entry.get("version")
+    return v if isinstance(v, str) else None
+
+
+def available(ids: list[str]) -> dict[str, str]:
+    """Map id -> version its marketplace clone currently offers.
+
+    Ids whose offer can't be determined are left out — callers treat those
+    as "maybe newer" and update them anyway.
     """
-    bases = {i.split("@", 1)[0]: i for i in ids}
-    q = query.lower()
-    for base, full in bases.items():
-        if base.lower() == q:
-            return full
-    subs = [full for base, full in bases.items() if q in base.lower()]
-    if len(subs) == 1:
-        return subs[0]
-    if subs:  # ambiguous substring — narrow by closeness among genuine candidates only
-        close = difflib.get_close_matches(q, [s.split("@")[0] for s in subs], n=1, cutoff=0)
-        return next((s for s in subs if s.split("@")[0] == close[0]), subs[0]) if close else subs[0]
-    return None
+    where = clones()
+    manifests: dict[str, dict[str, dict]] = {}
+    offers: dict[str, str] = {}
+    for pid in ids:
+        name, market = pid.split("@", 1)
+        clone = where.get(market, plugins_dir() / "marketplaces" / market)
+        if market not in manifests:
+            try:
+                plugins = json.loads((clone / ".claude-plugin" / "marketplace.json").read_text()).get("plugins")
+                manifests[market] = {p["name"]: p for p in plugins if isinstance(p, dict) and "name" in p}
+            except (OSError, ValueError, AttributeError, TypeError):
+                manifests[market] = {}
+        entry = manifests[market].get(name)
+        v = offered_version(clone, entry) if entry else None
+        if v:
+            offers[pid] = v
+    return offers
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser(description="Update Claude Code plugins via the CLI.")
-    ap.add_argument("query", nargs="?", help="fuzzy plugin name; omit to target all")
-    ap.add_argument("--dry-run", action="store_true", help="resolve targets and print what would run, without executing")
-    args = ap.parse_args()
+def record_available(versions: dict[str, str]) -> dict[str, dict[str, str]]:
+    """Record in the state file which of these installed versions their
+    marketplace clones offer something different for; returns that map."""
+    offers = available(list(versions))
+    newer = {pid: {"installed": v, "available": offers[pid]}
+             for pid, v in sorted(versions.items()) if pid in offers and offers[pid] != v}
+    state = load_state()
+    state.update(available=newer, checked=time.time())
+    save_state(state)
+    return newer
+
+
+def prefetch(max_age: float) -> None:
+    """Start a detached prefetch worker unless one ran in the last PREFETCH_INTERVAL.
+
+    Returns at once and prints nothing: SessionStart hook stdout becomes
+    session context, and the hook must not hold up the session.
+    """
+    if os.environ.get("WRIGHT_PREFETCH") == "0":
+        return
+    state = load_state()
+    if time.time() - state.get("prefetched", 0) < PREFETCH_INTERVAL:
+        return
+    state["prefetched"] = time.time()
+    save_state(state)
+    detached = ({"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+                if os.name == "nt" else {"start_new_session": True})
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), "--prefetch-worker", "--max-age", f"{max_age:f}s"],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **detached)
+
 
-    before = installed()
+def prefetch_worker(max_age: float, jobs: int, budget: Budget) -> None:
+    """Refresh every installed plugin's marketplace and record the available updates."""
+    versions = installed()
+    refresh(sorted({pid.split("@", 1)[1] for pid in versions}), max_age, jobs, budget)
+    record_available(versions)
+
+
+class PluginIndex:
+    """Installed ids indexed once by the 1- to 3-grams of their base names.
+
+    A query is only compared against the ids sharing every gram of it (its
+    trigrams, or its bigrams / letters if shorter), instead of every query
+    rescanning the whole install list.
+    """
+
+    N = 3
+
+    def __init__(self, ids: list[str]):
+        self.ids = sorted(ids)
+        self.base = {i: i.split("@", 1)[0].lower() for i in self.ids}
+        self.markets: dict[str, list[str]] = {}
+        self.grams: dict[str, set[str]] = {}
+        for i, b in self.base.items():
+            self.markets.setdefault(i.split("@", 1)[1].lower(), []).append(i)
+            for n in range(1, self.N + 1):
+                for k in range(len(b) - n + 1):
+                    self.grams.setdefault(b[k:k + n], set()).add(i)
+
+    def containing(self, text: str) -> list[str]:
+        """Ids whose base name contains text (lowercase)."""
+        if not text:
+            return self.ids
+        n = min(len(text), self.N)
+        hits = set.intersection(*(self.grams.get(text[k:k + n], set()) for k in range(len(text) - n + 1)))
+        return sorted(i for i in hits if text in self.base[i])
+
+    def pick(self, query: str, market: str | None = None) -> str | None:
+        """Match a query to one plugin id: exact base, then unique/closest substring.
+
+        No catch-all fuzzy fallback across the whole install list — that tier
+        matched clearly-unrelated queries (e.g. "nonexistent-xyz" -> "context7")
+        often enough to be worse than just saying "no match" and letting the
+        caller (the LLM driving this skill) reason about the full plugin list
+        with actual context, instead of a bare string-distance guess.
+        """
+        q = query.lower()
+        subs = [i for i in self.containing(q) if market is None or i.split("@", 1)[1].lower() == market]
+        exact = [i for i in subs if self.base[i] == q]
+        if exact:
+            return exact[0]
+        if len(subs) == 1:
+            return subs[0]
+        if subs:  # ambiguous substring — narrow by closeness among genuine candidates only
+            close = difflib.get_close_matches(q, [self.base[i] for i in subs], n=1, cutoff=0)
+            return next((i for i in subs if self.base[i] == close[0]), subs[0]) if close else subs[0]
+        return None
+
+    def glob(self, pattern: str) -> list[str]:
+        """Ids matching a shell-style pattern: against the whole id if it has
+        an @, else the base name. Prefiltered by its longest literal run."""
+        p = pattern.lower()
+        name = p.split("@", 1)[0]
+        literal = max(re.split(r"[*?]", re.sub(r"\[[^]]*\]", "*", name)), key=len)
+        return [i for i in self.containing(literal)
+                if fnmatch.fnmatchcase(i.lower() if "@" in p else self.base[i], p)]
+
+    def resolve(self, queries: list[str]) -> tuple[list[str], list[str]]:
+        """Targets for a batch of queries — each a fuzzy name, `name@market`,
+        `@market` (all of its plugins) or a glob like `super*` — as sorted,
+        deduplicated ids, plus the queries that matched nothing."""
+        targets: set[str] = set()
+        unmatched = []
+        for query in queries:
+            name, _, market = query.partition("@")
+            if any(c in query for c in "*?["):
+                hits = self.glob(query)
+            elif not name:
+                hits = self.markets.get(market.lower(), [])
+            else:
+                hit = self.pick(name, market.lower() or None)
+                hits = [hit] if hit else []
+            targets.update(hits)
+            if not hits:
+                unmatched.append(query)
+        return sorted(targets), unmatched
+
+
+def update(target: str, budget: Budget) -> dict:
+    """Run `claude plugin update` for one target.
+    Returns {status, line (last output line), seconds, stderr}."""
+    started = time.monotonic()
+    rc, out, err = claude("update", target, budget=budget)
+    return {"status": status(rc), "line": tail(out + err, 1), "seconds": round(time.monotonic() - started, 3),
+            "stderr": tail(err)}
+
+
+def update_all(targets: list[str], jobs: int, budget: Budget = UNLIMITED) -> dict[str, dict]:
+    """Update targets up to `jobs` at a time, printing each line as it finishes.
+
+    Targets are dispatched grouped by marketplace (then name), so one
+    marketplace's plugins are fetched together rather than interleaved.
+    """
+    ordered = sorted(targets, key=lambda t: (t.split("@", 1)[-1], t))
+    results: dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(update, t, budget): t for t in ordered}
+        for f in as_completed(futures):
+            t = futures[f]
+            results[t] = f.result()
+            print(f"  {t.split('@')[0]:<22} {results[t]['line'][:80]}", flush=True)
+    return results
+
+
+def install_refs() -> set[Path] | None:
+    """Cache directories the registry still points at: every record's
+    installPath and cache/<market>/<plugin>/<version>, in any scope or
+    project. None if the registry can't be read or a record names neither —
+    --gc then removes nothing rather than guess."""
+    try:
+        data = json.loads((plugins_dir() / "installed_plugins.json").read_text())
+        plugins = data["plugins"]
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(plugins, dict):
+        return None
+    refs = set()
+    for pid, records in plugins.items():
+        name, _, market = pid.partition("@")
+        for r in records if isinstance(records, list) else [records]:
+            if not isinstance(r, dict) or not (isinstance(r.get("installPath"), str) or isinstance(r.get("version"), str)):
+                return None
+            if isinstance(r.get("installPath"), str):
+                refs.add(Path(r["installPath"]).resolve())
+            if isinstance(r.get("version"), str):
+                refs.add((plugins_dir() / "cache" / market / name / r["version"]).resolve())
+    return refs
+
+
+def unlinked_size(path: Path) -> int:
+    """Bytes freed by deleting path: its files not hardlinked elsewhere."""
+    return sum(st.st_size for f in path.rglob("*")
+               if not f.is_symlink() and f.is_file() and (st := f.stat()).st_nlink == 1)
+
+
+def stale_versions(refs: set[Path], keep: int) -> list[Path]:
+    """Cached version directories no installed plugin uses, beyond the `keep`
+    most recent per installed plugin (plugins no longer installed keep none).
+
+    A directory is in use if a referenced path is it, lies inside it (an
+    installPath to a nested plugin root) or contains it (an installPath above
+    the version level), so nothing assumes installPath is exactly
+    cache/<market>/<plugin>/<version>.
+    """
+    around = refs | {parent for r in refs for parent in r.parents}
+
+    def in_use(v: Path) -> bool:
+        v = v.resolve()
+        return v in around or any(parent in refs for parent in v.parents)
+
+    stale = []
+    for plugin in sorted(p for p in (plugins_dir() / "cache").glob("*/*") if p.is_dir() and not p.is_symlink()):
+        versions = [v for v in plugin.iterdir() if v.is_dir() and not v.is_symlink()]
+        unused = sorted((v for v in versions if not in_use(v)), key=lambda v: v.stat().st_mtime, reverse=True)
+        stale += unused[keep if len(unused) < len(versions) else 0:]
+    return stale
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dedupe(dry_run: bool, exclude: list[Path] = ()) -> tuple[int, int]:
+    """Hardlink byte-identical files across the plugin cache -> (files linked,
+    bytes saved), leaving out files under the `exclude` directories (the
+    versions a --dry-run would have removed). Only files sharing a size are
+    hashed, and hashes are kept in a content-hash index (path -> size, mtime,
+    sha256) so unchanged files aren't read again on the next run."""
+    root = plugins_dir() / "cache"
+    index_path = state_path().with_name(CACHE_INDEX)
+    try:
+        known = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        known = {}
+    excluded = set(exclude)
+    files = [(f, f.stat()) for f in sorted(root.rglob("*"))
+             if not f.is_symlink() and f.is_file() and not excluded.intersection(f.parents)]
+    sizes: dict[int, int] = {}
+    for _, st in files:
+        sizes[st.st_size] = sizes.get(st.st_size, 0) + 1
+
+    index: dict[str, list] = {}
+    groups: dict[tuple, list[tuple[Path, os.stat_result]]] = {}
+    for f, st in files:
+        if st.st_size == 0 or sizes[st.st_size] < 2:
+            continue
+        rel = f.relative_to(root).as_posix()
+        entry = known.get(rel) if isinstance(known, dict) else None
+        try:
+            digest = entry[2] if entry and entry[:2] == [st.st_size, st.st_mtime_ns] else file_hash(f)
+        except OSError:
+            continue
+        index[rel] = [st.st_size, st.st_mtime_ns, digest]
+        groups.setdefault((digest, st.st_size, stat.S_IMODE(st.st_mode), st.st_dev), []).append((f, st))
+
+    linked = saved = 0
+    for members in groups.values():
+        # Link to the copy that's already shared most, so repeated runs don't churn
+        members.sort(key=lambda m: (-m[1].st_nlink, str(m[0])))
+        (keep, keep_st), *rest = members
+        for f, st in rest:
+            if st.st_ino == keep_st.st_ino:
+                continue
+            if not dry_run:
+                tmp = f.with_name(f".{f.name}.wright-link")
+                try:
+                    os.link(keep, tmp)
+                    os.replace(tmp, f)
+                except OSError:
+                    tmp.unlink(missing_ok=True)
+                    continue
+                # The path is now the kept inode, with its mtime
+                index[f.relative_to(root).as_posix()][1] = keep_st.st_mtime_ns
+            linked += 1
+            saved += st.st_size if st.st_nlink == 1 else 0
+    if not dry_run:
+        write_json(index_path, index)
+    return linked, saved
+
+
+def human(n: float) -> str:
+    if n < 1024:
+        return f"{n:.0f} B"
+    for unit in ("KB", "MB", "GB"):
+        n /= 1024
+        if n < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}"
+
+
+def gc(args: argparse.Namespace) -> tuple[int, dict]:
+    """Remove unused cached versions and hardlink identical cached files;
+    returns (exit code, --json document)."""
+    timing: dict[str, float] = {}
+    refs = install_refs()
+    if refs is None:
+        print("can't read the plugin registry — not collecting the cache", file=sys.stderr)
+        return 1, {"error": "can't read the plugin registry", "timing": timing}
+    root = plugins_dir() / "cache"
+    removed = []
+    with timed(timing, "collect"):
+        stale = stale_versions(refs, args.keep)
+        for v in stale:
+            freed = unlinked_size(v)
+            print(f"  {'would remove' if args.dry_run else 'removing'} {v.relative_to(root).as_posix()} ({human(freed)})")
+            if not args.dry_run:
+                shutil.rmtree(v, ignore_errors=True)
+            removed.append({"path": v.relative_to(root).as_posix(), "bytes": freed})
+    with timed(timing, "dedupe"):
+        linked, saved = dedupe(args.dry_run, stale if args.dry_run else ())
+    freed = sum(r["bytes"] for r in removed)
+    verb = "Would free" if args.dry_run else "Freed"
+    print(f"\n{verb} {human(freed + saved)}: {len(removed)} unused version(s) ({human(freed)}), "
+          f"{linked} identical file(s) hardlinked ({human(saved)}).")
+    print(f"{RESULT_MARKER} applied={str(not args.dry_run).lower()} gc=true removed={len(removed)} "
+          f"freed={freed} linked={linked} saved={saved}")
+    return 0, {"applied": not args.dry_run, "removed": removed, "freed": freed, "linked": linked, "saved": saved,
+               "timing": timing}
+
+
+def run(args: argparse.Namespace, budget: Budget) -> tuple[int, dict]:
+    """Resolve, refresh, update and report; returns (exit code, --json document)."""
+    timing: dict[str, float] = {}
+    with timed(timing, "snapshot"):
+        before = installed()
     if not before:
         print("no installed plugins found", file=sys.stderr)
-        return 1
+        return 1, {"error": "no installed plugins found", "timing": timing}
 
     if args.query:
-        target = pick(list(before), args.query)
-        if not target:
+        targets, unmatched = PluginIndex(list(before)).resolve(args.query)
+        if unmatched:
             names = ", ".join(sorted(b.split("@")[0] for b in before))
-            print(f"no installed plugin matches '{args.query}' — installed: {names}", file=sys.stderr)
-            return 1
-        targets = [target]
-        marketplaces = [target.split("@", 1)[1]]
+            missing = ", ".join(f"'{q}'" for q in unmatched)
+            print(f"no installed plugin matches {missing} — installed: {names}", file=sys.stderr)
+            return 1, {"error": f"no installed plugin matches {missing}", "unmatched": unmatched,
+                       "installed": sorted(before), "timing": timing}
     else:
         targets = sorted(before)
-        marketplaces = []  # empty => refresh every marketplace in one call
+    markets = sorted({t.split("@", 1)[1] for t in targets})
+
+    # Refresh sources first so "available" is actually latest. A marketplace
+    # that won't refresh holds back only its own plugins.
+    refreshed: dict[str, dict] = {}
+    if args.refresh or not args.dry_run:
+        with timed(timing, "refresh"):
+            refreshed = refresh(markets, args.max_age, args.jobs, budget)
+    unrefreshed = {m: r["status"] for m, r in refreshed.items() if r["status"] in ("failed", "timeout")}
+    if unrefreshed and len(unrefreshed) == len(markets):
+        print("marketplace refresh failed — not updating plugins", file=sys.stderr)
+        return 1, {"error": "marketplace refresh failed", "marketplaces": refreshed, "timing": timing}
+    if unrefreshed:
+        print(f"Not updating plugins from {', '.join(sorted(unrefreshed))} (refresh failed)", file=sys.stderr)
+
+    offers = available(targets)
+    held = {t: unrefreshed[t.split("@", 1)[1]] for t in targets if t.split("@", 1)[1] in unrefreshed}
+    pending = [t for t in targets if offers.get(t) != before[t] and t not in held]
+
+    def document(applied: bool, outcome: dict, after: dict, results: dict) -> dict:
+        return {
+            "applied": applied,
+            "plugins": [{
+                "id": t, "name": t.split("@")[0], "marketplace": t.split("@", 1)[1],
+                "before": before[t], "available": offers.get(t), "after": after.get(t),
+                "status": outcome[t], **{k: results[t][k] for k in ("seconds", "stderr") if t in results},
+            } for t in targets],
+            "marketplaces": refreshed,
+            "timing": timing,
+        }
 
     if args.dry_run:
-        print(f"Would refresh {'marketplace ' + marketplaces[0] if marketplaces else 'all marketplaces'} "
-              f"and update {len(targets)} plugin(s):")
+        print(f"Would update {len(pending)} of {len(targets)} plugin(s)"
+              f"{'' if args.refresh else ' (per the local marketplace clones; --refresh to fetch first)'}:")
         for t in targets:
-            print(f"  {t.split('@')[0]:<22} {before[t]}  → (latest)")
+            mark = "=" if t not in pending and t not in held else "→"
+            print(f"  {t.split('@')[0]:<22} {before[t]:<12} {mark} {offers.get(t, '(unknown)')}")
         print("\nRun without --dry-run to execute. A restart applies updated plugins.")
-        print(f"{RESULT_MARKER} applied=false targets={len(targets)}")
-        return 0
-
-    # Refresh sources first so "latest" is actually latest.
-    print("Refreshing marketplace sources…")
-    rc, out = claude("marketplace", "update", *marketplaces)
-    if rc != 0:
-        print(out, file=sys.stderr)
-        print("marketplace refresh failed — not updating plugins", file=sys.stderr)
-        return 1
+        print(f"{RESULT_MARKER} applied=false targets={len(targets)} available={len(pending)}")
+        outcome = {t: held.get(t) or ("available" if t in pending else "current") for t in targets}
+        return 0, document(False, outcome, {}, {})
 
     for t in targets:
-        rc, out = claude("update", t)
-        tail = out.strip().splitlines()[-1] if out.strip() else ""
-        print(f"  {t.split('@')[0]:<22} {tail[:80]}")
+        if t not in pending and t not in held:
+            print(f"  {t.split('@')[0]:<22} already current ({before[t]})")
+    with timed(timing, "updates"):
+        results = update_all(pending, args.jobs, budget)
 
-    after = installed()
-    changed = [(t, before[t], after.get(t, "?")) for t in targets if before.get(t) != after.get(t)]
+    with timed(timing, "resnapshot"):
+        after = installed()
+        record_available(after)
+    outcome = {}
+    for t in targets:
+        if t in held:
+            outcome[t] = held[t]
+        elif t in results and results[t]["status"] != "ok":
+            outcome[t] = results[t]["status"]
+        else:
+            outcome[t] = "updated" if after.get(t) != before[t] else "current"
+    changed = [t for t in targets if outcome[t] == "updated"]
+    failed = [t for t in targets if outcome[t] == "failed"]
+    timed_out = [t for t in targets if outcome[t] == "timeout"]
 
     print(f"\n{'PLUGIN':<24}{'BEFORE':<14}AFTER")
     print("-" * 52)
     for t in targets:
         b, a = before[t], after.get(t, "?")
-        mark = "↑" if b != a else "="
-        print(f"{t.split('@')[0]:<24}{b:<14}{mark} {a}")
+        mark = {"updated": "↑", "current": "=", "failed": "✗", "timeout": "⏱"}[outcome[t]]
+        print(f"{t.split('@')[0]:<24}{b:<14}{mark} {a if outcome[t] in ('updated', 'current') else outcome[t]}")
     print(f"\n{len(changed)} updated. Restart to apply."
-          if changed else "\nAll already current. Nothing to restart.")
+          if changed else "\nAll already current. Nothing to restart."
+          if not failed and not timed_out else "\nNothing updated.")
+    if failed or timed_out:
+        print(f"{len(failed)} failed, {len(timed_out)} timed out — re-run /wright for those.")
     print(f"{RESULT_MARKER} applied=true updated={len(changed)} "
-          f"names={','.join(sorted(t.split('@')[0] for t, _, _ in changed))}")
-    return 0
+          f"names={','.join(sorted(t.split('@')[0] for t in changed))} "
+          f"failed={len(failed)} timeout={len(timed_out)}")
+    return 0, document(True, outcome, after, results)
+
+
+def main() -> int:
+    started = time.monotonic()
+    ap = argparse.ArgumentParser(description="Update Claude Code plugins via the CLI.")
+    ap.add_argument("query", nargs="*",
+                    help="fuzzy plugin name, name@marketplace, @marketplace or glob (super*); "
+                         "any number of them, omit to target all")
+    ap.add_argument("--dry-run", action="store_true", help="show BEFORE -> AVAILABLE from the marketplace clones, without updating")
+    ap.add_argument("--refresh", action="store_true", help="with --dry-run: refresh marketplace sources before comparing")
+    ap.add_argument("--max-age", type=duration, default=DEFAULT_MAX_AGE, metavar="AGE",
+                    help=f"skip refreshing marketplaces refreshed within AGE, e.g. 30s, 15m, 2h "
+                         f"(default {DEFAULT_MAX_AGE}; 0 always refreshes)")
+    ap.add_argument("--jobs", type=int, default=DEFAULT_JOBS, metavar="N",
+                    help=f"plugins updated at once (default {DEFAULT_JOBS}; 1 = one after another)")
+    ap.add_argument("--timeout", type=duration, default=DEFAULT_TIMEOUT, metavar="AGE",
+                    help=f"longest any one CLI call (a refresh attempt, one plugin's update) may take (default {DEFAULT_TIMEOUT})")
+    ap.add_argument("--budget", type=duration, default=DEFAULT_BUDGET, metavar="AGE",
+                    help=f"total time for the whole run; whatever hasn't finished is reported as timeout (default {DEFAULT_BUDGET})")
+    ap.add_argument("--json", action="store_true",
+                    help="print one JSON document (versions, status, stderr tail, per-step timing) instead of the table")
+    ap.add_argument("--gc", action="store_true",
+                    help="instead of updating, remove cached plugin versions nothing uses and hardlink identical "
+                         "cached files (with --dry-run: report only)")
+    ap.add_argument("--keep", type=int, default=DEFAULT_KEEP, metavar="N",
+                    help=f"with --gc: unused versions kept per installed plugin, newest first (default {DEFAULT_KEEP})")
+    ap.add_argument("--prefetch", action="store_true",
+                    help="start a detached, rate-limited background refresh that records available updates (for the SessionStart hook)")
+    ap.add_argument("--prefetch-worker", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.gc and args.query:
+        ap.error("--gc works on the whole cache; it takes no plugin queries")
+    budget = Budget(args.timeout, args.budget)
+
+    if args.prefetch:
+        prefetch(args.max_age)
+        return 0
+    if args.prefetch_worker:
+        prefetch_worker(args.max_age, args.jobs, budget)
+        return 0
+
+    work = (lambda: gc(args)) if args.gc else (lambda: run(args, budget))
+    if not args.json:
+        return work()[0]
+    # Progress lines go to stderr so stdout is only the document
+    with contextlib.redirect_stdout(sys.stderr):
+        code, doc = work()
+    doc["timing"]["total"] = round(time.monotonic() - started, 3)
+    print(json.dumps(doc, indent=2))
+    return code
 
 
 if __name__ == "__main__":
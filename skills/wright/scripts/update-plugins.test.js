@@ -0,0 +1,248 @@
+// End-to-end tests for update-plugins.py against a fake `claude` CLI
+// (../tests/fake-claude.py) — the same fake-binary-on-PATH pattern as
+// merge.test.js, with CLAUDE_CONFIG_DIR pointing at a throwaway fixture of
+// installed plugins, marketplace clones and "upstream" clones with newer
+// versions. No real CLI or network is touched.
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { execFileSync, spawnSync } from "node:child_process";
+import fs from "node:fs";
+import os from "node:os";
+import path from "node:path";
+
+const SCRIPT = new URL("./update-plugins.py", import.meta.url).pathname;
+const FAKE = new URL("../tests/fake-claude.py", import.meta.url).pathname;
+
+// 9 plugins over market0..market2; with drift 1/3 and seed 0, three of them
+// have a newer version upstream.
+function makeFixture({ plugins = 9, drift = 1 / 3 } = {}) {
+  const root = fs.mkdtempSync(path.join(os.tmpdir(), "wright-fixture-"));
+  const bin = path.join(root, "bin");
+  fs.mkdirSync(bin);
+  fs.symlinkSync(FAKE, path.join(bin, "claude"));
+  const config = path.join(root, "config");
+  execFileSync("python3", [FAKE, "fixture", config, "--plugins", String(plugins), "--drift", String(drift)]);
+  return { root, bin, config };
+}
+
+function run(fx, args, env = {}) {
+  const res = spawnSync("python3", [SCRIPT, ...args], {
+    cwd: fx.root,
+    encoding: "utf-8",
+    env: { ...process.env, PATH: `${fx.bin}:${process.env.PATH}`, CLAUDE_CONFIG_DIR: fx.config, ...env },
+  });
+  return { code: res.status, out: res.stdout, err: res.stderr };
+}
+
+function calls(fx) {
+  const log = path.join(fx.config, "fake-claude.log");
+  if (!fs.existsSync(log)) return [];
+  return fs.readFileSync(log, "utf-8").trim().split("\n").map((line) => JSON.parse(line));
+}
+
+function versions(fx) {
+  const registry = JSON.parse(fs.readFileSync(path.join(fx.config, "plugins", "installed_plugins.json"), "utf-8"));
+  return Object.fromEntries(Object.entries(registry.plugins).map(([id, [record]]) => [id, record.version]));
+}
+
+function result(out) {
+  const line = out.split("\n").find((l) => l.startsWith("WRIGHT_RESULT "));
+  assert.ok(line, `no WRIGHT_RESULT line in output: ${out}`);
+  return Object.fromEntries(line.split(" ").slice(1).map((kv) => kv.split("=")));
+}
+
+function withFixture(options, fn) {
+  const fx = makeFixture(options);
+  try {
+    fn(fx);
+  } finally {
+    fs.rmSync(fx.root, { recursive: true, force: true });
+  }
+}
+
+test("refreshes, then updates only the plugins with a newer version", () => {
+  withFixture({}, (fx) => {
+    const { code, out } = run(fx, ["--max-age", "0"]);
+    assert.equal(code, 0, out);
+    const changed = Object.entries(versions(fx)).filter(([, v]) => v !== "1.0.0");
+    assert.equal(changed.length, 3);
+    const report = result(out);
+    assert.equal(report.applied, "true");
+    assert.equal(report.updated, "3");
+    assert.equal(report.names, changed.map(([id]) => id.split("@")[0]).sort().join(","));
+    const made = calls(fx);
+    assert.equal(made.filter((c) => c.kind === "refresh").length, 3);
+    assert.deepEqual(made.filter((c) => c.kind === "update").map((c) => c.target).sort(),
+      changed.map(([id]) => id).sort());
+  });
+});
+
+test("--dry-run --refresh previews available versions without updating", () => {
+  withFixture({}, (fx) => {
+    const { code, out } = run(fx, ["--dry-run", "--refresh", "--max-age", "0"]);
+    assert.equal(code, 0, out);
+    assert.deepEqual(result(out), { applied: "false", targets: "9", available: "3" });
+    assert.ok(Object.values(versions(fx)).every((v) => v === "1.0.0"));
+    assert.equal(calls(fx).filter((c) => c.kind === "update").length, 0);
+  });
+});
+
+test("several queries (name, glob, @marketplace) resolve up front into one pass", () => {
+  withFixture({ plugins: 12, drift: 1 }, (fx) => {
+    const { code, out } = run(fx, ["--max-age", "0", "plugin001", "plugin01*", "@market2", "plugin000@market0"]);
+    assert.equal(code, 0, out);
+    const targets = ["plugin000@market0", "plugin001@market1", "plugin002@market2", "plugin005@market2",
+      "plugin008@market2", "plugin010@market1", "plugin011@market2"];
+    assert.equal(result(out).names, targets.map((id) => id.split("@")[0]).sort().join(","));
+    const made = calls(fx);
+    assert.deepEqual(made.filter((c) => c.kind === "refresh").map((c) => c.target).sort(),
+      ["market0", "market1", "market2"]);
+    assert.deepEqual(made.filter((c) => c.kind === "update").map((c) => c.target).sort(), targets);
+  });
+});
+
+test("any unmatched query stops the run before anything is refreshed", () => {
+  withFixture({}, (fx) => {
+    const { code, err } = run(fx, ["plugin001", "nonexistent-xyz", "@nowhere"]);
+    assert.equal(code, 1);
+    assert.match(err, /no installed plugin matches 'nonexistent-xyz', '@nowhere' — installed: plugin000, /);
+    assert.deepEqual(calls(fx), []);
+  });
+});
+
+test("a marketplace refreshed within --max-age is not refreshed again", () => {
+  withFixture({}, (fx) => {
+    run(fx, ["--dry-run", "--refresh"]);
+    assert.equal(calls(fx).length, 3);
+    const { code, out } = run(fx, ["--max-age", "1h"]);
+    assert.equal(code, 0, out);
+    assert.equal(calls(fx).filter((c) => c.kind === "refresh").length, 3);
+    assert.equal(result(out).updated, "3");
+  });
+});
+
+test("updates run concurrently with --jobs", () => {
+  withFixture({ plugins: 8, drift: 1 }, (fx) => {
+    const { code } = run(fx, ["--max-age", "0", "--jobs", "4"], { FAKE_CLAUDE_LATENCY: "update=0.3" });
+    assert.equal(code, 0);
+    const updates = calls(fx).filter((c) => c.kind === "update");
+    assert.equal(updates.length, 8);
+    const peak = Math.max(...updates.map((u) => updates.filter((o) => o.start < u.end && u.start < o.end).length));
+    assert.ok(peak > 1 && peak <= 4, `peak concurrency ${peak}`);
+  });
+});
+
+test("a failing marketplace holds back only its own plugins; flaky ones are retried", () => {
+  withFixture({ drift: 1 }, (fx) => {
+    const { code, out } = run(fx, ["--max-age", "0", "--json"], {
+      FAKE_CLAUDE_FAIL: "market1",
+      FAKE_CLAUDE_FLAKY: "market2:1",
+    });
+    assert.equal(code, 0);
+    const doc = JSON.parse(out);
+    assert.equal(doc.marketplaces.market1.status, "failed");
+    assert.equal(doc.marketplaces.market1.attempts, 3);
+    assert.equal(doc.marketplaces.market2.status, "ok");
+    assert.equal(doc.marketplaces.market2.attempts, 2);
+    for (const p of doc.plugins) {
+      assert.equal(p.status, p.marketplace === "market1" ? "failed" : "updated", p.id);
+    }
+    assert.ok(calls(fx).every((c) => c.kind !== "update" || !c.target.endsWith("@market1")));
+  });
+});
+
+test("a hanging update times out without stalling the others", () => {
+  withFixture({ drift: 1 }, (fx) => {
+    const started = Date.now();
+    const { code, out, err } = run(fx, ["--max-age", "0", "--timeout", "1s", "--json"], {
+      FAKE_CLAUDE_HANG: "plugin004@market1",
+    });
+    assert.equal(code, 0, err);
+    assert.ok(Date.now() - started < 20000);
+    const doc = JSON.parse(out);
+    const hung = doc.plugins.find((p) => p.id === "plugin004@market1");
+    assert.equal(hung.status, "timeout");
+    assert.match(hung.stderr, /timed out/);
+    assert.equal(doc.plugins.filter((p) => p.status === "updated").length, 8);
+    assert.deepEqual(Object.keys(doc.timing).sort(), ["refresh", "resnapshot", "snapshot", "total", "updates"]);
+  });
+});
+
+test("falls back to `claude plugin list` for a registry format it doesn't know", () => {
+  withFixture({}, (fx) => {
+    const registry = path.join(fx.config, "plugins", "installed_plugins.json");
+    fs.writeFileSync(registry, JSON.stringify({ ...JSON.parse(fs.readFileSync(registry, "utf-8")), version: 3 }));
+    const { code, out } = run(fx, ["--dry-run"]);
+    assert.equal(code, 0, out);
+    assert.equal(result(out).targets, "9");
+    assert.deepEqual(calls(fx).map((c) => c.kind), ["list"]);
+  });
+});
+
+test("--prefetch starts a worker that refreshes and records updates, whatever --max-age", () => {
+  withFixture({}, (fx) => {
+    const { code, out } = run(fx, ["--prefetch", "--max-age", "30d"]);
+    assert.equal(code, 0);
+    assert.equal(out, "");
+    const state = path.join(fx.config, "wright", "state.json");
+    const deadline = Date.now() + 20000;
+    while (!JSON.parse(fs.readFileSync(state, "utf-8")).available && Date.now() < deadline) {
+      spawnSync("sleep", ["0.1"]);
+    }
+    const recorded = JSON.parse(fs.readFileSync(state, "utf-8"));
+    assert.equal(Object.keys(recorded.available ?? {}).length, 3);
+    assert.equal(calls(fx).filter((c) => c.kind === "refresh").length, 3);
+  });
+});
+
+test("--gc hardlinks identical cached files and removes versions nothing uses", () => {
+  withFixture({ drift: 1 }, (fx) => {
+    run(fx, ["--max-age", "0"]);
+    const cache = path.join(fx.config, "plugins", "cache", "market0", "plugin000");
+    const [current] = fs.readdirSync(cache).filter((v) => v !== "1.0.0");
+    const readme = (version) => fs.statSync(path.join(cache, version, "README.md"));
+    assert.notEqual(readme("1.0.0").ino, readme(current).ino);
+
+    let { code, out } = run(fx, ["--gc"]);
+    assert.equal(code, 0, out);
+    let report = result(out);
+    assert.equal(report.removed, "0");
+    assert.equal(report.linked, "9");
+    assert.equal(readme("1.0.0").ino, readme(current).ino);
+    assert.ok(fs.existsSync(path.join(fx.config, "wright", "cache-index.json")));
+
+    ({ code, out } = run(fx, ["--gc", "--keep", "0"]));
+    assert.equal(code, 0, out);
+    report = result(out);
+    assert.equal(report.removed, "9");
+    assert.equal(report.linked, "0");
+    assert.deepEqual(fs.readdirSync(cache), [current]);
+    assert.equal(readme(current).nlink, 1);
+  });
+});
+
+test("--gc keeps versions an installPath points into or above, and --dry-run totals match the run", () => {
+  withFixture({ drift: 1 }, (fx) => {
+    run(fx, ["--max-age", "0"]);
+    const cache = path.join(fx.config, "plugins", "cache", "market0");
+    const registryPath = path.join(fx.config, "plugins", "installed_plugins.json");
+    const registry = JSON.parse(fs.readFileSync(registryPath, "utf-8"));
+    // A nested plugin root inside the old version, and a path above the version level
+    registry.plugins["plugin000@market0"][0].installPath = path.join(cache, "plugin000", "1.0.0", ".claude-plugin");
+    registry.plugins["plugin003@market0"][0].installPath = path.join(cache, "plugin003");
+    fs.writeFileSync(registryPath, JSON.stringify(registry));
+
+    const preview = result(run(fx, ["--gc", "--keep", "0", "--dry-run"]).out);
+    const { code, out } = run(fx, ["--gc", "--keep", "0"]);
+    assert.equal(code, 0, out);
+    const report = result(out);
+    assert.equal(report.removed, "7");
+    assert.ok(fs.existsSync(path.join(cache, "plugin000", "1.0.0", ".claude-plugin", "plugin.json")));
+    assert.ok(fs.existsSync(path.join(cache, "plugin003", "1.0.0")));
+    assert.ok(!fs.existsSync(path.join(cache, "plugin006", "1.0.0")));
+    assert.equal(report.linked, "2");
+    for (const key of ["removed", "freed", "linked", "saved"]) {
+      assert.equal(preview[key], report[key], key);
+    }
+  });
+});
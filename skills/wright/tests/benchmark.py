@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Wall time of update-plugins.py end to end, against fake-claude.py.
+
+For each plugin count, builds a fresh fixture per mode and times one run:
+
+  serial      --jobs 1 --max-age 0   every marketplace refreshed, one update at a time
+  concurrent  --jobs N --max-age 0   every marketplace refreshed, N updates at once
+  cached      --jobs N               marketplaces already refreshed (by an untimed
+                                     `--dry-run --refresh`, as the session-start
+                                     prefetch would), so only the updates remain
+
+  python3 skills/wright/tests/benchmark.py [--sizes 10,100,500] [--drift 0.3] [--jobs 8]
+
+Latency is simulated by the fake (FAKE_CLAUDE_LATENCY, see fake-claude.py) on
+top of its own interpreter startup, which stands in for the real CLI's.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+FAKE = HERE / "fake-claude.py"
+SCRIPT = HERE.parent / "scripts" / "update-plugins.py"
+DEFAULT_LATENCY = "update=0.05-0.25,refresh=0.5-1.5,list=0.3"
+MODES = ("serial", "concurrent", "cached")
+
+
+def bench(size: int, mode: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(prefix="wright-bench-") as root:
+        root = Path(root)
+        (root / "bin").mkdir()
+        (root / "bin" / "claude").symlink_to(FAKE)
+        config = root / "config"
+        subprocess.run([sys.executable, str(FAKE), "fixture", str(config), "--plugins", str(size),
+                        "--markets", str(args.markets), "--drift", str(args.drift)],
+                       check=True, stdout=subprocess.DEVNULL)
+        env = {**os.environ, "PATH": f"{root / 'bin'}{os.pathsep}{os.environ['PATH']}",
+               "CLAUDE_CONFIG_DIR": str(config), "FAKE_CLAUDE_LATENCY": args.latency, "WRIGHT_PREFETCH": "0"}
+        wright = [sys.executable, str(SCRIPT), "--json", "--budget", "24h"]
+        if mode == "cached":
+            subprocess.run(wright + ["--dry-run", "--refresh", "--max-age", "0", "--jobs", str(args.jobs)],
+                           env=env, cwd=root, check=True, capture_output=True)
+            (config / "fake-claude.log").unlink(missing_ok=True)
+            flags = ["--jobs", str(args.jobs)]
+        else:
+            flags = ["--jobs", "1" if mode == "serial" else str(args.jobs), "--max-age", "0"]
+        started = time.monotonic()
+        p = subprocess.run(wright + flags, env=env, cwd=root, capture_output=True, text=True)
+        seconds = time.monotonic() - started
+        if p.returncode != 0:
+            raise SystemExit(f"{mode} run with {size} plugins failed:\n{p.stderr}")
+        doc = json.loads(p.stdout)
+        calls = len((config / "fake-claude.log").read_text().splitlines())
+    return {"plugins": size, "mode": mode, "seconds": round(seconds, 2), "calls": calls,
+            "updated": sum(pl["status"] == "updated" for pl in doc["plugins"]), "timing": doc["timing"]}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark update-plugins.py against the fake CLI.")
+    ap.add_argument("--sizes", default="10,100,500", help="comma-separated plugin counts (default 10,100,500)")
+    ap.add_argument("--modes", default=",".join(MODES), help=f"comma-separated subset of {','.join(MODES)}")
+    ap.add_argument("--drift", type=float, default=0.3, help="fraction of plugins with an update (default 0.3)")
+    ap.add_argument("--markets", type=int, default=5, help="marketplaces the plugins are spread over (default 5)")
+    ap.add_argument("--jobs", type=int, default=8, help="--jobs for the concurrent and cached modes (default 8)")
+    ap.add_argument("--latency", default=DEFAULT_LATENCY, help=f"FAKE_CLAUDE_LATENCY (default {DEFAULT_LATENCY})")
+    ap.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = ap.parse_args()
+
+    results = []
+    if not args.json:
+        print(f"{'PLUGINS':>8}  {'MODE':<11}{'UPDATED':>8}{'CALLS':>7}{'REFRESH':>9}{'UPDATES':>9}{'TOTAL':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for mode in args.modes.split(","):
+            r = bench(size, mode, args)
+            results.append(r)
+            if not args.json:
+                print(f"{size:>8}  {mode:<11}{r['updated']:>8}{r['calls']:>7}"
+                      f"{r['timing'].get('refresh', 0):>8.2f}s{r['timing']['updates']:>8.2f}s{r['seconds']:>8.2f}s",
+                      flush=True)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Stand-in for the `claude` CLI, for testing and benchmarking update-plugins.py.
+
+Put a `claude` symlink to this file first on PATH and point CLAUDE_CONFIG_DIR
+at a fixture built by its `fixture` subcommand:
+
+  fake-claude.py fixture DIR [--plugins N] [--markets M] [--drift F] [--seed S]
+
+writes DIR/plugins/{installed_plugins.json,known_marketplaces.json}, one
+marketplace clone per market and the plugin cache, all at 1.0.0, plus an
+"upstream" copy of every clone (DIR/fake-upstream) in which a fraction F of
+the plugins offer a newer version. Half the plugins have a relative source
+(version in the clone's plugin.json), half a remote one (version in the
+marketplace entry). Then, as `claude`:
+
+  claude plugin marketplace update [name]  copies the upstream clone over the local one
+  claude plugin update <plugin@market>     installs the version the local clone offers
+  claude plugin list                       prints ids and versions like the real CLI
+
+Behaviour comes from the environment (ids match a plugin, names a marketplace):
+
+  FAKE_CLAUDE_LATENCY  per-call delay by kind, e.g. `update=0.1-0.4,refresh=0.5,list=0.05`
+                       (`*=` for every kind). A value is seconds, `lo-hi` for
+                       uniform, or `exp:MEAN` for exponentially distributed
+  FAKE_CLAUDE_FAIL     comma list of ids / names whose calls exit 1
+  FAKE_CLAUDE_FLAKY    `name:N,...` — the first N calls for it exit 1, later ones succeed
+  FAKE_CLAUDE_HANG     comma list of ids / names whose calls never finish
+
+Every finished call appends a JSON line {args, kind, target, pid, start, end,
+rc} to DIR/fake-claude.log; calls that were killed don't appear.
+"""
+from __future__ import annotations
+
+import argparse
+import fcntl
+import json
+import os
+import random
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_VERSION = "1.0.0"
+
+
+def config_dir() -> Path:
+    return Path(os.environ["CLAUDE_CONFIG_DIR"])
+
+
+def write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def write_clone(clone: Path, market: str, offers: dict[str, str]) -> None:
+    """A marketplace clone offering these {name: version}."""
+    entries = []
+    for i, (name, version) in enumerate(sorted(offers.items())):
+        if i % 2 == 0:
+            write_json(clone / "plugins" / name / ".claude-plugin" / "plugin.json", {"name": name, "version": version})
+            entries.append({"name": name, "source": f"./plugins/{name}"})
+        else:
+            entries.append({"name": name, "source": {"source": "github", "repo": f"fake/{name}"}, "version": version})
+    write_json(clone / ".claude-plugin" / "marketplace.json", {"name": market, "plugins": entries})
+
+
+def cache_plugin(root: Path, market: str, name: str, version: str) -> Path:
+    """Populate the plugin cache for one version, as an install would."""
+    path = root / "plugins" / "cache" / market / name / version
+    write_json(path / ".claude-plugin" / "plugin.json", {"name": name, "version": version})
+    (path / "README.md").write_text(f"# {name}\n\nA fake plugin.\n" * 20)
+    return path
+
+
+def fixture(args: argparse.Namespace) -> None:
+    root = Path(args.dir).resolve()
+    rng = random.Random(args.seed)
+    markets = [f"market{m}" for m in range(args.markets)]
+    plugins = {f"plugin{i:03d}@{markets[i % args.markets]}" for i in range(args.plugins)}
+    drifted = set(rng.sample(sorted(plugins), round(len(plugins) * args.drift)))
+    now = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+
+    records, known = {}, {}
+    for market in markets:
+        mine = sorted(pid.split("@")[0] for pid in plugins if pid.endswith(f"@{market}"))
+        clone = root / "plugins" / "marketplaces" / market
+        write_clone(clone, market, {name: BASE_VERSION for name in mine})
+        write_clone(root / "fake-upstream" / market, market,
+                    {name: f"1.{rng.randint(1, 9)}.0" if f"{name}@{market}" in drifted else BASE_VERSION
+                     for name in mine})
+        known[market] = {"source": {"source": "github", "repo": f"fake/{market}"},
+                         "installLocation": str(clone), "lastUpdated": now}
+        for name in mine:
+            records[f"{name}@{market}"] = [{
+                "scope": "user", "version": BASE_VERSION, "installedAt": now, "lastUpdated": now,
+                "installPath": str(cache_plugin(root, market, name, BASE_VERSION)),
+            }]
+    write_json(root / "plugins" / "installed_plugins.json", {"version": 2, "plugins": records})
+    write_json(root / "plugins" / "known_marketplaces.json", known)
+    print(f"{root}: {len(plugins)} plugins in {len(markets)} marketplaces, {len(drifted)} with an update upstream")
+
+
+def delay(kind: str) -> float:
+    """Seconds this call takes, from FAKE_CLAUDE_LATENCY."""
+    specs = dict(item.split("=", 1) for item in os.environ.get("FAKE_CLAUDE_LATENCY", "").split(",") if "=" in item)
+    spec = specs.get(kind, specs.get("*", "0"))
+    if spec.startswith("exp:"):
+        return random.expovariate(1 / float(spec[4:]))
+    lo, _, hi = spec.partition("-")
+    return random.uniform(float(lo), float(hi)) if hi else float(lo)
+
+
+def listed(name: str, target: str | None) -> bool:
+    return target in {t.strip() for t in os.environ.get(name, "").split(",") if t.strip()}
+
+
+def calls_so_far(target: str) -> int:
+    try:
+        lines = (config_dir() / "fake-claude.log").read_text().splitlines()
+    except OSError:
+        return 0
+    return sum(json.loads(line)["target"] == target for line in lines)
+
+
+def flaky(target: str | None) -> bool:
+    for item in os.environ.get("FAKE_CLAUDE_FLAKY", "").split(","):
+        name, _, count = item.strip().partition(":")
+        if name == target and calls_so_far(target) < int(count or 1):
+            return True
+    return False
+
+
+@contextmanager
+def registry_lock():
+    with open(config_dir() / "plugins" / ".fake-registry.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def offered(market: str, name: str) -> str | None:
+    clone = config_dir() / "plugins" / "marketplaces" / market
+    try:
+        entries = json.loads((clone / ".claude-plugin" / "marketplace.json").read_text())["plugins"]
+    except (OSError, ValueError, KeyError):
+        return None
+    for entry in entries:
+        if entry["name"] == name:
+            if isinstance(entry["source"], str):
+                return json.loads((clone / entry["source"] / ".claude-plugin" / "plugin.json").read_text())["version"]
+            return entry.get("version")
+    return None
+
+
+def update_plugin(pid: str) -> int:
+    name, _, market = pid.partition("@")
+    with registry_lock():
+        path = config_dir() / "plugins" / "installed_plugins.json"
+        data = json.loads(path.read_text())
+        if pid not in data["plugins"]:
+            print(f'✘ Plugin "{pid}" is not installed', file=sys.stderr)
+            return 1
+        record = data["plugins"][pid][0]
+        version = offered(market, name)
+        if version is None:
+            print(f'✘ Plugin "{name}" not found in marketplace "{market}"', file=sys.stderr)
+            return 1
+        if version == record["version"]:
+            print(f'✔ Plugin "{pid}" is already at the latest version ({version})')
+            return 0
+        before = record["version"]
+        record.update(version=version, lastUpdated=time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                      installPath=str(cache_plugin(config_dir(), market, name, version)))
+        write_json(path, data)
+    print(f'✔ Plugin "{pid}" updated from {before} to {version}. Restart to apply changes.')
+    return 0
+
+
+def refresh_markets(name: str | None) -> int:
+    upstream = config_dir() / "fake-upstream"
+    markets = [name] if name else sorted(p.name for p in upstream.iterdir())
+    for market in markets:
+        if not (upstream / market).is_dir():
+            print(f'✘ Marketplace "{market}" not found', file=sys.stderr)
+            return 1
+        shutil.copytree(upstream / market, config_dir() / "plugins" / "marketplaces" / market, dirs_exist_ok=True)
+    print(f"✔ Successfully updated {len(markets)} marketplace(s)")
+    return 0
+
+
+def list_plugins() -> int:
+    data = json.loads((config_dir() / "plugins" / "installed_plugins.json").read_text())
+    print("Installed plugins:\n")
+    for pid, records in sorted(data["plugins"].items()):
+        print(f"  ❯ {pid}\n    Version: {records[0]['version']}\n    Scope: user\n    Status: ✔ enabled\n")
+    return 0
+
+
+def plugin(args: list[str]) -> int:
+    if args[:2] == ["marketplace", "update"]:
+        kind, target = "refresh", (args[2] if len(args) > 2 else None)
+    elif args[:1] == ["update"] and len(args) > 1:
+        kind, target = "update", args[1]
+    elif args[:1] == ["list"]:
+        kind, target = "list", None
+    else:
+        print(f"fake-claude: unsupported command: plugin {' '.join(args)}", file=sys.stderr)
+        return 2
+
+    start = time.time()
+    if listed("FAKE_CLAUDE_HANG", target):
+        time.sleep(24 * 3600)
+    time.sleep(delay(kind))
+    if listed("FAKE_CLAUDE_FAIL", target) or flaky(target):
+        print(f"✘ Failed to {kind} {target}: network error (fake)", file=sys.stderr)
+        rc = 1
+    else:
+        rc = {"refresh": lambda: refresh_markets(target), "update": lambda: update_plugin(target),
+              "list": list_plugins}[kind]()
+    entry = {"args": ["plugin", *args], "kind": kind, "target": target, "pid": os.getpid(),
+             "start": start, "end": time.time(), "rc": rc}
+    with open(config_dir() / "fake-claude.log", "a") as log:
+        log.write(json.dumps(entry) + "\n")
+    return rc
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if argv[:1] == ["plugin"]:
+        return plugin(argv[1:])
+    if argv[:1] == ["--version"]:
+        print("0.0.0 (fake)")
+        return 0
+    ap = argparse.ArgumentParser(prog="fake-claude.py", description="Build a fake Claude config dir.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    fx = sub.add_parser("fixture", help="write a config dir with installed plugins and marketplaces")
+    fx.add_argument("dir")
+    fx.add_argument("--plugins", type=int, default=10)
+    fx.add_argument("--markets", type=int, default=3)
+    fx.add_argument("--drift", type=float, default=0.3, help="fraction of plugins with a newer version upstream")
+    fx.add_argument("--seed", type=int, default=0)
+    fixture(ap.parse_args(argv))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())